@@ -0,0 +1,60 @@
+import json
+import time
+
+
+class CallLogPad:
+    """Wraps a virtual gamepad and logs every call as (time.perf_counter(), method, args)
+    before forwarding it, to verify what a real pad received with PadEvents.from_calls
+    """
+
+    def __init__(self, gamepad: object):
+        self.gamepad = gamepad
+        self.calls = []
+
+    def _record(self, method: str, *args):
+        self.calls.append((time.perf_counter(), method, args))
+
+    def press_button(self, button):
+        self._record("press_button", button)
+        self.gamepad.press_button(button)
+
+    def release_button(self, button):
+        self._record("release_button", button)
+        self.gamepad.release_button(button)
+
+    def left_joystick_float(self, x_value_float, y_value_float):
+        self._record("left_joystick_float", x_value_float, y_value_float)
+        self.gamepad.left_joystick_float(x_value_float=x_value_float, y_value_float=y_value_float)
+
+    def right_joystick_float(self, x_value_float, y_value_float):
+        self._record("right_joystick_float", x_value_float, y_value_float)
+        self.gamepad.right_joystick_float(x_value_float=x_value_float, y_value_float=y_value_float)
+
+    def left_trigger_float(self, value_float):
+        self._record("left_trigger_float", value_float)
+        self.gamepad.left_trigger_float(value_float)
+
+    def right_trigger_float(self, value_float):
+        self._record("right_trigger_float", value_float)
+        self.gamepad.right_trigger_float(value_float)
+
+    def reset(self):
+        self._record("reset")
+        self.gamepad.reset()
+
+    def update(self):
+        self._record("update")
+        self.gamepad.update()
+
+    def save(self, filename: str):
+        """Writes the call log as line-delimited JSON, buttons stored as their XUSB value"""
+        with open(filename, "w") as f:
+            for call_time, method, args in self.calls:
+                args = [int(arg) if method.endswith("_button") else arg for arg in args]
+                f.write(json.dumps([call_time, method, args]) + "\n")
+
+
+def load_call_log(filename: str) -> list[tuple]:
+    """Reads a call log written by CallLogPad.save"""
+    with open(filename) as f:
+        return [(call_time, method, tuple(args)) for call_time, method, args in map(json.loads, f)]
@@ -0,0 +1,222 @@
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("The analysis package needs NumPy: pip install numpy") from error
+
+from collections.abc import Iterable
+from binary_classes.binary_format import RECORD, RECORD_V1
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from input_classes.columnar_input_collection import ColumnarInputCollection
+from input_classes.input_type import Type
+
+# Analog channels of the virtual pad, in the order of PadTimeline.axes
+AXIS_CHANNELS = ("left_x", "left_y", "right_x", "right_y", "left_trigger", "right_trigger")
+LEFT_X, LEFT_Y, RIGHT_X, RIGHT_Y, LEFT_TRIGGER, RIGHT_TRIGGER = range(len(AXIS_CHANNELS))
+
+STICK_CALLS = {"left_joystick_float": (LEFT_X, LEFT_Y), "right_joystick_float": (RIGHT_X, RIGHT_Y)}
+TRIGGER_CALLS = {"left_trigger_float": LEFT_TRIGGER, "right_trigger_float": RIGHT_TRIGGER}
+
+BUTTON_DOWN = 0
+
+# NumPy layout of the binary records, to read a mapped recording without unpacking it
+RECORD_DTYPES = {
+    RECORD.size: np.dtype({"names": ["id", "type", "value", "timestamp", "y_value"],
+                           "formats": ["<u2", "u1", "<f8", "<f8", "<f8"],
+                           "offsets": [0, 2, 4, 12, 20], "itemsize": RECORD.size}),
+    RECORD_V1.size: np.dtype({"names": ["id", "type", "value", "timestamp"],
+                              "formats": ["<u2", "u1", "<f8", "<f8"],
+                              "offsets": [0, 2, 4, 12], "itemsize": RECORD_V1.size}),
+}
+
+
+def get_columns(inputs: Iterable) -> tuple:
+    """(ids, types, values, timestamps, y values) NumPy columns of a recording.
+
+    Columnar collections and mapped binary recordings are read without copying, any
+    other collection of inputs goes through ColumnarInputCollection first.
+    """
+    if hasattr(inputs, "records_buffer"):
+        records = np.frombuffer(inputs.records_buffer(), dtype=RECORD_DTYPES[inputs.record.size])
+        y_values = records["y_value"] if "y_value" in records.dtype.names else np.zeros(len(records))
+        return records["id"], records["type"], records["value"], records["timestamp"], y_values
+
+    if not isinstance(inputs, ColumnarInputCollection):
+        inputs = ColumnarInputCollection.from_inputs(inputs)
+    return (np.frombuffer(inputs.ids, dtype=np.uint16), np.frombuffer(inputs.types, dtype=np.uint8),
+            np.frombuffer(inputs.values), np.frombuffer(inputs.timestamps), np.frombuffer(inputs.y_values))
+
+
+def get_button_names(vg: object) -> dict[int, str]:
+    """Names of the virtual pad buttons by bit, "a" for XUSB_GAMEPAD_A"""
+    return {int(button): button.name.removeprefix("XUSB_GAMEPAD_").lower() for button in vg.XUSB_BUTTON}
+
+
+class PadEvents:
+    """Every write to the virtual pad state, as NumPy arrays in time order.
+
+    Analog writes are stored per channel of AXIS_CHANNELS as (times, values), values
+    being already in virtual pad space. Button writes are (time, bit, pressed) with bit
+    the XUSB button value. A write may leave the state unchanged, e.g. a stick set to
+    its current position.
+    """
+
+    def __init__(self, axes: list[tuple[np.ndarray, np.ndarray]], button_times: np.ndarray,
+                 button_bits: np.ndarray, button_pressed: np.ndarray):
+        """Constructor of the PadEvents class.
+
+        Args:
+            axes (list[tuple[np.ndarray, np.ndarray]]): (times, values) of every channel of AXIS_CHANNELS
+            button_times (np.ndarray): times of the button writes
+            button_bits (np.ndarray): XUSB bit of every button write
+            button_pressed (np.ndarray): True for a press, False for a release
+        """
+        self.axes = axes
+        self.button_times = button_times
+        self.button_bits = button_bits
+        self.button_pressed = button_pressed
+
+    def __len__(self) -> int:
+        return sum(len(times) for times, _ in self.axes) + len(self.button_times)
+
+    @property
+    def start(self) -> float:
+        """Time of the first write, 0 if there is none"""
+        firsts = [times[0] for times in self._all_times() if len(times)]
+        return float(min(firsts)) if firsts else 0.0
+
+    @property
+    def end(self) -> float:
+        """Time of the last write, 0 if there is none"""
+        lasts = [times[-1] for times in self._all_times() if len(times)]
+        return float(max(lasts)) if lasts else 0.0
+
+    def _all_times(self) -> list[np.ndarray]:
+        return [times for times, _ in self.axes] + [self.button_times]
+
+    @property
+    def buttons(self) -> np.ndarray:
+        """Bits of the buttons written at least once"""
+        return np.unique(self.button_bits)
+
+    def button_edges(self, bit: int) -> tuple[np.ndarray, np.ndarray]:
+        """(times, pressed) of the writes that changed the state of a button, the button
+        being released before the first write"""
+        mask = self.button_bits == bit
+        times = self.button_times[mask]
+        pressed = self.button_pressed[mask]
+        changed = pressed != np.concatenate(([False], pressed[:-1]))
+        return times[changed], pressed[changed]
+
+    def button_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(times, bits, pressed) of the writes that changed the state of their button, in
+        write order, every button being released before its first write. button_edges()
+        of every button at once"""
+        order = np.argsort(self.button_bits, kind="stable")
+        bits = self.button_bits[order]
+        pressed = self.button_pressed[order]
+        previous = np.zeros(len(pressed), dtype=bool)
+        previous[1:] = pressed[:-1]
+        # First write of every button
+        previous[np.flatnonzero(bits[1:] != bits[:-1]) + 1] = False
+        changed = np.sort(order[pressed != previous])
+        return self.button_times[changed], self.button_bits[changed], self.button_pressed[changed]
+
+    @classmethod
+    def from_inputs(cls, inputs: Iterable, mapper: GamepadToVGamepadMapper) -> "PadEvents":
+        """Writes a replay of the recording makes, with the semantics of the mapper: dead
+        zone on the sticks, y axes inverted and triggers moved from [-1, 1] to [0, 1].
+
+        Args:
+            inputs (Iterable): inputs of the recording, in timestamp order
+            mapper (GamepadToVGamepadMapper): mapper of the replay, for its scheme, dead zone and buttons
+
+        Returns:
+            PadEvents: the writes, at the timestamps of the recording
+        """
+        ids, types, values, timestamps, y_values = get_columns(inputs)
+        axis = mapper.scheme["axis"]
+        dead_zone = mapper.dead_zone
+
+        def stick(values):
+            return np.where(np.abs(values) <= dead_zone, 0.0, values)
+
+        def channel(axis_mask, axis_values, stick_mask=None, stick_values=None):
+            """(times, values) of a channel written by axis events and, for sticks, by stick events"""
+            if stick_mask is None or not stick_mask.any():
+                return timestamps[axis_mask], axis_values
+            if not axis_mask.any():
+                return timestamps[stick_mask], stick_values
+            # Recording mixing both kinds of events, merge them back in recording order
+            order = np.concatenate((np.flatnonzero(axis_mask), np.flatnonzero(stick_mask)))
+            sort = np.argsort(order, kind="stable")
+            return timestamps[order[sort]], np.concatenate((axis_values, stick_values))[sort]
+
+        is_axis = types == Type.AXIS.value
+        is_stick = types == Type.STICK.value
+        axes = []
+        for name in ("left_stick", "right_stick"):
+            x_mask = is_axis & (ids == axis[name]["x"])
+            y_mask = is_axis & (ids == axis[name]["y"])
+            stick_mask = is_stick & (ids == axis[name]["x"])
+            axes.append(channel(x_mask, stick(values[x_mask]), stick_mask, stick(values[stick_mask])))
+            axes.append(channel(y_mask, -stick(values[y_mask]), stick_mask, -stick(y_values[stick_mask])))
+        for name in ("left", "right"):
+            mask = is_axis & (ids == axis["triggers"][name])
+            axes.append(channel(mask, (values[mask] + 1) / 2))
+
+        bits = np.zeros(max(mapper.button_table) + 1, dtype=np.uint32)
+        for id, button in mapper.button_table.items():
+            bits[id] = int(button)
+        is_button = (types == Type.BUTTON.value) & (ids < len(bits))
+        button_bits = bits[ids[is_button]]
+        mapped = button_bits != 0
+
+        return cls(axes, timestamps[is_button][mapped], button_bits[mapped], (values[is_button] == BUTTON_DOWN)[mapped])
+
+    @classmethod
+    def from_calls(cls, calls: Iterable[tuple]) -> "PadEvents":
+        """Writes a virtual pad received, from a (time, method, args) call log like the one
+        of CallLogPad or of the fake vgamepad of the benchmarks.
+
+        The pad only sends its state to the driver on update(), so every write takes the
+        time of the update that sent it, and writes not followed by an update are dropped.
+        An update sends the last value written to every analog channel since the previous
+        one, and the buttons whose state differs from the one it sent, so a button pressed
+        and released between two updates never reaches the driver and is not a write.
+        reset() centers the sticks, releases the triggers and every held button.
+        """
+        axes = [([], []) for _ in AXIS_CHANNELS]
+        button_times, button_bits, button_pressed = [], [], []
+        pending_axes = {}
+        # Buttons held in the pad state, and held in the last report sent by update()
+        held = set()
+        sent = set()
+
+        for time, method, args in calls:
+            if method == "update":
+                for channel, value in pending_axes.items():
+                    axes[channel][0].append(time)
+                    axes[channel][1].append(value)
+                for bit in sorted(held ^ sent):
+                    button_times.append(time)
+                    button_bits.append(bit)
+                    button_pressed.append(bit in held)
+                pending_axes.clear()
+                sent = set(held)
+            elif method in STICK_CALLS:
+                x_channel, y_channel = STICK_CALLS[method]
+                pending_axes[x_channel] = args[0]
+                pending_axes[y_channel] = args[1]
+            elif method in TRIGGER_CALLS:
+                pending_axes[TRIGGER_CALLS[method]] = args[0]
+            elif method == "press_button":
+                held.add(int(args[0]))
+            elif method == "release_button":
+                held.discard(int(args[0]))
+            elif method == "reset":
+                pending_axes.update((channel, 0.0) for channel in range(len(AXIS_CHANNELS)))
+                held.clear()
+
+        return cls([(np.array(times, dtype=np.float64), np.array(values, dtype=np.float64)) for times, values in axes],
+                   np.array(button_times, dtype=np.float64), np.array(button_bits, dtype=np.uint32),
+                   np.array(button_pressed, dtype=bool))
@@ -0,0 +1,133 @@
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("The analysis package needs NumPy: pip install numpy") from error
+
+from collections.abc import Iterable
+from analysis.pad_events import AXIS_CHANNELS, PadEvents
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+
+
+def get_sample_times(start: float, sample_rate: float, indices: np.ndarray) -> np.ndarray:
+    """Times of samples of a regular grid, computed the same way for the grid and the lookups"""
+    return start + indices / sample_rate
+
+
+def sample_channel(times: np.ndarray, values: np.ndarray, start: float, sample_rate: float, count: int,
+                   initial=0.0) -> np.ndarray:
+    """Forward-fills a channel on a regular grid: every sample holds the value of the last
+    write at or before its time, initial before the first write
+
+    Args:
+        times (np.ndarray): times of the writes, sorted
+        values (np.ndarray): written values
+        start (float): time of the first sample
+        sample_rate (float): samples per second
+        count (int): number of samples
+        initial: value before the first write
+    """
+    if not len(values):
+        return np.full(count, initial, dtype=values.dtype)
+
+    # First sample that sees every write. The rounding of the division can only be wrong for
+    # the writes next to a sample, those are corrected against the grid times
+    position = (times - start) * sample_rate
+    first_sample = np.ceil(position).astype(np.intp)
+    np.clip(first_sample, 0, count, out=first_sample)
+    near = np.flatnonzero(np.abs(position - np.rint(position)) < 1e-6)
+    if len(near):
+        near_sample = first_sample[near]
+        near_times = times[near]
+        previous = np.maximum(near_sample - 1, 0)
+        near_sample -= (near_sample > 0) & (get_sample_times(start, sample_rate, previous) >= near_times)
+        near_sample += (near_sample < count) & (get_sample_times(start, sample_rate, near_sample) < near_times)
+        first_sample[near] = near_sample
+
+    # Only the last write before a sample is seen
+    last = np.empty(len(times), dtype=bool)
+    last[:-1] = first_sample[1:] != first_sample[:-1]
+    last[-1] = True
+    last &= first_sample < count
+
+    # Index 0 holds the initial value, the writes follow
+    padded = np.empty(len(values) + 1, dtype=values.dtype)
+    padded[0] = initial
+    padded[1:] = values
+    index = np.zeros(count, dtype=np.intp)
+    index[first_sample[last]] = np.flatnonzero(last) + 1
+    np.maximum.accumulate(index, out=index)
+    return padded[index]
+
+
+class PadTimeline:
+    """State of the virtual pad sampled on a regular grid.
+
+    axes holds one row per channel of AXIS_CHANNELS and buttons the XUSB bitmask of the
+    held buttons, both forward-filled from the writes so every sample is the state the
+    pad had at that time. The pad starts centered with no button held.
+    """
+
+    def __init__(self, times: np.ndarray, axes: np.ndarray, buttons: np.ndarray, sample_rate: float):
+        self.times = times
+        self.axes = axes
+        self.buttons = buttons
+        self.sample_rate = sample_rate
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_events(cls, events: PadEvents, sample_rate: float, start: float = None, end: float = None,
+                    count: int = None) -> "PadTimeline":
+        """Samples the pad state from its writes
+
+        Args:
+            events (PadEvents): writes to the pad
+            sample_rate (float): samples per second
+            start (float, optional): time of the first sample, the first write if None
+            end (float, optional): time after which sampling stops, the last write if None
+            count (int, optional): number of samples, replacing end
+
+        Returns:
+            PadTimeline: the sampled state
+        """
+        if sample_rate <= 0:
+            raise ValueError("Sample rate must be positive")
+        start = events.start if start is None else start
+        if count is None:
+            end = events.end if end is None else end
+            count = int(np.floor((end - start) * sample_rate)) + 1 if end >= start else 0
+        times = get_sample_times(start, sample_rate, np.arange(count))
+
+        axes = np.empty((len(AXIS_CHANNELS), count), dtype=np.float32)
+        for channel, (channel_times, values) in enumerate(events.axes):
+            axes[channel] = sample_channel(channel_times, values, start, sample_rate, count)
+
+        # Every change toggles one bit, so the bitmask after each change is a running xor
+        edge_times, bits, _ = events.button_changes()
+        held = np.bitwise_xor.accumulate(bits) if len(bits) else bits
+        buttons = sample_channel(edge_times, held, start, sample_rate, count, initial=0)
+        return cls(times, axes, buttons, sample_rate)
+
+    @classmethod
+    def from_inputs(cls, inputs: Iterable, mapper: GamepadToVGamepadMapper, sample_rate: float) -> "PadTimeline":
+        """Timeline of the virtual pad during a replay of a recording, with the semantics of the mapper"""
+        return cls.from_events(PadEvents.from_inputs(inputs, mapper), sample_rate)
+
+    def axis(self, name: str) -> np.ndarray:
+        """Samples of an analog channel, by its AXIS_CHANNELS name"""
+        return self.axes[AXIS_CHANNELS.index(name)]
+
+    def is_pressed(self, bit: int) -> np.ndarray:
+        """Boolean samples of a button, by its XUSB bit"""
+        return (self.buttons & np.uint32(bit)) != 0
+
+    def state_at(self, time: float) -> tuple[dict[str, float], int]:
+        """State of the pad at the last sample at or before time
+
+        Returns:
+            tuple[dict[str, float], int]: value of every analog channel and bitmask of the held buttons
+        """
+        index = max(int(np.searchsorted(self.times, time, side="right")) - 1, 0)
+        return ({name: float(self.axes[channel, index]) for channel, name in enumerate(AXIS_CHANNELS)},
+                int(self.buttons[index]))
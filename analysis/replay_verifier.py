@@ -0,0 +1,255 @@
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("The analysis package needs NumPy: pip install numpy") from error
+
+import argparse
+from typing import NamedTuple
+from analysis.call_log_pad import CallLogPad, load_call_log
+from analysis.pad_events import AXIS_CHANNELS, PadEvents, get_button_names
+from analysis.pad_timeline import PadTimeline
+from binary_classes.recording_loader import RecordingLoader
+from configuration_manager.config_manager import ConfigManager
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+
+
+class ChannelError(NamedTuple):
+    """Difference between the expected and the received state of a channel over the timeline.
+    For buttons max_error is the longest time in seconds the states differ and mean_error
+    the fraction of samples where they differ"""
+    max_error: float
+    mean_error: float
+
+
+class EdgeMismatch(NamedTuple):
+    """Button press or release found in only one of the two sides, time being the recording time"""
+    button: str
+    time: float
+    pressed: bool
+
+
+class VerificationReport:
+    """Result of the comparison of a recording with what the virtual pad received"""
+
+    def __init__(self, offset: float, lags: np.ndarray, channel_errors: dict[str, ChannelError],
+                 missing: list[EdgeMismatch], extra: list[EdgeMismatch]):
+        """Constructor of the VerificationReport class.
+
+        Args:
+            offset (float): seconds the pad received the button edges after their recording timestamps
+                once the first writes of both sides are aligned, the median over the matched edges
+            lags (np.ndarray): lag of every matched button edge once the offset is removed
+            channel_errors (dict[str, ChannelError]): error of every analog channel and written button
+            missing (list[EdgeMismatch]): edges of the recording the pad never received
+            extra (list[EdgeMismatch]): edges the pad received that are not in the recording
+        """
+        self.offset = offset
+        self.lags = lags
+        self.channel_errors = channel_errors
+        self.missing = missing
+        self.extra = extra
+
+    @property
+    def passed(self) -> bool:
+        """True if every button edge of the recording was received, and no other"""
+        return not self.missing and not self.extra
+
+    def summary(self) -> dict:
+        lags = np.abs(self.lags)
+        return {
+            "offset": self.offset,
+            "matched_edges": len(self.lags),
+            "missing_edges": len(self.missing),
+            "extra_edges": len(self.extra),
+            "edge_lag": {
+                "p50": float(np.percentile(lags, 50)) if len(lags) else 0.0,
+                "p99": float(np.percentile(lags, 99)) if len(lags) else 0.0,
+                "max": float(lags.max()) if len(lags) else 0.0,
+            },
+            "channels": {name: error._asdict() for name, error in self.channel_errors.items()},
+        }
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        lag = summary["edge_lag"]
+        lines = [f"offset {self.offset * 1000:.3f} ms, {summary['matched_edges']} button edges matched "
+                 f"(lag p50 {lag['p50'] * 1e6:.0f}us p99 {lag['p99'] * 1e6:.0f}us max {lag['max'] * 1e6:.0f}us), "
+                 f"{summary['missing_edges']} missing, {summary['extra_edges']} extra"]
+        for name, error in self.channel_errors.items():
+            lines.append(f"  {name:<14} max error {error.max_error:.4f}  mean error {error.mean_error:.6f}")
+        for mismatch in self.missing:
+            lines.append(f"  missing {mismatch.button} {'press' if mismatch.pressed else 'release'} at {mismatch.time:.3f}s")
+        for mismatch in self.extra:
+            lines.append(f"  extra {mismatch.button} {'press' if mismatch.pressed else 'release'} at {mismatch.time:.3f}s")
+        return "\n".join(lines)
+
+
+def match_edges(expected: np.ndarray, actual: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs every expected edge time with the nearest actual one within tolerance, each
+    actual edge being used at most once
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: indices of the matched expected and actual edges
+    """
+    if not len(expected) or not len(actual):
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    index = np.searchsorted(actual, expected)
+    left = np.clip(index - 1, 0, len(actual) - 1)
+    right = np.clip(index, 0, len(actual) - 1)
+    nearest = np.where(np.abs(actual[left] - expected) <= np.abs(actual[right] - expected), left, right)
+    matched = np.flatnonzero(np.abs(actual[nearest] - expected) <= tolerance)
+    actual_index, first = np.unique(nearest[matched], return_index=True)
+    return matched[first], actual_index
+
+
+def _get_edges(events: PadEvents, bits: np.ndarray) -> dict:
+    """(bit, pressed) -> edge times"""
+    times, changed_bits, pressed = events.button_changes()
+    # Group the changes by (bit, pressed), in time order within every group
+    keys = changed_bits.astype(np.int64) * 2 + pressed
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    times = times[order]
+    edges = {}
+    for bit in bits:
+        for state in (True, False):
+            key = int(bit) * 2 + state
+            edges[int(bit), state] = times[np.searchsorted(keys, key):np.searchsorted(keys, key, side="right")]
+    return edges
+
+
+def _coarse_offset(expected: dict, actual: dict, expected_events: PadEvents, actual_events: PadEvents) -> float:
+    """Offset from the first button press of both sides, from the first writes without presses"""
+    expected_presses = [times[0] for (_, pressed), times in expected.items() if pressed and len(times)]
+    actual_presses = [times[0] for (_, pressed), times in actual.items() if pressed and len(times)]
+    if expected_presses and actual_presses:
+        return float(min(actual_presses) - min(expected_presses))
+    return actual_events.start - expected_events.start
+
+
+def compare_events(expected: PadEvents, actual: PadEvents, button_names: dict[int, str], sample_rate: float,
+                   tolerance: float = 0.05) -> VerificationReport:
+    """Compares the writes a recording should make with the writes the pad received.
+
+    The offset between both time bases is estimated from the button edges, then every
+    edge is matched with the nearest one of the other side within tolerance. Both
+    states are sampled on the same grid, shifted by the offset, for the channel errors.
+
+    Args:
+        expected (PadEvents): writes of the recording, e.g. PadEvents.from_inputs()
+        actual (PadEvents): writes the pad received, e.g. PadEvents.from_calls()
+        button_names (dict[int, str]): names of the buttons by bit, from get_button_names()
+        sample_rate (float): samples per second of the timelines
+        tolerance (float): max seconds between two matched edges once the offset is removed
+
+    Returns:
+        VerificationReport: offset, edge lags, channel errors and mismatched edges
+    """
+    bits = np.union1d(expected.buttons, actual.buttons)
+    expected_edges = _get_edges(expected, bits)
+    actual_edges = _get_edges(actual, bits)
+
+    # Shift from the recording time base to the time base of the pad
+    offset = _coarse_offset(expected_edges, actual_edges, expected, actual)
+    deltas = []
+    for key, times in expected_edges.items():
+        expected_index, actual_index = match_edges(times + offset, actual_edges[key], tolerance)
+        deltas.append(actual_edges[key][actual_index] - times[expected_index] - offset)
+    deltas = np.concatenate(deltas) if deltas else np.empty(0)
+    if len(deltas):
+        offset += float(np.median(deltas))
+
+    lags = []
+    missing = []
+    extra = []
+    for (bit, pressed), times in expected_edges.items():
+        actual_times = actual_edges[bit, pressed]
+        expected_index, actual_index = match_edges(times + offset, actual_times, tolerance)
+        lags.append(actual_times[actual_index] - times[expected_index] - offset)
+        name = button_names.get(bit, hex(bit))
+        missing += [EdgeMismatch(name, float(time), pressed) for time in np.delete(times, expected_index)]
+        extra += [EdgeMismatch(name, float(time) - offset, pressed) for time in np.delete(actual_times, actual_index)]
+    missing.sort(key=lambda mismatch: mismatch.time)
+    extra.sort(key=lambda mismatch: mismatch.time)
+
+    # Samples half way between grid points, so writes on the recording tick do not fall on a sample
+    start = expected.start + 0.5 / sample_rate
+    expected_timeline = PadTimeline.from_events(expected, sample_rate, start, expected.end)
+    actual_timeline = PadTimeline.from_events(actual, sample_rate, start + offset, count=len(expected_timeline))
+    channel_errors = {}
+    for channel, name in enumerate(AXIS_CHANNELS):
+        error = np.abs(expected_timeline.axes[channel] - actual_timeline.axes[channel])
+        channel_errors[name] = ChannelError(float(error.max(initial=0.0)), float(error.mean()) if len(error) else 0.0)
+    different_buttons = expected_timeline.buttons ^ actual_timeline.buttons
+    for bit in bits:
+        differs = (different_buttons & np.uint32(bit)) != 0
+        mismatch = float(differs.mean()) if len(differs) else 0.0
+        channel_errors[button_names.get(int(bit), hex(int(bit)))] = ChannelError(_longest_run(differs) / sample_rate,
+                                                                                  mismatch)
+
+    lags = np.concatenate(lags) if lags else np.empty(0)
+    return VerificationReport(offset - (actual.start - expected.start), lags, channel_errors, missing, extra)
+
+
+def _longest_run(values: np.ndarray) -> int:
+    """Length of the longest run of True values"""
+    changes = np.flatnonzero(np.diff(np.concatenate(([0], values.view(np.int8), [0]))))
+    return int((changes[1::2] - changes[::2]).max(initial=0))
+
+
+def verify_replay(repeater, sample_rate: float = None, tolerance: float = None) -> VerificationReport:
+    """Replays the recording of a repeater once while logging the calls to its virtual pad,
+    then compares them with the recording
+
+    Args:
+        repeater (GamepadRepeater): repeater to verify, its plan is compiled again for the logged pad
+        sample_rate (float, optional): samples per second, analysis.sample_rate if None
+        tolerance (float, optional): edge matching tolerance, analysis.edge_tolerance if None
+
+    Returns:
+        VerificationReport: the comparison
+    """
+    config = repeater.config
+    sample_rate = sample_rate if sample_rate is not None else config.get("analysis.sample_rate", 250.0)
+    tolerance = tolerance if tolerance is not None else config.get("analysis.edge_tolerance", 0.05)
+
+    log = CallLogPad(repeater.gamepad)
+    repeater.gamepad = log
+    # A compiled plan is bound to the methods of the pad it was compiled for
+    repeater.plan = None
+    try:
+        repeater.replay()
+    finally:
+        repeater.gamepad = log.gamepad
+        repeater.plan = None
+
+    inputs = repeater.inputs if repeater.inputs is not None else repeater.load_inputs(repeater.inputs_file)
+    expected = PadEvents.from_inputs(inputs, repeater.mapper)
+    return compare_events(expected, PadEvents.from_calls(log.calls), get_button_names(repeater.mapper.vg),
+                          sample_rate, tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares a recording with the call log of a virtual pad")
+    parser.add_argument("recording", help="recording that was replayed")
+    parser.add_argument("call_log", help="call log written by CallLogPad.save")
+    parser.add_argument("--sample-rate", type=float, help="samples per second (default: analysis.sample_rate)")
+    parser.add_argument("--tolerance", type=float, help="edge matching tolerance in seconds (default: analysis.edge_tolerance)")
+    args = parser.parse_args()
+
+    import vgamepad as vg
+
+    config = ConfigManager()
+    mapper = GamepadToVGamepadMapper(vg, config)
+    loader = RecordingLoader(args.recording)
+    loader.load()
+
+    report = compare_events(PadEvents.from_inputs(loader.getInputs(), mapper),
+                            PadEvents.from_calls(load_call_log(args.call_log)), get_button_names(vg),
+                            args.sample_rate or config.get("analysis.sample_rate", 250.0),
+                            args.tolerance or config.get("analysis.edge_tolerance", 0.05))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
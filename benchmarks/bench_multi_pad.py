@@ -0,0 +1,54 @@
+import tempfile
+import time
+from benchmarks.fake_backends import FakeVGamepad, create_config, generate_inputs
+from binary_classes.recording_converter import save_inputs
+from gamepad.multi_pad_repeater import MultiPadRepeater
+
+
+def bench_multi_pad(pads: int, count: int = 3000, wait_strategy: str = "hybrid") -> dict:
+    """Replays pads synthetic recordings at once, each recording shifted by a fraction
+    of a tick so the pads do not share their deadlines
+
+    Returns:
+        dict: lateness percentiles of the worst pad and the highest of every percentile over
+        the pads, CPU use of the single timing thread and time to build the repeater
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        config = create_config(folder, {"repetition.wait_strategy": wait_strategy, "telemetry.enabled": True})
+        inputs_files = []
+        for pad in range(pads):
+            inputs_file = f"{folder}/pad_{pad}.gmr"
+            inputs = list(generate_inputs(count))
+            for input in inputs:
+                input.timestamp += pad * 0.008 / pads
+            save_inputs(inputs, inputs_file, "binary")
+            inputs_files.append(inputs_file)
+
+        build_start = time.perf_counter()
+        repeater = MultiPadRepeater(FakeVGamepad, config, inputs_files)
+        build_time = time.perf_counter() - build_start
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        repeater.replay()
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+
+        worst_pad, worst_lateness = repeater.get_worst_pad()
+        summaries = [telemetry.summary()["lateness"] for telemetry in repeater.telemetry]
+
+    return {
+        "pads": pads,
+        "events_per_pad": count,
+        "wait_strategy": wait_strategy,
+        "build_time": build_time,
+        "duration": wall_time,
+        "cpu_percent": 100 * cpu_time / wall_time,
+        "worst_pad": worst_pad,
+        "worst_pad_lateness": worst_lateness,
+        "max_pad_lateness": {key: max(summary[key] for summary in summaries) for key in ("p50", "p99", "max")}
+    }
+
+
+def run(count: int = 3000) -> list[dict]:
+    return [bench_multi_pad(pads, count) for pads in (1, 2, 4, 8, 16)]
@@ -0,0 +1,66 @@
+import tempfile
+import threading
+import time
+from benchmarks.fake_backends import FakePygame, create_config
+from gamepad.gamepad_reader import GamepadReader
+
+
+def bench_recorder(poll_interval: float, duration: float = 2.0, button_rate: float = 50.0, overrides: dict = None) -> dict:
+    """Records a scripted joystick for duration seconds
+
+    Args:
+        poll_interval (float): axis poll interval of the reader, the single-loop engine
+        takes its rate from capture.rate instead
+        duration (float): seconds to record
+        button_rate (float): button events per second emitted by the fake joystick
+        overrides (dict, optional): config overrides, see create_config
+
+    Returns:
+        dict: recorded events, events per second, achieved axis poll rate and the recorder metrics
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        config = create_config(folder, overrides)
+        pg = FakePygame(button_rate=button_rate)
+        reader = GamepadReader(pg, config)
+        reader.poll_interval = poll_interval
+
+        record_thread = threading.Thread(target=reader.record, daemon=True)
+        cpu_start = time.process_time()
+        record_thread.start()
+        time.sleep(duration)
+        reader.stop()
+        record_thread.join()
+        cpu_time = time.process_time() - cpu_start
+
+        recorder = reader.recorder
+        events = recorder.count if hasattr(recorder, "count") else len(recorder.record)
+        if reader.capture_engine:
+            polls = reader.capture_engine.ticks
+        else:
+            polls = pg.fake_joystick.polls
+        metrics = reader.metrics.summary()
+
+    return {
+        "engine": "threads",
+        "poll_interval": poll_interval,
+        "target_poll_rate": 1 / poll_interval,
+        "duration": duration,
+        "events": events,
+        "events_per_second": events / duration,
+        "achieved_poll_rate": polls / duration,
+        "cpu_percent": 100 * cpu_time / duration,
+        "overruns": metrics["overruns"],
+        "missed_ticks": metrics["missed_ticks"],
+        "jitter_p99": metrics["jitter"]["p99"],
+        "drain_latency_p99": metrics["drain_latency"]["p99"],
+        "drain_latency_upper_bound": metrics["drain_latency"]["upper_bound"]
+    }
+
+
+def run(duration: float = 2.0) -> list[dict]:
+    results = [bench_recorder(poll_interval, duration) for poll_interval in (0.008, 0.004, 0.002, 0.001)]
+    for rate in (125, 500, 1000):
+        result = bench_recorder(1 / rate, duration, overrides={"capture.single_loop": True, "capture.rate": rate})
+        result["engine"] = "single_loop"
+        results.append(result)
+    return results
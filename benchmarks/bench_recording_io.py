@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from benchmarks.fake_backends import generate_inputs
+from binary_classes.recording_converter import save_inputs
+from binary_classes.recording_loader import RecordingLoader, iter_recording
+from input_classes.read_ahead import ReadAhead
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+EXTENSIONS = {"json": "json", "jsonl": "jsonl", "binary": "gmr"}
+MODES = ("load", "stream")
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure_load(filename: str, results, mode: str = "load"):
+    """Runs in a fresh process so the peak RSS only covers the load. In stream mode the
+    load time is the time until the first input comes out of the read-ahead thread"""
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    if mode == "stream":
+        stream = ReadAhead(iter_recording(filename))
+        first = next(stream)
+        inputs = (input for streamed in ([first], stream) for input in streamed)
+    else:
+        loader = RecordingLoader(filename)
+        loader.load()
+        inputs = loader.getInputs()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for input in inputs:
+        input.timestamp
+    iterate_time = time.perf_counter() - start
+
+    results.put({"load_time": load_time, "iterate_time": iterate_time, "rss_delta": _peak_rss() - rss_before})
+
+
+def bench_recording_io(count: int, format: str, folder: str, modes: tuple = MODES) -> list[dict]:
+    """Saves and loads a synthetic recording of count events, loaded whole and streamed
+
+    Returns:
+        list[dict]: per mode, save time, load time, time to iterate every event, file size
+        and RSS growth of the load
+    """
+    filename = os.path.join(folder, f"bench_{count}.{EXTENSIONS[format]}")
+
+    start = time.perf_counter()
+    save_inputs(generate_inputs(count), filename, format)
+    save_time = time.perf_counter() - start
+
+    context = multiprocessing.get_context("spawn")
+    measures = []
+    for mode in modes:
+        results = context.Queue()
+        process = context.Process(target=_measure_load, args=(filename, results, mode))
+        process.start()
+        result = results.get()
+        process.join()
+        result.update({"events": count, "format": format, "mode": mode, "save_time": save_time,
+                       "file_size": os.path.getsize(filename)})
+        measures.append(result)
+
+    os.remove(filename)
+    return measures
+
+
+def run(max_events: int = 1_000_000) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for count in SIZES:
+            if count > max_events:
+                break
+            for format in EXTENSIONS:
+                results += bench_recording_io(count, format, folder)
+    return results
@@ -0,0 +1,54 @@
+import tempfile
+import time
+from benchmarks.fake_backends import FakeVGamepad, create_config, generate_inputs
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+
+
+def bench_replay(wait_strategy: str, count: int = 3000, overrides: dict = None) -> dict:
+    """Replays a synthetic recording on the fake virtual pad
+
+    Args:
+        wait_strategy (str): value of repetition.wait_strategy
+        count (int): events of the synthetic recording
+        overrides (dict, optional): other config overrides, see create_config
+
+    Returns:
+        dict: lateness percentiles, gamepad call time, reports sent and CPU use. With
+            repetition.streaming the read-ahead thread decodes the recording during the replay
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        settings = {"repetition.wait_strategy": wait_strategy, "recording.format": "binary", "telemetry.enabled": True}
+        settings.update(overrides or {})
+        config = create_config(folder, settings)
+        save_inputs(generate_inputs(count), f"{folder}/dualsense_inputs.gmr", "binary")
+
+        repeater = GamepadRepeater(FakeVGamepad, config)
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        repeater.replay()
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+
+        summary = repeater.telemetry.summary()
+        reports = sum(1 for call in repeater.gamepad.calls if call[1] == "update")
+
+    return {
+        "wait_strategy": wait_strategy,
+        "streaming": settings.get("repetition.streaming", False),
+        "events": count,
+        "reports": reports,
+        "duration": wall_time,
+        "cpu_percent": 100 * cpu_time / wall_time,
+        "lateness": summary["lateness"],
+        "call_time": summary["call_time"]
+    }
+
+
+def run(count: int = 3000) -> list[dict]:
+    results = []
+    for streaming in (False, True):
+        for wait_strategy in ("busy", "hybrid", "low_cpu"):
+            results.append(bench_replay(wait_strategy, count, {"repetition.streaming": streaming}))
+    return results
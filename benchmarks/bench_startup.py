@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.fake_backends import REPOSITORY_ROOT, FakeVGamepad, create_config, generate_inputs
+from binary_classes.recording_converter import save_inputs
+from gamepad import controller_scheme
+
+# Runs in a fresh interpreter, so the measured imports are cold
+IMPORT_SCRIPT = """
+import json, sys, time
+start_time = time.perf_counter()
+import main
+main_time = time.perf_counter() - start_time
+start_time = time.perf_counter()
+from gamepad.gamepad_repeater import GamepadRepeater
+replay_time = time.perf_counter() - start_time
+start_time = time.perf_counter()
+from gamepad.gamepad_reader import GamepadReader
+record_time = time.perf_counter() - start_time
+print(json.dumps({
+    "import_main_ms": main_time * 1000,
+    "import_replay_ms": replay_time * 1000,
+    "import_record_ms": record_time * 1000,
+    "backends_loaded_by_main": [name for name in ("pygame", "vgamepad") if name in sys.modules]
+}))
+"""
+
+
+def bench_imports() -> dict:
+    """Cold import time of main.py and of the record and replay modules, and the backends main.py imports"""
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=REPOSITORY_ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def bench_ready(count: int = 3000) -> dict:
+    """Time until a GamepadRepeater is ready to replay a synthetic recording, with the scheme
+    parsed from disk and then taken from the scheme cache"""
+    with tempfile.TemporaryDirectory() as folder:
+        config = create_config(folder, {"recording.format": "binary"})
+        save_inputs(generate_inputs(count), f"{folder}/dualsense_inputs.gmr", "binary")
+
+        controller_scheme._cache.clear()
+        start_time = time.perf_counter()
+        controller_scheme.get_scheme(config)
+        parse_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        controller_scheme.get_scheme(config)
+        cached_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        from gamepad.gamepad_repeater import GamepadRepeater
+        GamepadRepeater(FakeVGamepad, config)
+        ready_time = time.perf_counter() - start_time
+
+    return {
+        "events": count,
+        "scheme_parse_ms": parse_time * 1000,
+        "scheme_cached_ms": cached_time * 1000,
+        "repeater_ready_ms": ready_time * 1000
+    }
+
+
+def run(count: int = 3000) -> dict:
+    return {"imports": bench_imports(), "ready": bench_ready(count)}
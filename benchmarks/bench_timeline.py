@@ -0,0 +1,71 @@
+import tempfile
+import time
+from benchmarks.fake_backends import FakeVGamepad, create_config, generate_inputs
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.columnar_input_collection import ColumnarInputCollection
+
+
+def bench_timeline(duration: float, config, sample_rate: float = 250.0, tick: float = 0.008) -> dict:
+    """Builds the pad timeline of a synthetic recording of duration seconds, then compares
+    it with a copy of itself received 1 ms later
+
+    Returns:
+        dict: time to map the recording, to sample the timeline and to compare both sides
+    """
+    from analysis.pad_events import PadEvents, get_button_names
+    from analysis.pad_timeline import PadTimeline
+    from analysis.replay_verifier import compare_events
+
+    mapper = GamepadToVGamepadMapper(FakeVGamepad, config)
+    count = int(duration / tick) * 6
+    inputs = ColumnarInputCollection.from_inputs(generate_inputs(count, tick))
+
+    start = time.perf_counter()
+    events = PadEvents.from_inputs(inputs, mapper)
+    map_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timeline = PadTimeline.from_events(events, sample_rate)
+    timeline_time = time.perf_counter() - start
+
+    received = PadEvents([(times + 0.001, values) for times, values in events.axes], events.button_times + 0.001,
+                         events.button_bits, events.button_pressed)
+    start = time.perf_counter()
+    report = compare_events(events, received, get_button_names(FakeVGamepad), sample_rate)
+    compare_time = time.perf_counter() - start
+
+    return {
+        "duration": duration,
+        "events": len(inputs),
+        "samples": len(timeline),
+        "map_time": map_time,
+        "timeline_time": timeline_time,
+        "compare_time": compare_time,
+        "passed": report.passed,
+    }
+
+
+def bench_verify(count: int = 3000) -> dict:
+    """Replays a synthetic recording on the fake pad and verifies what it received"""
+    from analysis.pad_events import AXIS_CHANNELS
+    from analysis.replay_verifier import verify_replay
+
+    with tempfile.TemporaryDirectory() as folder:
+        config = create_config(folder, {"repetition.wait_strategy": "hybrid"})
+        repeater = GamepadRepeater(FakeVGamepad, config, load=False)
+        save_inputs(list(generate_inputs(count)), repeater.inputs_file, "binary")
+        report = verify_replay(repeater)
+
+    summary = report.summary()
+    del summary["channels"]
+    axis_errors = [report.channel_errors[name].max_error for name in AXIS_CHANNELS]
+    return {"events": count, **summary, "max_axis_error": max(axis_errors)}
+
+
+def run(count: int = 3000) -> dict:
+    with tempfile.TemporaryDirectory() as folder:
+        config = create_config(folder)
+        timelines = [bench_timeline(duration, config) for duration in (60.0, 600.0, 3600.0)]
+    return {"timeline": timelines, "verify": bench_verify(count)}
@@ -0,0 +1,62 @@
+import io
+import os
+import threading
+import time
+from timing.event_tracer import EventTracer, TraceLevel
+
+
+def _drain_pipe(fd: int):
+    while os.read(fd, 65536):
+        pass
+
+
+def _time_calls(call, count: int) -> dict:
+    """Per-call cost of call(i), percentiles over count calls"""
+    perf_counter = time.perf_counter
+    durations = []
+    for i in range(count):
+        start = perf_counter()
+        call(i)
+        durations.append(perf_counter() - start)
+    durations.sort()
+    return {
+        "mean": sum(durations) / count,
+        "p50": durations[count // 2],
+        "p99": durations[int((count - 1) * 0.99)],
+        "max": durations[-1]
+    }
+
+
+def bench_tracing(count: int = 20000) -> dict:
+    """Cost for the replay loop of one button line: print to a pipe, traced by an
+    EventTracer writing to the same pipe, and traced with the event disabled
+
+    Returns:
+        dict: call time percentiles of every mode, in seconds
+    """
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=_drain_pipe, args=(read_fd,), daemon=True)
+    reader.start()
+    pipe = io.TextIOWrapper(io.FileIO(write_fd, "w"), line_buffering=True)
+
+    results = {"events": count}
+    results["print"] = _time_calls(lambda i: print(f"Button {i & 15} pressed", file=pipe), count)
+
+    tracer = EventTracer(TraceLevel.INFO, capacity=32768, output=pipe)
+    trace = tracer.emitter("replay.button_pressed")
+    results["traced"] = _time_calls(lambda i: trace(i & 15) if trace is not None else None, count)
+    tracer.flush()
+    results["dropped"] = tracer.dropped
+
+    disabled = EventTracer(TraceLevel.WARNING, enabled=False).emitter("replay.button_pressed")
+    results["disabled"] = _time_calls(lambda i: disabled(i & 15) if disabled is not None else None, count)
+
+    tracer.close()
+    pipe.close()
+    reader.join(timeout=1.0)
+    os.close(read_fd)
+    return results
+
+
+def run(count: int = 20000) -> dict:
+    return bench_tracing(count)
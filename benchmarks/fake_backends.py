@@ -0,0 +1,198 @@
+import copy
+import enum
+import json
+import math
+import os
+import time
+from types import SimpleNamespace
+from configuration_manager.config_manager import ConfigManager
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOYAXISMOTION = 1536
+JOYBUTTONDOWN = 1539
+JOYBUTTONUP = 1540
+
+
+class FakeJoystick:
+    """Scripted joystick: every axis follows a sine wave, and the polls of axis 0 are counted"""
+
+    def __init__(self, num_axes: int = 6, num_buttons: int = 16, frequency: float = 2.0):
+        self.num_axes = num_axes
+        self.num_buttons = num_buttons
+        self.frequency = frequency
+        self.start_time = time.perf_counter()
+        self.polls = 0
+
+    def init(self):
+        self.start_time = time.perf_counter()
+
+    def get_name(self) -> str:
+        return "Fake Joystick"
+
+    def get_numaxes(self) -> int:
+        return self.num_axes
+
+    def get_numbuttons(self) -> int:
+        return self.num_buttons
+
+    def get_axis(self, axis_id: int) -> float:
+        if axis_id == 0:
+            self.polls += 1
+        return self.value(axis_id)
+
+    def value(self, axis_id: int) -> float:
+        elapsed = time.perf_counter() - self.start_time
+        return math.sin(2 * math.pi * self.frequency * elapsed + axis_id)
+
+
+class FakePygame:
+    """Stands in for the pygame module: one scripted joystick, a button event stream
+    that presses and releases the buttons in turn at button_rate events per second,
+    and a JOYAXISMOTION event per axis every time the queue is read"""
+
+    JOYAXISMOTION = JOYAXISMOTION
+    JOYBUTTONDOWN = JOYBUTTONDOWN
+    JOYBUTTONUP = JOYBUTTONUP
+
+    def __init__(self, button_rate: float = 20.0, num_axes: int = 6, num_buttons: int = 16):
+        self.button_rate = button_rate
+        self.fake_joystick = FakeJoystick(num_axes, num_buttons)
+        self.joystick = SimpleNamespace(get_count=lambda: 1, Joystick=lambda index: self.fake_joystick)
+        self.event = SimpleNamespace(get=self._get_events)
+        self.start_time = time.perf_counter()
+        self.emitted = 0
+
+    def init(self):
+        self.start_time = time.perf_counter()
+
+    def _get_events(self) -> list:
+        due = int((time.perf_counter() - self.start_time) * self.button_rate)
+        events = []
+        while self.emitted < due:
+            button = (self.emitted // 2) % self.fake_joystick.num_buttons
+            type = JOYBUTTONDOWN if self.emitted % 2 == 0 else JOYBUTTONUP
+            events.append(SimpleNamespace(type=type, button=button, joy=0, instance_id=0))
+            self.emitted += 1
+
+        joystick = self.fake_joystick
+        for axis_id in range(joystick.num_axes):
+            events.append(SimpleNamespace(type=JOYAXISMOTION, axis=axis_id, value=joystick.value(axis_id), joy=0, instance_id=0))
+        return events
+
+
+class XUSB_BUTTON(enum.IntFlag):
+    XUSB_GAMEPAD_DPAD_UP = 0x0001
+    XUSB_GAMEPAD_DPAD_DOWN = 0x0002
+    XUSB_GAMEPAD_DPAD_LEFT = 0x0004
+    XUSB_GAMEPAD_DPAD_RIGHT = 0x0008
+    XUSB_GAMEPAD_START = 0x0010
+    XUSB_GAMEPAD_BACK = 0x0020
+    XUSB_GAMEPAD_LEFT_THUMB = 0x0040
+    XUSB_GAMEPAD_RIGHT_THUMB = 0x0080
+    XUSB_GAMEPAD_LEFT_SHOULDER = 0x0100
+    XUSB_GAMEPAD_RIGHT_SHOULDER = 0x0200
+    XUSB_GAMEPAD_GUIDE = 0x0400
+    XUSB_GAMEPAD_A = 0x1000
+    XUSB_GAMEPAD_B = 0x2000
+    XUSB_GAMEPAD_X = 0x4000
+    XUSB_GAMEPAD_Y = 0x8000
+
+
+class FakeVX360Gamepad:
+    """Virtual pad that records every call as (time.perf_counter(), method, args)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _record(self, method: str, *args):
+        self.calls.append((time.perf_counter(), method, args))
+
+    def press_button(self, button):
+        self._record("press_button", button)
+
+    def release_button(self, button):
+        self._record("release_button", button)
+
+    def left_joystick_float(self, x_value_float, y_value_float):
+        self._record("left_joystick_float", x_value_float, y_value_float)
+
+    def right_joystick_float(self, x_value_float, y_value_float):
+        self._record("right_joystick_float", x_value_float, y_value_float)
+
+    def left_trigger_float(self, value_float):
+        self._record("left_trigger_float", value_float)
+
+    def right_trigger_float(self, value_float):
+        self._record("right_trigger_float", value_float)
+
+    def reset(self):
+        self._record("reset")
+
+    def update(self):
+        self._record("update")
+
+
+class FakeVGamepad:
+    """Stands in for the vgamepad module"""
+    XUSB_BUTTON = XUSB_BUTTON
+    VX360Gamepad = FakeVX360Gamepad
+
+
+def create_config(folder: str, overrides: dict = None) -> ConfigManager:
+    """Writes a config file in folder that records to folder and loads it
+
+    Args:
+        folder (str): folder for the config file and the recordings
+        overrides (dict, optional): {"section.key": value} entries to change
+
+    Returns:
+        ConfigManager: the loaded configuration
+    """
+    config = copy.deepcopy(ConfigManager.DEFAULT_CONFIG)
+    config["paths"]["recording_folder_location"] = folder
+    config["paths"]["controller_scheme_folder"] = os.path.join(REPOSITORY_ROOT, "controller_schemes")
+    config["gamepad"]["name"] = "dualsense"
+
+    for key_path, value in (overrides or {}).items():
+        *sections, key = key_path.split(".")
+        section = config
+        for name in sections:
+            section = section.setdefault(name, {})
+        section[key] = value
+
+    config_path = os.path.join(folder, "config.json")
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+    return ConfigManager("dualsense", config_path)
+
+
+def generate_inputs(count: int, tick: float = 0.008, num_axes: int = 6, button_every: int = 16):
+    """Generates a synthetic recording shaped like the recorder output: every tick has
+    one event per axis, and every button_every ticks a button is pressed or released
+
+    Args:
+        count (int): number of inputs to generate
+        tick (float): seconds between poll ticks
+        num_axes (int): axis events per tick
+        button_every (int): ticks between button events
+    """
+    from input_classes.input import Input
+    from input_classes.input_type import Type
+
+    generated = 0
+    tick_index = 0
+    while generated < count:
+        timestamp = tick_index * tick
+        if tick_index % button_every == 0:
+            press_index = tick_index // button_every
+            yield Input((press_index // 2) % 16, Type.BUTTON, press_index % 2, timestamp)
+            generated += 1
+
+        for axis_id in range(num_axes):
+            if generated == count:
+                break
+            value = math.sin(timestamp + axis_id)
+            yield Input(axis_id, Type.AXIS, value, timestamp)
+            generated += 1
+        tick_index += 1
@@ -0,0 +1,57 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from benchmarks import bench_recorder, bench_recording_io, bench_replay, bench_multi_pad, bench_startup, bench_timeline, bench_tracing
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks with fake pygame and vgamepad backends")
+    parser.add_argument("--suite", action="append", choices=["recorder", "io", "replay", "multi_pad", "startup", "timeline", "tracing"],
+                        help="suite to run, can be repeated (default: all)")
+    parser.add_argument("--max-events", type=int, default=1_000_000, help="largest recording of the io suite (up to 10M)")
+    parser.add_argument("--record-duration", type=float, default=2.0, help="seconds recorded per poll rate")
+    parser.add_argument("--replay-events", type=int, default=3000, help="events of the replayed recording")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    args = parser.parse_args()
+    suites = args.suite or ["recorder", "io", "replay", "multi_pad", "startup", "timeline", "tracing"]
+
+    results = {
+        "commit": get_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if "recorder" in suites:
+        results["recorder"] = bench_recorder.run(args.record_duration)
+    if "io" in suites:
+        results["io"] = bench_recording_io.run(args.max_events)
+    if "replay" in suites:
+        results["replay"] = bench_replay.run(args.replay_events)
+    if "multi_pad" in suites:
+        results["multi_pad"] = bench_multi_pad.run(args.replay_events)
+    if "startup" in suites:
+        results["startup"] = bench_startup.run(args.replay_events)
+    if "timeline" in suites:
+        results["timeline"] = bench_timeline.run(args.replay_events)
+    if "tracing" in suites:
+        results["tracing"] = bench_tracing.run()
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import struct
+
+MAGIC = b"GMRB"
+VERSION = 2
+
+# magic, version, record size, record count (0 while a recording is still open)
+HEADER = struct.Struct("<4sHHQ")
+
+# id, type, value, timestamp, y value (second component of stick records, 0 otherwise)
+RECORD = struct.Struct("<HBxddd")
+
+# Version 1 records, without the y value
+RECORD_V1 = struct.Struct("<HBxdd")
+
+RECORDS = {1: RECORD_V1, VERSION: RECORD}
+
+EXTENSION = "gmr"
+
+
+def get_record_struct(version: int, record_size: int) -> struct.Struct:
+    """Record layout of a binary recording version
+
+    Raises:
+        ValueError: if the version is not supported or its record size does not match
+    """
+    record = RECORDS.get(version)
+    if record is None or record.size != record_size:
+        raise ValueError(f"Unsupported binary recording version {version}")
+    return record
+
+
+def is_binary_recording(filename: str) -> bool:
+    """Checks the header of a file to know if it is a binary recording
+
+    Args:
+        filename (str): path of the recording
+
+    Returns:
+        bool: True if the file starts with the binary recording magic
+    """
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
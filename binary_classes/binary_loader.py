@@ -0,0 +1,107 @@
+import mmap
+from collections.abc import Sequence
+from binary_classes.binary_format import HEADER, MAGIC, RECORD, RECORD_V1, get_record_struct
+from input_classes.input_record import to_input
+
+
+class MappedInputs(Sequence):
+    """Read-only view over the records of a memory-mapped binary recording.
+    Records are only unpacked when they are accessed.
+    """
+
+    def __init__(self, buffer, count: int, record=None):
+        self._buffer = buffer
+        self._count = count
+        self._record = record if record is not None else RECORD
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Record index out of range")
+
+        return to_input(*self._record.unpack_from(self._buffer, HEADER.size + index * self._record.size))
+
+    def iter_records(self):
+        """Iterates over the raw (id, type, value, timestamp, y value) tuples without creating Input objects
+        """
+        end = HEADER.size + self._count * self._record.size
+        records = self._record.iter_unpack(memoryview(self._buffer)[HEADER.size:end])
+        if self._record is RECORD_V1:
+            return (record + (0.0,) for record in records)
+        return records
+
+    @property
+    def record(self):
+        """Struct of the records, RECORD or RECORD_V1"""
+        return self._record
+
+    def records_buffer(self) -> memoryview:
+        """Packed records of the recording, without the header, for zero-copy readers"""
+        return memoryview(self._buffer)[HEADER.size:HEADER.size + self._count * self._record.size]
+
+
+class BinaryLoader:
+    """Loads a binary recording through mmap, same interface as JsonLoader.
+
+    The inputs read from the mapping, so the loader stays open while they are used;
+    close() it, or use it as a context manager, once they are no longer needed.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.inputs = None
+        self._file = None
+        self._buffer = None
+
+    def load(self):
+        self._file = open(self.filename, "rb")
+        try:
+            self._map()
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self):
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._buffer) < HEADER.size:
+            raise ValueError(f"{self.filename} is too short to be a binary recording")
+
+        magic, version, record_size, count = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename} is not a binary recording")
+        record = get_record_struct(version, record_size)
+
+        if count == 0:
+            # Still open or interrupted recording, use every complete record in the file
+            count = (len(self._buffer) - HEADER.size) // record.size
+
+        self.inputs = MappedInputs(self._buffer, count, record)
+
+    def getInputs(self) -> MappedInputs:
+        return self.inputs
+
+    def close(self):
+        """Unmaps the recording and closes the file, the inputs cannot be read afterwards.
+        Views returned by MappedInputs.records_buffer() must be released first"""
+        self.inputs = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "BinaryLoader":
+        if self._buffer is None:
+            self.load()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,23 @@
+from binary_classes.binary_format import HEADER, RECORD, MAGIC, VERSION
+from input_classes.input_record import sort_recorded, to_record
+from input_classes.input import Input
+
+
+class BinaryRecorder:
+    """Records inputs as fixed-width packed records, same interface as JsonRecorder
+    """
+
+    def __init__(self, filename: str):
+        self.record = bytearray()
+        self.filename = filename
+        self.count = 0
+
+    def append(self, input: Input):
+        self.record += RECORD.pack(*to_record(input))
+        self.count += 1
+
+    def save(self):
+        records = sort_recorded(list(RECORD.iter_unpack(self.record)))
+        with open(self.filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(records)))
+            f.write(b"".join(RECORD.pack(*record) for record in records))
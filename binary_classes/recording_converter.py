@@ -0,0 +1,68 @@
+import argparse
+from binary_classes.binary_format import is_binary_recording
+from binary_classes.binary_loader import BinaryLoader
+from binary_classes.binary_recorder import BinaryRecorder
+from json_classes.json_loader import JsonLoader
+from json_classes.json_recorder import JsonRecorder
+from json_classes.jsonl_recorder import JsonlRecorder
+
+RECORDERS = {
+    "json": JsonRecorder,
+    "jsonl": JsonlRecorder,
+    "binary": BinaryRecorder
+}
+
+
+def save_inputs(inputs, destination: str, format: str = "json"):
+    """Writes any collection of inputs (list, InputCollection, ColumnarInputCollection...)
+    to a recording file
+
+    Args:
+        inputs: iterable of Input like objects
+        destination (str): path of the recording to write
+        format (str): "json", "jsonl" or "binary"
+    """
+    recorder = RECORDERS[format](destination)
+    for input in inputs:
+        recorder.append(input)
+    recorder.save()
+
+
+def json_to_binary(source: str, destination: str):
+    """Converts a *_inputs.json recording to the binary format
+
+    Args:
+        source (str): path of the JSON recording
+        destination (str): path of the binary recording to write
+    """
+    loader = JsonLoader(source)
+    loader.load()
+    save_inputs(loader.getInputs(), destination, "binary")
+
+
+def binary_to_json(source: str, destination: str):
+    """Converts a binary recording back to the JSON format
+
+    Args:
+        source (str): path of the binary recording
+        destination (str): path of the JSON recording to write
+    """
+    with BinaryLoader(source) as loader:
+        save_inputs(loader.getInputs(), destination, "json")
+
+
+def convert(source: str, destination: str):
+    """Converts a recording to the other format, the direction is picked from the source header
+    """
+    if is_binary_recording(source):
+        binary_to_json(source, destination)
+    else:
+        json_to_binary(source, destination)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert recordings between the JSON and the binary format")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    args = parser.parse_args()
+    convert(args.source, args.destination)
@@ -0,0 +1,37 @@
+from binary_classes.binary_format import is_binary_recording
+from binary_classes.binary_loader import BinaryLoader
+from json_classes.json_loader import JsonLoader
+from json_classes.json_stream_loader import iter_json_inputs
+
+
+class RecordingLoader:
+    """Loads a recording picking the JSON or the binary loader from the file header
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.loader = None
+
+    def load(self):
+        if is_binary_recording(self.filename):
+            self.loader = BinaryLoader(self.filename)
+        else:
+            self.loader = JsonLoader(self.filename)
+        self.loader.load()
+
+    def getInputs(self):
+        return self.loader.getInputs()
+
+
+def iter_recording(filename: str):
+    """Iterates over the inputs of a recording without loading it whole: binary recordings
+    are read through mmap and JSON recordings are decoded incrementally. A binary recording
+    is unmapped once the iteration ends or the iterator is closed"""
+    if is_binary_recording(filename):
+        return _iter_binary(filename)
+    return iter_json_inputs(filename)
+
+
+def _iter_binary(filename: str):
+    with BinaryLoader(filename) as loader:
+        yield from loader.getInputs()
@@ -0,0 +1,134 @@
+import os
+import queue
+import threading
+import time
+from binary_classes.binary_format import HEADER, RECORD, MAGIC, VERSION, get_record_struct
+from input_classes.input_record import sort_recorded, to_record
+from input_classes.input import Input
+
+STOP = None
+
+
+class StreamingRecorder:
+    """Records inputs in the binary format while the recording is happening.
+
+    Capture threads push the events into a bounded queue and a writer thread appends
+    them to the file in chunks, calling fsync periodically. The header keeps a record
+    count of 0 until save() is called, so an interrupted recording can still be loaded
+    and repaired with recover_recording().
+
+    Events are written in the order they arrive, and the capture threads can push them
+    slightly out of timestamp order. save() and recover_recording() put the records back
+    in timestamp order, so a finished recording is sorted like those of the other recorders.
+    """
+
+    def __init__(self, filename: str, queue_size: int = 4096, chunk_size: int = 256, fsync_interval: float = 1.0):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self.in_order = True
+        self.queue = queue.Queue(maxsize=queue_size)
+
+        self._file = open(self.filename, "w+b")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+        self._file.flush()
+
+        self._writer_thread = threading.Thread(target=self._write_events, daemon=True)
+        self._writer_thread.start()
+
+    def append(self, input: Input):
+        """Queues an input to be written, blocks the capture thread if the queue is full
+        """
+        self.queue.put(to_record(input))
+
+    def _write_events(self):
+        chunk = bytearray()
+        pending = 0
+        last_fsync = time.perf_counter()
+        last_timestamp = float("-inf")
+        running = True
+
+        while running:
+            try:
+                event = self.queue.get(timeout=self.fsync_interval)
+                if event is STOP:
+                    running = False
+                else:
+                    chunk += RECORD.pack(*event)
+                    pending += 1
+                    if event[3] < last_timestamp:
+                        self.in_order = False
+                    last_timestamp = max(last_timestamp, event[3])
+            except queue.Empty:
+                pass
+
+            now = time.perf_counter()
+            if pending and (pending >= self.chunk_size or not running or self.queue.empty()):
+                self._file.write(chunk)
+                self.count += pending
+                chunk.clear()
+                pending = 0
+
+            if not running or now - last_fsync >= self.fsync_interval:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                last_fsync = now
+
+    def save(self):
+        """Flushes the pending events, sorts the records if they arrived out of order and
+        writes the final record count in the header
+        """
+        self.queue.put(STOP)
+        self._writer_thread.join()
+
+        if not self.in_order:
+            _sort_records(self._file, RECORD, self.count)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.count))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def recover_recording(filename: str) -> int:
+    """Repairs a binary recording that was not closed properly: drops the last
+    partially written record, sorts the records by timestamp and writes the record
+    count in the header
+
+    Args:
+        filename (str): path of the binary recording
+
+    Returns:
+        int: number of records recovered
+    """
+    with open(filename, "r+b") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{filename} is too short to be recovered")
+
+        magic, version, record_size, _ = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a supported binary recording")
+        record = get_record_struct(version, record_size)
+
+        size = os.fstat(f.fileno()).st_size
+        count = (size - HEADER.size) // record.size
+        f.truncate(HEADER.size + count * record.size)
+        _sort_records(f, record, count)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, version, record.size, count))
+        f.flush()
+        os.fsync(f.fileno())
+
+    return count
+
+
+def _sort_records(f, record, count: int):
+    """Rewrites the records of an open binary recording in timestamp order, if they are not"""
+    f.seek(HEADER.size)
+    records = list(record.iter_unpack(f.read(count * record.size)))
+    if all(previous[3] <= current[3] for previous, current in zip(records, records[1:])):
+        return
+    f.seek(HEADER.size)
+    f.write(b"".join(record.pack(*values) for values in sort_recorded(records)))
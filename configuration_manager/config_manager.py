@@ -2,6 +2,8 @@ import json
 import os
 from pathlib import Path
 from typing import Any, Dict
+from configuration_manager.config_snapshot import ConfigSnapshot, lookup
+from timing.event_tracer import get_tracer
 
 class ConfigManager:
     """Manages application configuration."""
@@ -13,11 +15,70 @@ class ConfigManager:
         },
         "gamepad":{
             "dead_zone": 0.06, #0.03
-            "name": ""
+            "name": "",
+            "axis_threshold": 0.01
         },
         "repetition":{
             "offset": 0.008,
-            "busy_waiting_time": 0.002
+            "busy_waiting_time": 0.002,
+            "wait_strategy": "hybrid",
+            "columnar": False,
+            "batching": True,
+            "batch_window": 0.001,
+            "keyframe_interval": 1.0,
+            "loop_gap": 5.0,
+            "loop_end": "reset",
+            "loop_report_every": 10,
+            "async_handoff": 0.005,
+            "streaming": False,
+            "read_ahead": 4096
+        },
+        "recording":{
+            "format": "json",
+            "streaming": False,
+            "queue_size": 4096,
+            "chunk_size": 256,
+            "fsync_interval": 1.0,
+            "metrics": True,
+            "metrics_interval": 5.0
+        },
+        "capture":{
+            "single_loop": False,
+            "rate": 1000,
+            "axis_events": True,
+            "buffer_size": 65536
+        },
+        "simplify":{
+            "inline": False,
+            "max_value_error": 0.02,
+            "max_time_error": 0.004,
+            "interpolate": False,
+            "interpolation_interval": 0.008
+        },
+        "telemetry":{
+            "enabled": True,
+            "capacity": 65536,
+            "trace_file": ""
+        },
+        "daemon":{
+            "socket_path": "/tmp/gamepad_macro_recorder.sock",
+            "cache_max_bytes": 268435456
+        },
+        "hot_reload":{
+            "enabled": True,
+            "interval": 0.5
+        },
+        "analysis":{
+            "sample_rate": 250.0,
+            "edge_tolerance": 0.05
+        },
+        "tracing":{
+            "enabled": True,
+            "level": "info",
+            "sample_every": 1,
+            "capacity": 8192,
+            "flush_interval": 0.05,
+            "output": ""
         }
     }
     
@@ -25,6 +86,7 @@ class ConfigManager:
         self.DEFAULT_CONFIG["gamepad"]["name"] = gamepad_name
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
+        self.snapshot: ConfigSnapshot = None
         self.load_config()
     
     def load_config(self):
@@ -32,34 +94,47 @@ class ConfigManager:
         if self.config_path.exists():
             with open(self.config_path, 'r') as f:
                 self.config = json.load(f)
-            print(f"Configuration loaded from {self.config_path}")
+            self.snapshot = ConfigSnapshot.from_dict(self.config)
+            get_tracer(self).info(f"Configuration loaded from {self.config_path}")
         else:
-            print(f"Config file not found. Creating default at {self.config_path}")
             self.config = self.DEFAULT_CONFIG.copy()
+            self.snapshot = ConfigSnapshot.from_dict(self.config)
+            get_tracer(self).warning(f"Config file not found. Creating default at {self.config_path}")
             self.save_config()
+
+    def reload(self) -> bool:
+        """Reloads the configuration file and swaps in a new snapshot. A file that cannot
+        be parsed, e.g. while it is being written, keeps the current configuration.
+
+        Returns:
+            bool: True if the configuration was reloaded
+        """
+        try:
+            with open(self.config_path, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as error:
+            get_tracer(self).warning(f"Configuration not reloaded from {self.config_path}: {error}")
+            return False
+
+        snapshot = ConfigSnapshot.from_dict(config, self.snapshot.version + 1)
+        self.config = config
+        self.snapshot = snapshot
+        get_tracer(self).info(f"Configuration reloaded from {self.config_path}")
+        return True
     
     def save_config(self):
         """Save current configuration to file."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_path, 'w') as f:
             json.dump(self.config, f, indent=2)
-        print(f"Configuration saved to {self.config_path}")
+        get_tracer(self).info(f"Configuration saved to {self.config_path}")
     
     def get(self, key_path: str, default=None) -> Any:
         """
         Get config value using dot notation.
         Example: get("paths.controller_schemes_dir")
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        return lookup(self.config, key_path, default)
     
     def get_controller_scheme_path(self, scheme_name: str = None) -> str:
         """Get full path to controller scheme file."""
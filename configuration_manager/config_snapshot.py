@@ -0,0 +1,72 @@
+from typing import Any, NamedTuple
+
+
+def lookup(config: dict, key_path: str, default=None) -> Any:
+    """Value of a dotted key ("gamepad.dead_zone") in a config dictionary, default if missing"""
+    value = config
+    for key in key_path.split('.'):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return default
+    return value
+
+
+class ConfigSnapshot(NamedTuple):
+    """Immutable view of the settings read by the capture and replay loops.
+
+    Hot paths hold a snapshot and read plain attributes instead of walking the config
+    dictionary. A reload builds a new snapshot and swaps it in, so a loop notices a
+    change by comparing the snapshot it holds with ConfigManager.snapshot.
+    """
+    version: int
+    dead_zone: float
+    axis_threshold: float
+    wait_strategy: str
+    busy_waiting_time: float
+    batch_window: float | None
+    interpolation_interval: float | None
+    async_handoff: float
+    loop_gap: float
+    loop_end: str
+    loop_report_every: int
+    trace_file: str
+    tracing: tuple
+
+    @classmethod
+    def from_dict(cls, config: dict, version: int = 0) -> "ConfigSnapshot":
+        """Builds the snapshot of a config dictionary, missing keys take their defaults"""
+        batch_window = None
+        if lookup(config, "repetition.batching", False):
+            batch_window = lookup(config, "repetition.batch_window", 0.0)
+        interpolation_interval = None
+        if lookup(config, "simplify.interpolate", False):
+            interpolation_interval = lookup(config, "simplify.interpolation_interval", 0.008)
+
+        return cls(
+            version=version,
+            dead_zone=lookup(config, "gamepad.dead_zone", 0.06),
+            axis_threshold=lookup(config, "gamepad.axis_threshold", 0.01),
+            wait_strategy=lookup(config, "repetition.wait_strategy", "busy"),
+            busy_waiting_time=lookup(config, "repetition.busy_waiting_time", 0.002),
+            batch_window=batch_window,
+            interpolation_interval=interpolation_interval,
+            async_handoff=lookup(config, "repetition.async_handoff", 0.005),
+            loop_gap=lookup(config, "repetition.loop_gap", 5.0),
+            loop_end=lookup(config, "repetition.loop_end", "reset"),
+            loop_report_every=lookup(config, "repetition.loop_report_every", 10),
+            trace_file=lookup(config, "telemetry.trace_file", ""),
+            tracing=(lookup(config, "tracing.enabled", True), lookup(config, "tracing.level", "info"),
+                     lookup(config, "tracing.sample_every", 1), lookup(config, "tracing.capacity", 8192),
+                     lookup(config, "tracing.flush_interval", 0.05), lookup(config, "tracing.output", ""))
+        )
+
+    @property
+    def compile_settings(self) -> tuple:
+        """Settings a compiled replay plan depends on, a plan is stale when they change"""
+        return (self.dead_zone, self.batch_window, self.interpolation_interval)
+
+    @property
+    def wait_settings(self) -> tuple:
+        """Settings the wait strategy is created from"""
+        return (self.wait_strategy, self.busy_waiting_time)
@@ -0,0 +1,69 @@
+import os
+import threading
+from collections.abc import Callable
+from configuration_manager.config_manager import ConfigManager
+from configuration_manager.config_snapshot import ConfigSnapshot
+
+
+class ConfigWatcher:
+    """Reloads the configuration when its file changes.
+
+    A daemon thread polls the modification time of the config file. On a change the
+    ConfigManager reloads it and swaps in a new ConfigSnapshot, which running recorders
+    and replays pick up on their next tick or step.
+    """
+
+    def __init__(self, config: ConfigManager, interval: float = 0.5):
+        """Constructor of the ConfigWatcher class.
+
+        Args:
+            config (ConfigManager): configuration to reload
+            interval (float): seconds between two checks of the file
+        """
+        self.config = config
+        self.interval = interval
+        self.callbacks = []
+        self.thread = None
+        self.stopped = threading.Event()
+        self.mtime = self._get_mtime()
+
+    def on_change(self, callback: Callable[[ConfigSnapshot], None]):
+        """Registers a function called with the new snapshot after every reload"""
+        self.callbacks.append(callback)
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def check(self) -> bool:
+        """Reloads the configuration if its file changed since the last check
+
+        Returns:
+            bool: True if a new snapshot was swapped in
+        """
+        mtime = self._get_mtime()
+        if mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        if not self.config.reload():
+            return False
+
+        for callback in self.callbacks:
+            callback(self.config.snapshot)
+        return True
+
+    def _watch(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def _get_mtime(self) -> int:
+        try:
+            return os.stat(self.config.config_path).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,93 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from gamepad.replay_plan import ReplayPlan
+
+# Rough memory use of a compiled plan: deadline float and list slot, step tuple,
+# and per event the (action, args) tuple with its bound method and mapped values
+STEP_BYTES = 120
+EVENT_BYTES = 200
+
+
+def estimate_plan_size(plan: ReplayPlan) -> int:
+    """Approximate memory used by a compiled plan, in bytes"""
+    return len(plan) * STEP_BYTES + plan.event_count * EVENT_BYTES
+
+
+class RecordingCache:
+    """LRU cache of compiled recordings, bounded by their approximate memory use.
+
+    Entries are keyed by path, modification time and size, so a recording that is
+    edited on disk is compiled again the next time it is requested. get() runs in worker
+    threads while status() runs on the event loop, so the entries are guarded by a lock;
+    compiling a missed recording happens outside of it.
+    """
+
+    def __init__(self, max_bytes: int, compile: Callable[[str], ReplayPlan]):
+        """Constructor of the RecordingCache class.
+
+        Args:
+            max_bytes (int): max approximate memory of the cached plans
+            compile (Callable[[str], ReplayPlan]): loads and compiles a recording file
+        """
+        self.max_bytes = max_bytes
+        self.compile = compile
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> tuple[ReplayPlan, bool]:
+        """Compiled plan of a recording
+
+        Returns:
+            tuple[ReplayPlan, bool]: the plan, and True if it came from the cache
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0], True
+            self.misses += 1
+
+        plan = self.compile(path)
+        size = estimate_plan_size(plan)
+        with self.lock:
+            self._remove_path(path)
+            self.entries[key] = (plan, size)
+            self.size += size
+            self._evict()
+        return plan, False
+
+    def _remove_path(self, path: str):
+        """Drops the stale versions of a recording, called with the lock held"""
+        for key in [key for key in self.entries if key[0] == path]:
+            self.size -= self.entries.pop(key)[1]
+
+    def _evict(self):
+        """Drops the least recently used plans until the cache fits, the newest one is always kept.
+        Called with the lock held"""
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.size -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "recordings": [key[0] for key in self.entries],
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -0,0 +1,41 @@
+import argparse
+import json
+import socket
+from configuration_manager.config_manager import ConfigManager
+
+
+def send_command(request: dict, socket_path: str) -> dict:
+    """Sends one command to the replay daemon and returns its response
+
+    Args:
+        request (dict): command, e.g. {"command": "play", "path": "recordings/dualsense_inputs.json"}
+        socket_path (str): Unix socket of the daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall((json.dumps(request) + "\n").encode())
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+    return json.loads(response)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a command to the replay daemon")
+    parser.add_argument("command", choices=["play", "stop", "pause", "resume", "status"])
+    parser.add_argument("path", nargs="?", help="recording to play")
+    parser.add_argument("--loop", action="store_true", help="replay the recording until stopped")
+    parser.add_argument("--socket", help="Unix socket of the daemon, daemon.socket_path if not given")
+    args = parser.parse_args()
+
+    request = {"command": args.command}
+    if args.command == "play":
+        if not args.path:
+            parser.error("play needs the path of a recording")
+        request.update(path=args.path, loop=args.loop)
+
+    socket_path = args.socket or ConfigManager().get("daemon.socket_path", "/tmp/gamepad_macro_recorder.sock")
+    print(json.dumps(send_command(request, socket_path), indent=2))
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import time
+from configuration_manager.config_manager import ConfigManager
+from configuration_manager.config_watcher import ConfigWatcher
+from daemon.recording_cache import RecordingCache
+from gamepad.gamepad_repeater import GamepadRepeater
+from gamepad.replay_controller import ReplayController
+from timing.wait_strategy import prepare_wait_strategy
+
+
+class ReplayDaemon:
+    """Long-running replay service listening on a Unix socket.
+
+    It keeps one virtual gamepad and a cache of compiled recordings, so a play command
+    only has to look up the plan and start the replay. Commands are JSON objects, one
+    per line, and every command gets a JSON response line:
+
+        {"command": "play", "path": "recordings/dualsense_inputs.json", "loop": false}
+        {"command": "stop"}
+        {"command": "pause"}
+        {"command": "resume"}
+        {"command": "status"}
+    """
+
+    def __init__(self, vg: object, config: ConfigManager, socket_path: str = None):
+        self.config = config
+        self.socket_path = socket_path or self.config.get("daemon.socket_path", "/tmp/gamepad_macro_recorder.sock")
+        self.repeater = GamepadRepeater(vg, config, load=False)
+        self.cache = RecordingCache(self.config.get("daemon.cache_max_bytes", 256 * 1024 * 1024), self._compile)
+        self.task = None
+        self.controller = None
+        self.playing = None
+        self.compile_settings = self.config.snapshot.compile_settings
+        self.play_lock = asyncio.Lock()
+
+    def _compile(self, path: str):
+        return self.repeater.compile_inputs(self.repeater.load_inputs(path))
+
+    async def serve(self):
+        """Listens on the socket until the task is cancelled"""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        print(f"Replay daemon listening on {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self._stop()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle(json.loads(line))
+                except Exception as error:
+                    response = {"ok": False, "error": str(error)}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle(self, request: dict) -> dict:
+        """Runs one command and returns its response"""
+        command = request.get("command")
+        if command == "play":
+            return await self._play(request["path"], request.get("loop", False))
+        if command == "stop":
+            return {"ok": True, "stopped": await self._stop()}
+        if command == "pause" and self.controller is not None:
+            self.controller.pause()
+            return {"ok": True}
+        if command == "resume" and self.controller is not None:
+            self.controller.resume()
+            return {"ok": True}
+        if command == "status":
+            return {"ok": True, "playing": self.playing if self._is_playing() else None,
+                    "paused": self._is_playing() and self.controller.is_paused, "cache": self.cache.status()}
+        raise ValueError(f"Unknown or unavailable command {command}")
+
+    async def _play(self, path: str, loop: bool) -> dict:
+        received_time = time.perf_counter()
+        async with self.play_lock:
+            await self._stop()
+
+            # Plans compiled with other dead zone, batching or interpolation settings are stale
+            if self.config.snapshot.compile_settings != self.compile_settings:
+                self.cache.clear()
+                self.compile_settings = self.config.snapshot.compile_settings
+
+            # Loading and compiling a missed recording must not stall the other clients
+            plan, cached = await asyncio.get_running_loop().run_in_executor(None, self.cache.get, path)
+            self.controller = ReplayController()
+            self.playing = os.path.abspath(path)
+            self.task = asyncio.create_task(self._run(plan, loop))
+        return {"ok": True, "cached": cached, "ready_ms": (time.perf_counter() - received_time) * 1000}
+
+    async def _run(self, plan, loop: bool):
+        if loop:
+            await self.repeater.loop_async(self.controller, plan)
+        else:
+            await self.repeater.replay_async(self.controller, plan)
+
+    async def _stop(self) -> bool:
+        """Cancels the running replay, which releases the buttons and centers the sticks"""
+        if not self._is_playing():
+            return False
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    def _is_playing(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+if __name__ == "__main__":
+    import vgamepad as vg
+
+    configuration = ConfigManager()
+    if configuration.get("hot_reload.enabled", False):
+        watcher = ConfigWatcher(configuration, configuration.get("hot_reload.interval", 0.5))
+        watcher.on_change(lambda snapshot: prepare_wait_strategy(snapshot.wait_strategy))
+        watcher.start()
+    daemon = ReplayDaemon(vg, configuration)
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,156 @@
+from collections.abc import Iterable, Iterator
+from binary_classes.recording_loader import iter_recording
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import PadState
+
+# Trigger axes of the dualsense scheme, the default gamepad. Triggers are released at a cut,
+# the other axes and the sticks centered
+TRIGGERS = (4, 5)
+
+
+def read(filename: str) -> Iterator[Input]:
+    """Streams the inputs of a JSON, JSONL or binary recording"""
+    return iter_recording(filename)
+
+
+def _shifted(input: Input, offset: float) -> Input:
+    return Input(input.id, input.type, input.value, input.timestamp + offset)
+
+
+def _neutral_inputs(state: PadState, timestamp: float, triggers: tuple) -> list[Input]:
+    """Inputs that release the buttons and center the axes and sticks of state at a cut"""
+    return state.release_inputs(timestamp) + state.center_inputs(timestamp, triggers)
+
+
+def time_shift(inputs: Iterable[Input], offset: float) -> Iterator[Input]:
+    """Moves every timestamp by offset seconds"""
+    for input in inputs:
+        yield _shifted(input, offset)
+
+
+def time_scale(inputs: Iterable[Input], factor: float, origin: float = 0.0) -> Iterator[Input]:
+    """Scales the time around origin, a factor of 0.5 replays twice as fast
+
+    Raises:
+        ValueError: if factor is not positive
+    """
+    if factor <= 0:
+        raise ValueError("Time scale factor must be positive")
+    for input in inputs:
+        yield Input(input.id, input.type, input.value, origin + (input.timestamp - origin) * factor)
+
+
+def trim(inputs: Iterable[Input], start: float = None, end: float = None, rebase: bool = True,
+         triggers: tuple = TRIGGERS) -> Iterator[Input]:
+    """Keeps the [start, end) window of a recording.
+
+    The window starts with the inputs that put the pad in the state the recording has at
+    start, like replay_segment(), and at end the buttons still held are released and the
+    axes and sticks centered.
+
+    Args:
+        inputs (Iterable[Input]): inputs of the recording, in timestamp order
+        start (float, optional): first timestamp kept, the start of the recording if None
+        end (float, optional): timestamp the window stops at, the end of the recording if None
+        rebase (bool): move the window so it starts at 0
+        triggers (tuple): ids of the trigger axes, released instead of centered
+    """
+    state = PadState()
+    offset = -start if rebase and start is not None else 0.0
+    started = start is None
+
+    for input in inputs:
+        if end is not None and input.timestamp >= end:
+            break
+        if not started:
+            if input.timestamp < start:
+                state.apply(input)
+                continue
+            started = True
+            yield from state.to_inputs(start + offset)
+        state.apply(input)
+        yield _shifted(input, offset) if offset else input
+
+    if started and end is not None:
+        yield from _neutral_inputs(state, end + offset, triggers)
+
+
+def drop_channels(inputs: Iterable[Input], channels: Iterable[tuple[Type, int]]) -> Iterator[Input]:
+    """Removes channels from a recording
+
+    Args:
+        inputs (Iterable[Input]): inputs of the recording
+        channels (Iterable[tuple[Type, int]]): (type, id) of the channels to drop, an id of None
+            drops every channel of the type
+    """
+    channels = set(channels)
+    for input in inputs:
+        if (input.type, input.id) not in channels and (input.type, None) not in channels:
+            yield input
+
+
+def concat(recordings: Iterable[Iterable[Input]], gap: float = 0.0, triggers: tuple = TRIGGERS) -> Iterator[Input]:
+    """Plays recordings one after the other. Every recording is moved so its time 0 comes
+    gap seconds after the last input of the previous one, at which the buttons held by the
+    previous one are released and its axes and sticks centered
+
+    Args:
+        recordings (Iterable[Iterable[Input]]): input streams, each in timestamp order
+        gap (float): seconds between two recordings
+        triggers (tuple): ids of the trigger axes, released instead of centered
+    """
+    end = None
+    for inputs in recordings:
+        offset = 0.0 if end is None else end + gap
+        state = PadState()
+        for input in inputs:
+            input = _shifted(input, offset)
+            state.apply(input)
+            end = input.timestamp
+            yield input
+        if end is not None:
+            yield from _neutral_inputs(state, end, triggers)
+
+
+def splice(inputs: Iterable[Input], inserted: Iterable[Input], at: float, gap: float = 0.0,
+           triggers: tuple = TRIGGERS) -> Iterator[Input]:
+    """Inserts a recording into another at time at. The inputs of the host recording after
+    at are pushed back by the length of the inserted recording plus gap.
+
+    The inserted recording starts from a neutral pad: the buttons the host holds at the cut
+    are released and its axes and sticks centered. The pad is made neutral again at the end
+    of the inserted recording, then put back in the state of the host at the cut before its
+    inputs resume.
+
+    Args:
+        inputs (Iterable[Input]): host recording, in timestamp order
+        inserted (Iterable[Input]): recording to insert, its time 0 is placed at at
+        at (float): timestamp of the host recording the insertion happens at
+        gap (float): seconds between the end of the inserted recording and the resume of the host
+        triggers (tuple): ids of the trigger axes, released instead of centered
+    """
+    inputs = iter(inputs)
+    state = PadState()
+    pending = None
+    for input in inputs:
+        if input.timestamp >= at:
+            pending = input
+            break
+        state.apply(input)
+        yield input
+
+    yield from _neutral_inputs(state, at, triggers)
+    end = at
+    inserted_state = PadState()
+    for input in time_shift(inserted, at):
+        inserted_state.apply(input)
+        end = input.timestamp
+        yield input
+    yield from _neutral_inputs(inserted_state, end, triggers)
+
+    resume = end + gap
+    yield from state.to_inputs(resume)
+    if pending is not None:
+        yield from time_shift([pending], resume - at)
+        yield from time_shift(inputs, resume - at)
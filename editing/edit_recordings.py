@@ -0,0 +1,104 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from configuration_manager.config_manager import ConfigManager
+from editing.recording_pipeline import RecordingPipeline
+from gamepad.controller_scheme import get_scheme
+from gamepad.gamepad_super import RECORDING_EXTENSIONS
+from input_classes.input_type import Type
+
+
+def parse_channel(channel: str) -> tuple[Type, int]:
+    """Parses a channel of the command line: "button", "axis:4" or "stick:0"
+
+    Raises:
+        argparse.ArgumentTypeError: if the type is not a Type name or the id not an integer
+    """
+    name, _, id = channel.partition(":")
+    try:
+        return Type[name.upper()], int(id) if id else None
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"Invalid channel {channel}, expected button, axis or stick and an optional :id")
+
+
+def build_pipeline(source, args: argparse.Namespace, triggers: tuple) -> RecordingPipeline:
+    """Applies the edits of the command line in a fixed order: drop, trim, splice, scale, shift"""
+    pipeline = source if isinstance(source, RecordingPipeline) else RecordingPipeline(source, triggers=triggers)
+    if args.drop:
+        pipeline = pipeline.drop_channels(args.drop)
+    if args.start is not None or args.end is not None:
+        pipeline = pipeline.trim(args.start, args.end, rebase=not args.keep_time)
+    if args.splice:
+        inserted, at = args.splice
+        pipeline = pipeline.splice(inserted, float(at), args.gap)
+    if args.scale is not None:
+        pipeline = pipeline.time_scale(args.scale)
+    if args.shift is not None:
+        pipeline = pipeline.time_shift(args.shift)
+    return pipeline
+
+
+def run_job(pipeline: RecordingPipeline, destination: str, format: str = None) -> tuple[str, int, float]:
+    """Writes one output, in a worker process
+
+    Returns:
+        tuple[str, int, float]: destination, inputs written and seconds taken
+    """
+    start = time.perf_counter()
+    count = pipeline.write(destination, format)
+    return destination, count, time.perf_counter() - start
+
+
+def get_destination(source: str, output_dir: str, format: str = None) -> str:
+    """Output path of a source in batch mode, same name with the extension of format if given"""
+    name = os.path.basename(source)
+    if format is not None:
+        name = f"{os.path.splitext(name)[0]}.{RECORDING_EXTENSIONS[format]}"
+    return os.path.join(output_dir, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Edits recordings as streams: trim, splice, concat, time scale and "
+                                                 "drop channels. Each source is edited in its own process")
+    parser.add_argument("sources", nargs="+", help="recordings to edit (JSON, JSONL or binary)")
+    parser.add_argument("-o", "--output", help="output recording, with one source or --concat")
+    parser.add_argument("--output-dir", help="folder for the outputs of a batch, named after the sources")
+    parser.add_argument("--format", choices=list(RECORDING_EXTENSIONS), help="output format (default: from the extension)")
+    parser.add_argument("--concat", action="store_true", help="play the sources one after the other into --output")
+    parser.add_argument("--gap", type=float, default=0.0, help="seconds between concatenated or spliced recordings")
+    parser.add_argument("--drop", type=parse_channel, action="append", help="channel to drop: button, axis:4, stick:0...")
+    parser.add_argument("--start", type=float, help="first timestamp kept")
+    parser.add_argument("--end", type=float, help="timestamp the recording is cut at")
+    parser.add_argument("--keep-time", action="store_true", help="keep the timestamps of a trimmed window instead of starting at 0")
+    parser.add_argument("--splice", nargs=2, metavar=("RECORDING", "AT"), help="insert a recording at a timestamp")
+    parser.add_argument("--scale", type=float, help="time scale factor, 0.5 replays twice as fast")
+    parser.add_argument("--shift", type=float, help="seconds added to every timestamp")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    # Triggers are released at the cuts, the other axes centered
+    triggers = get_scheme(ConfigManager()).triggers
+
+    if args.concat or len(args.sources) == 1:
+        if not args.output:
+            parser.error("--output is required with one source or --concat")
+        source = RecordingPipeline.concat(args.sources, args.gap, triggers) if args.concat else args.sources[0]
+        jobs = [(build_pipeline(source, args, triggers), args.output)]
+    else:
+        if not args.output_dir:
+            parser.error("--output-dir is required with several sources")
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs = [(build_pipeline(source, args, triggers), get_destination(source, args.output_dir, args.format))
+                for source in args.sources]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_job, pipeline, destination, args.format) for pipeline, destination in jobs]
+        for future in as_completed(futures):
+            destination, count, duration = future.result()
+            print(f"{destination}: {count} inputs in {duration:.2f}s")
+    print(f"{len(jobs)} recordings written in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+from collections.abc import Iterable, Iterator
+from editing import edit_operations
+from editing.recording_writer import get_format, write_recording
+from input_classes.input import Input
+from input_classes.input_type import Type
+
+OPERATIONS = {
+    "trim": edit_operations.trim,
+    "time_shift": edit_operations.time_shift,
+    "time_scale": edit_operations.time_scale,
+    "drop_channels": edit_operations.drop_channels,
+    "splice": edit_operations.splice,
+}
+# Operations that neutralize the pad at their cuts and need the trigger axes
+CUT_OPERATIONS = ("trim", "splice")
+
+
+class RecordingPipeline:
+    """Chain of edit operations over one or more recordings.
+
+    Building the pipeline only records the operations, nothing is read until it is
+    iterated or written. The inputs then stream from the source files through one
+    generator per operation to the output file, so memory does not grow with the length
+    of the recordings. A pipeline only holds file names and parameters, so it can be sent
+    to a worker process.
+
+    Example:
+        RecordingPipeline("a.json").trim(2.0, 10.0).time_scale(0.5).write("a_fast.gmr")
+    """
+
+    def __init__(self, source, steps: tuple = (), triggers: tuple = edit_operations.TRIGGERS):
+        """Constructor of the RecordingPipeline class.
+
+        Args:
+            source: path of a recording, or ("concat", sources, gap) for concat()
+            steps (tuple): (operation name, keyword arguments) applied in order
+            triggers (tuple): ids of the trigger axes of the recordings, released at the cuts
+                where the other axes are centered
+        """
+        self.source = source
+        self.steps = steps
+        self.triggers = tuple(triggers)
+
+    @classmethod
+    def concat(cls, sources: Iterable, gap: float = 0.0, triggers: tuple = edit_operations.TRIGGERS) -> "RecordingPipeline":
+        """Pipeline over several recordings played one after the other
+
+        Args:
+            sources (Iterable): paths of recordings or other pipelines
+            gap (float): seconds between two recordings
+            triggers (tuple): ids of the trigger axes of the recordings
+        """
+        return cls(("concat", tuple(sources), gap), triggers=triggers)
+
+    def _then(self, name: str, **arguments) -> "RecordingPipeline":
+        return RecordingPipeline(self.source, self.steps + ((name, arguments),), self.triggers)
+
+    def trim(self, start: float = None, end: float = None, rebase: bool = True) -> "RecordingPipeline":
+        """Keeps the [start, end) window, see edit_operations.trim()"""
+        return self._then("trim", start=start, end=end, rebase=rebase)
+
+    def time_shift(self, offset: float) -> "RecordingPipeline":
+        return self._then("time_shift", offset=offset)
+
+    def time_scale(self, factor: float, origin: float = 0.0) -> "RecordingPipeline":
+        if factor <= 0:
+            raise ValueError("Time scale factor must be positive")
+        return self._then("time_scale", factor=factor, origin=origin)
+
+    def drop_channels(self, channels: Iterable[tuple[Type, int]]) -> "RecordingPipeline":
+        """Removes the (type, id) channels, an id of None dropping every channel of the type"""
+        return self._then("drop_channels", channels=tuple(channels))
+
+    def splice(self, inserted, at: float, gap: float = 0.0) -> "RecordingPipeline":
+        """Inserts a recording or a pipeline at time at, see edit_operations.splice()"""
+        return self._then("splice", inserted=inserted, at=at, gap=gap)
+
+    def __iter__(self) -> Iterator[Input]:
+        inputs = _open(self.source, self.triggers)
+        for name, arguments in self.steps:
+            if name == "splice":
+                arguments = dict(arguments, inserted=_open(arguments["inserted"], self.triggers))
+            if name in CUT_OPERATIONS:
+                arguments = dict(arguments, triggers=self.triggers)
+            inputs = OPERATIONS[name](inputs, **arguments)
+        return iter(inputs)
+
+    def write(self, destination: str, format: str = None) -> int:
+        """Runs the pipeline into a recording. The output is written next to the destination
+        and moved over it at the end, so a recording can be edited in place
+
+        Args:
+            destination (str): path of the recording to write
+            format (str, optional): "json", "jsonl" or "binary", picked from the extension if None
+
+        Returns:
+            int: number of inputs written
+        """
+        temporary = f"{destination}.tmp"
+        try:
+            count = write_recording(self, temporary, format if format is not None else get_format(destination))
+            os.replace(temporary, destination)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return count
+
+
+def _open(source, triggers: tuple = edit_operations.TRIGGERS) -> Iterator[Input]:
+    """Input stream of a pipeline source: a path, a pipeline or a concat source"""
+    if isinstance(source, RecordingPipeline):
+        return iter(source)
+    if isinstance(source, tuple) and source[0] == "concat":
+        _, sources, gap = source
+        return edit_operations.concat((_open(source, triggers) for source in sources), gap, triggers)
+    return edit_operations.read(source)
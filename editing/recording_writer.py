@@ -0,0 +1,82 @@
+import json
+import os
+from collections.abc import Iterable
+from binary_classes.binary_format import HEADER, MAGIC, RECORD, VERSION
+from gamepad.gamepad_super import RECORDING_EXTENSIONS
+from input_classes.input import Input
+from input_classes.input_record import to_record
+
+CHUNK_SIZE = 4096
+
+FORMATS = {extension: format for format, extension in RECORDING_EXTENSIONS.items()}
+
+
+def get_format(filename: str) -> str:
+    """Format of a recording from its extension, JSON if the extension is not known"""
+    extension = os.path.splitext(filename)[1].lstrip(".")
+    return FORMATS.get(extension, "json")
+
+
+def write_recording(inputs: Iterable[Input], destination: str, format: str = None) -> int:
+    """Writes inputs to a recording as they are generated, without holding them in memory.
+    Unlike the recorders the inputs are not sorted, they must already be in timestamp order
+
+    Args:
+        inputs (Iterable[Input]): inputs to write
+        destination (str): path of the recording
+        format (str, optional): "json", "jsonl" or "binary", picked from the extension if None
+
+    Returns:
+        int: number of inputs written
+    """
+    format = format if format is not None else get_format(destination)
+    if format not in WRITERS:
+        raise ValueError(f"Unknown recording format {format}")
+    return WRITERS[format](inputs, destination)
+
+
+def _write_json(inputs: Iterable[Input], destination: str) -> int:
+    count = 0
+    with open(destination, "w") as f:
+        f.write("[")
+        for input in inputs:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(input.to_dict()))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def _write_jsonl(inputs: Iterable[Input], destination: str) -> int:
+    count = 0
+    with open(destination, "w") as f:
+        for input in inputs:
+            f.write(json.dumps(input.to_dict()))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _write_binary(inputs: Iterable[Input], destination: str) -> int:
+    """The header keeps a count of 0 until every record is written, like StreamingRecorder"""
+    count = 0
+    chunk = bytearray()
+    with open(destination, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+        for input in inputs:
+            chunk += RECORD.pack(*to_record(input))
+            count += 1
+            if len(chunk) >= CHUNK_SIZE * RECORD.size:
+                f.write(chunk)
+                chunk.clear()
+        f.write(chunk)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count))
+    return count
+
+
+WRITERS = {
+    "json": _write_json,
+    "jsonl": _write_jsonl,
+    "binary": _write_binary
+}
@@ -0,0 +1,147 @@
+import time
+from input_classes.event_ring_buffer import EventRingBuffer
+from input_classes.input_type import Type
+from configuration_manager.config_manager import ConfigManager
+from input_classes.stick_events import get_stick_axes
+from timing.recorder_metrics import RecorderMetrics
+
+DOWN = 0
+UP = 1
+AXIS_THRESHOLD = 0.01
+MAX_RATE = 1000
+
+
+class CaptureEngine:
+    """Captures buttons and axes of a joystick in a single loop running at a fixed rate.
+
+    Every tick drains the pygame event queue and reads the axes, either from
+    JOYAXISMOTION events or by polling them, and writes the events into a ring buffer
+    that a consumer drains. All the events of a tick share the timestamp of the tick,
+    so buttons and axes are timed the same way. When either axis of a stick moves, both
+    are read and written as one stick event.
+    """
+
+    def __init__(self, pg: object, joystick: object, ring: EventRingBuffer, rate: float = MAX_RATE,
+                 dead_zone: float = 0.06, use_axis_events: bool = True, axis_threshold: float = AXIS_THRESHOLD,
+                 config: ConfigManager = None, sticks: tuple = (), metrics: RecorderMetrics = None,
+                 trace_overrun=None):
+        """Constructor of the CaptureEngine class.
+
+        Args:
+            pg (object): Pygame instance for handling gamepad events.
+            joystick (object): initialized pygame joystick to capture
+            ring (EventRingBuffer): buffer the captured events are written into
+            rate (float): ticks per second, up to 1000
+            dead_zone (float): axis values below it are recorded as 0
+            use_axis_events (bool): read axes from JOYAXISMOTION events when pygame has them
+            axis_threshold (float): minimum change of an axis to record it again
+            config (ConfigManager, optional): when given, dead_zone and axis_threshold follow its
+                snapshot, so a reloaded configuration applies from the next tick
+            sticks (tuple): (x axis id, y axis id) of the sticks to capture as stick events
+            metrics (RecorderMetrics, optional): receives the timing of every tick
+            trace_overrun (optional): emitter of the recorder.overrun trace event, see EventTracer.emitter()
+        """
+        if not 0 < rate <= MAX_RATE:
+            raise ValueError(f"Capture rate must be between 0 and {MAX_RATE} Hz")
+        self.pg = pg
+        self.joystick = joystick
+        self.ring = ring
+        self.interval = 1 / rate
+        self.dead_zone = dead_zone
+        self.axis_threshold = axis_threshold
+        self.config = config
+        self.sticks = sticks
+        self.metrics = metrics
+        self.trace_overrun = trace_overrun
+        self.use_axis_events = use_axis_events and hasattr(pg, "JOYAXISMOTION")
+        self.isCapturing = False
+        self.ticks = 0
+
+    def run(self, start_time: float):
+        """Runs the capture loop until stop() is called
+
+        Args:
+            start_time (float): time.perf_counter() value timestamps are relative to
+        """
+        self.isCapturing = True
+        pg = self.pg
+        push = self.ring.push
+        button_type = Type.BUTTON.value
+        axis_type = Type.AXIS.value
+        stick_type = Type.STICK.value
+        dead_zone = self.dead_zone
+        axis_threshold = self.axis_threshold
+        num_axes = self.joystick.get_numaxes()
+        get_axis = self.joystick.get_axis
+        sticks = [(x_id, y_id) for x_id, y_id in self.sticks if x_id < num_axes and y_id < num_axes]
+        stick_axes = get_stick_axes(sticks)
+        stick_y_ids = dict(sticks)
+        last_values = {}
+        moved_axes = set(range(num_axes))
+        config = self.config
+        snapshot = config.snapshot if config is not None else None
+        metrics = self.metrics
+        trace_overrun = self.trace_overrun
+
+        next_tick = time.perf_counter()
+        while self.isCapturing:
+            tick_start = time.perf_counter()
+            timestamp = tick_start - start_time
+            if config is not None and config.snapshot is not snapshot:
+                snapshot = config.snapshot
+                dead_zone = snapshot.dead_zone
+                axis_threshold = snapshot.axis_threshold
+
+            for event in pg.event.get():
+                if event.type == pg.JOYBUTTONDOWN:
+                    push(event.button, button_type, DOWN, timestamp)
+                elif event.type == pg.JOYBUTTONUP:
+                    push(event.button, button_type, UP, timestamp)
+                elif self.use_axis_events and event.type == pg.JOYAXISMOTION:
+                    moved_axes.add(event.axis)
+
+            axes = moved_axes if self.use_axis_events else range(num_axes)
+            moved_sticks = set()
+            for axis_id in axes:
+                if axis_id in stick_axes:
+                    moved_sticks.add(stick_axes[axis_id][0])
+                    continue
+
+                value = get_axis(axis_id)
+                if abs(value) < dead_zone:
+                    value = 0
+
+                if axis_id not in last_values or abs(value - last_values[axis_id]) > axis_threshold:
+                    push(axis_id, axis_type, value, timestamp)
+                    last_values[axis_id] = value
+
+            for x_id in moved_sticks:
+                x = get_axis(x_id)
+                y = get_axis(stick_y_ids[x_id])
+                if abs(x) < dead_zone:
+                    x = 0
+                if abs(y) < dead_zone:
+                    y = 0
+
+                last = last_values.get(x_id)
+                if last is None or abs(x - last[0]) > axis_threshold or abs(y - last[1]) > axis_threshold:
+                    push(x_id, stick_type, x, timestamp, y)
+                    last_values[x_id] = (x, y)
+            if self.use_axis_events:
+                moved_axes = set()
+
+            self.ticks += 1
+            now = time.perf_counter()
+            if metrics is not None:
+                metrics.tick(tick_start, now - tick_start)
+            next_tick += self.interval
+            sleep_time = next_tick - now
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            else:
+                next_tick = time.perf_counter() # Overrun, do not try to catch up
+                if trace_overrun is not None and now - tick_start > self.interval:
+                    trace_overrun(self.ticks, (now - tick_start) * 1000)
+
+    def stop(self):
+        self.isCapturing = False
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from configuration_manager.config_manager import ConfigManager
+
+AXES = {
+    "left_stick": ("x", "y"),
+    "right_stick": ("x", "y"),
+    "triggers": ("left", "right")
+}
+
+BUTTONS = (
+    "bottom_action", "right_action", "left_action", "top_action", "select_or_share", "system_home",
+    "start_menu", "left_stick_click", "right_stick_click", "left_bumper", "right_bumper", "dpad_up",
+    "dpad_down", "dpad_left", "dpad_right", "aux_center_or_touchpad"
+)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+class ControllerScheme(Mapping):
+    """Validated, read-only controller scheme.
+
+    It is indexed like the scheme JSON (scheme["axis"]["left_stick"]["x"]) and also resolves
+    the ids the hot paths need once. Being read-only, one instance is shared by every reader,
+    repeater and mapper of the same scheme file.
+    """
+
+    def __init__(self, data: dict, source: str = "<scheme>"):
+        """Constructor of the ControllerScheme class.
+
+        Args:
+            data (dict): parsed scheme JSON
+            source (str): file the scheme comes from, used in the error messages
+
+        Raises:
+            ValueError: if an axis or button is missing or its id is not an integer
+        """
+        self.source = source
+        self._validate(data)
+        self._data = _freeze(data)
+
+        axis = self._data["axis"]
+        self.left_stick = (axis["left_stick"]["x"], axis["left_stick"]["y"])
+        self.right_stick = (axis["right_stick"]["x"], axis["right_stick"]["y"])
+        self.triggers = (axis["triggers"]["left"], axis["triggers"]["right"])
+        self.sticks = (self.left_stick, self.right_stick)
+        self.buttons = self._data["button"]
+
+    def _validate(self, data: dict):
+        for section in ("axis", "button"):
+            if not isinstance(data.get(section), dict):
+                raise ValueError(f"{self.source}: missing \"{section}\" section")
+
+        for group, names in AXES.items():
+            ids = data["axis"].get(group)
+            if not isinstance(ids, dict):
+                raise ValueError(f"{self.source}: missing axis group \"{group}\"")
+            for name in names:
+                self._check_id(ids, name, f"axis.{group}.{name}")
+
+        for name in BUTTONS:
+            self._check_id(data["button"], name, f"button.{name}")
+
+    def _check_id(self, ids: dict, name: str, key_path: str):
+        if name not in ids:
+            raise ValueError(f"{self.source}: missing {key_path}")
+        if not isinstance(ids[name], int) or isinstance(ids[name], bool):
+            raise ValueError(f"{self.source}: {key_path} must be an integer id, got {ids[name]!r}")
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def load_scheme(file_path: str) -> ControllerScheme:
+    """Parses a scheme file once, later calls return the same ControllerScheme until the file changes
+
+    Args:
+        file_path (str): path of the scheme JSON
+
+    Returns:
+        ControllerScheme: the validated scheme
+    """
+    file_path = os.path.abspath(file_path)
+    mtime = os.stat(file_path).st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(file_path) as f:
+            scheme = ControllerScheme(json.load(f), file_path)
+        _cache[file_path] = (mtime, scheme)
+        return scheme
+
+
+def get_scheme(config: ConfigManager) -> ControllerScheme:
+    """Scheme of the configured gamepad, from paths.controller_scheme_folder and gamepad.name"""
+    folder = config.get("paths.controller_scheme_folder")
+    name = config.get("gamepad.name")
+    return load_scheme(os.path.join(folder, f"{name}.json"))
@@ -1,8 +1,19 @@
 from json_classes.json_recorder import JsonRecorder
+from json_classes.jsonl_recorder import JsonlRecorder
+from binary_classes.binary_recorder import BinaryRecorder
+from binary_classes.streaming_recorder import StreamingRecorder
 from input_classes.input import Input
 from input_classes.input_type import Type
 from gamepad.gamepad_super import GamepadSuper
+from gamepad.capture_engine import CaptureEngine
+from input_classes.event_ring_buffer import EventRingBuffer
+from input_classes.input_record import TYPES
+from input_classes.axis_simplifier import InlineAxisSimplifier
+from input_classes.stick_events import get_stick_axes
 from configuration_manager.config_manager import ConfigManager
+from timing.recorder_metrics import RecorderMetrics
+from timing.event_tracer import get_tracer
+import os
 import time
 import threading
 
@@ -24,18 +35,64 @@ class GamepadReader(GamepadSuper):
         self.joystick = None
         self.isRecording = False
         self.start_time = None
-        gamepad_record = f"{self.config.get("paths.recording_folder_location")}/{self.config.get("gamepad.name")}_inputs.json"
-        self.json_recorder = self.json_recorder = JsonRecorder(gamepad_record)
+        self.recorder = self._create_recorder()
 
         self.poll_thread = None
         self.poll_interval = 0.008 #125Hz polling rate
 
+        self.capture_engine = None
+        self.ring = None
+        self.drain_thread = None
+
+        self.metrics = None
+        self.metrics_thread = None
+        self.metrics_stopped = None
+
+        self._resolve_tracer()
+
+        self.axis_threshold = self.config.snapshot.axis_threshold
+        self.axis_simplifiers = {}
+        self.simplify = self.config.get("simplify.inline", False)
+
         self.last_left_stick_timestamp = 0
         self.last_right_stick_timestamp = 0
         self.last_left_trigger_timestamp = 0
         self.last_right_trigger_timestamp = 0
 
 
+    def _resolve_tracer(self):
+        """Takes the tracer of the current tracing settings and its emitters. The loops that
+        drain button events take them again when the tracing settings are reloaded, the
+        capture engine keeps the overrun emitter of the start of the recording"""
+        self.tracer = get_tracer(self.config)
+        self.trace_down = self.tracer.emitter("recorder.button_down")
+        self.trace_up = self.tracer.emitter("recorder.button_up")
+        self.trace_overrun = self.tracer.emitter("recorder.overrun")
+
+    def _create_recorder(self):
+        """Creates the recorder for the configured recording.format and recording.streaming
+
+        Raises:
+            ValueError: When streaming is requested with a format other than binary or with inline simplification
+        """
+        gamepad_record = self._get_recording_path()
+        format = self.config.get("recording.format", "json")
+
+        if self.config.get("recording.streaming", False):
+            if format != "binary":
+                raise ValueError("Streaming recordings require recording.format to be binary")
+            if self.config.get("simplify.inline", False):
+                raise ValueError("Streaming recordings cannot be simplified inline, simplify them offline")
+            return StreamingRecorder(gamepad_record,
+                                     queue_size=self.config.get("recording.queue_size", 4096),
+                                     chunk_size=self.config.get("recording.chunk_size", 256),
+                                     fsync_interval=self.config.get("recording.fsync_interval", 1.0))
+        if format == "binary":
+            return BinaryRecorder(gamepad_record)
+        if format == "jsonl":
+            return JsonlRecorder(gamepad_record)
+        return JsonRecorder(gamepad_record)
+
     def record(self):
         """Starts the "recording" of the button inputs and axises movements
 
@@ -49,54 +106,214 @@ class GamepadReader(GamepadSuper):
             raise SystemError("No joystick connected")
 
         self.joystick = self.pg.joystick.Joystick(0)
+        self._resolve_tracer()
 
-        print(f"The gamepad {self.joystick.get_name()} is being recorded. Start using your controller")
+        self.tracer.info(f"The gamepad {self.joystick.get_name()} is being recorded. Start using your controller")
 
 
         self.joystick.init()
         self.isRecording = True
         self.start_time = time.perf_counter()
 
+        if self.config.get("recording.metrics", True):
+            self._start_metrics()
+
+        if self.config.get("capture.single_loop", False):
+            self._capture_single_loop()
+            return
+
         self.poll_thread = threading.Thread(target=self._poll_axes, daemon=True)
         self.poll_thread.start()
 
         self._read_button_events()
 
+    def _start_metrics(self):
+        """Creates the metrics of the recording, and the thread that prints them every
+        recording.metrics_interval seconds"""
+        single_loop = self.config.get("capture.single_loop", False)
+        interval = 1 / self.config.get("capture.rate", 1000) if single_loop else self.poll_interval
+        # The threaded reader only knows that a button event arrived since its previous drain
+        self.metrics = RecorderMetrics(interval, latency_bound=not single_loop)
+        self.metrics.start(self.start_time)
+
+        report_interval = self.config.get("recording.metrics_interval", 5.0)
+        if report_interval > 0:
+            # Every recording has its own event, so the reporter of a stopped recording never
+            # outlives it, even when the next one starts at once
+            self.metrics_stopped = threading.Event()
+            self.metrics_thread = threading.Thread(target=self._report_metrics,
+                                                   args=(report_interval, self.metrics, self.metrics_stopped),
+                                                   daemon=True)
+            self.metrics_thread.start()
+
+    def _report_metrics(self, report_interval: float, metrics: RecorderMetrics, stopped: threading.Event):
+        while not stopped.wait(report_interval):
+            self.tracer.info(f"[RECORDER] {metrics.report()}")
+
+    def _get_metrics_path(self) -> str:
+        """Summary file of the metrics, next to the recording"""
+        return f"{os.path.splitext(self._get_recording_path())[0]}.metrics.json"
+
+    def _capture_single_loop(self):
+        """Captures buttons and axes with the CaptureEngine, a drain thread moves the
+        events from its ring buffer to the recorder"""
+        self.ring = EventRingBuffer(self.config.get("capture.buffer_size", 65536))
+        self.capture_engine = CaptureEngine(self.pg, self.joystick, self.ring,
+                                            rate=self.config.get("capture.rate", 1000),
+                                            dead_zone=self.config.snapshot.dead_zone,
+                                            use_axis_events=self.config.get("capture.axis_events", True),
+                                            axis_threshold=self.axis_threshold,
+                                            config=self.config,
+                                            sticks=self.scheme.sticks,
+                                            metrics=self.metrics,
+                                            trace_overrun=self.trace_overrun)
+
+        self.drain_thread = threading.Thread(target=self._drain_events, daemon=True)
+        self.drain_thread.start()
+
+        self.capture_engine.run(self.start_time)
+
+    def _drain_events(self):
+        """Moves the captured events from the ring buffer to the recorder"""
+        tracing = self.config.snapshot.tracing
+        while self.isRecording:
+            if self.config.snapshot.tracing != tracing:
+                tracing = self.config.snapshot.tracing
+                self._resolve_tracer()
+            self._drain_ring()
+            time.sleep(0.005)
+
+    def _drain_ring(self):
+        axis_type = Type.AXIS.value
+        stick_type = Type.STICK.value
+        metrics = self.metrics
+        now = time.perf_counter() - self.start_time
+        for id, type, value, timestamp, y_value in self.ring.drain():
+            if type == axis_type:
+                self._append_axis(id, value, timestamp)
+            elif type == stick_type:
+                self._append_axis(id, (value, y_value), timestamp, Type.STICK)
+            else:
+                self.recorder.append(Input(id, TYPES[type], value, timestamp))
+                trace = self.trace_down if value == DOWN else self.trace_up
+                if trace is not None:
+                    trace(id, timestamp)
+                if metrics is not None:
+                    metrics.add_events()
+                    metrics.drained(now - timestamp)
+
+    def _append_axis(self, axis_id: int, value, timestamp: float, type: Type = Type.AXIS):
+        """Records an axis value or a (x, y) stick position, through the inline simplifier
+        of the channel when enabled"""
+        if self.metrics is not None:
+            self.metrics.add_events()
+        if not self.simplify:
+            self.recorder.append(Input(axis_id, type, value, timestamp))
+            return
+
+        channel = (type, axis_id)
+        if channel not in self.axis_simplifiers:
+            self.axis_simplifiers[channel] = InlineAxisSimplifier(self.config.get("simplify.max_value_error", 0.02),
+                                                                  self.config.get("simplify.max_time_error", 0.004),
+                                                                  hold_gap=self._get_tick_interval())
+        for kept_timestamp, kept_value in self.axis_simplifiers[channel].add(timestamp, value):
+            self.recorder.append(Input(axis_id, type, kept_value, kept_timestamp))
+
+    def _get_tick_interval(self) -> float:
+        if self.capture_engine:
+            return self.capture_engine.interval
+        return self.poll_interval
+
+    def _flush_simplifiers(self):
+        added = kept = 0
+        for (type, axis_id), simplifier in self.axis_simplifiers.items():
+            for kept_timestamp, kept_value in simplifier.flush():
+                self.recorder.append(Input(axis_id, type, kept_value, kept_timestamp))
+            added += simplifier.added
+            kept += simplifier.kept
+        if kept:
+            self.tracer.info(f"Axis simplification kept {kept} of {added} axis inputs, reduction ratio {added / kept:.2f}x")
+
     def _read_button_events(self):
-        """Handle button press/release events"""
+        """Handle button press/release events. pygame events carry no time, so an event is
+        timestamped when it is handled: it arrived at some point after the previous read of
+        the queue, and the time since that read is recorded as the upper bound of its drain
+        latency, which is also the bound of its timestamp error"""
+        metrics = self.metrics
+        trace_down = self.trace_down
+        trace_up = self.trace_up
+        tracing = self.config.snapshot.tracing
+        previous_read = time.perf_counter()
         while self.isRecording:
+            if self.config.snapshot.tracing != tracing:
+                tracing = self.config.snapshot.tracing
+                self._resolve_tracer()
+                trace_down = self.trace_down
+                trace_up = self.trace_up
+            read_time = time.perf_counter()
             for event in self.pg.event.get():
                 if event.type == self.pg.JOYBUTTONDOWN:
                     timestamp = time.perf_counter() - self.start_time
                     input = Input(event.button, Type.BUTTON, DOWN, timestamp)
-                    self.json_recorder.append(input)
+                    self.recorder.append(input)
+                    if trace_down is not None:
+                        trace_down(event.button, timestamp)
 
                 elif event.type == self.pg.JOYBUTTONUP:
                     timestamp = time.perf_counter() - self.start_time
                     input = Input(event.button, Type.BUTTON, UP, timestamp)
-                    self.json_recorder.append(input)
+                    self.recorder.append(input)
+                    if trace_up is not None:
+                        trace_up(event.button, timestamp)
+                else:
+                    continue
+
+                if metrics is not None:
+                    metrics.add_events()
+                    metrics.drained(timestamp + self.start_time - previous_read)
+            previous_read = read_time
             time.sleep(0.001)
 
     def _poll_axes(self):
-        """Poll all axes at fixed intervals for smooth recording"""
+        """Poll all axes at fixed intervals for smooth recording. Both axes of a stick are
+        sampled in the same tick and recorded together as one stick event"""
         last_values = {}
+        num_axes = self.joystick.get_numaxes()
+        sticks = [(x_id, y_id) for x_id, y_id in self.scheme.sticks if x_id < num_axes and y_id < num_axes]
+        stick_axes = get_stick_axes(sticks)
+        stick_values = {}
 
         while self.isRecording:
             loop_start = time.perf_counter()
             timestamp = loop_start - self.start_time
+            snapshot = self.config.snapshot
+            dead_zone = snapshot.dead_zone
+            axis_threshold = snapshot.axis_threshold
 
-            for axis_id in range(self.joystick.get_numaxes()):
+            for axis_id in range(num_axes):
                 value = self.joystick.get_axis(axis_id)
 
-                if abs(value) < self.config.get("gamepad.dead_zone"):
+                if abs(value) < dead_zone:
                     value = 0
 
-                if axis_id not in last_values or abs(value - last_values[axis_id]) > 0.01:
-                    input = Input(axis_id, Type.AXIS, value, timestamp)
-                    self.json_recorder.append(input)
+                if axis_id in stick_axes:
+                    stick_values[axis_id] = value
+                elif axis_id not in last_values or abs(value - last_values[axis_id]) > axis_threshold:
+                    self._append_axis(axis_id, value, timestamp)
                     last_values[axis_id] = value
 
+            for x_id, y_id in sticks:
+                x, y = stick_values[x_id], stick_values[y_id]
+                last = last_values.get(x_id)
+                if last is None or abs(x - last[0]) > axis_threshold or abs(y - last[1]) > axis_threshold:
+                    self._append_axis(x_id, (x, y), timestamp, Type.STICK)
+                    last_values[x_id] = (x, y)
+
             elapsed = time.perf_counter() - loop_start
+            if self.metrics is not None:
+                self.metrics.tick(loop_start, elapsed)
+            if elapsed > self.poll_interval and self.trace_overrun is not None:
+                self.trace_overrun(0, elapsed * 1000)
             sleep_time = max(0, self.poll_interval - elapsed)
             time.sleep(sleep_time)
 
@@ -110,9 +327,27 @@ class GamepadReader(GamepadSuper):
             raise RuntimeError("Cannot stop recording: no recording in progress") 
 
         self.isRecording = False
+        if self.metrics_stopped is not None:
+            self.metrics_stopped.set()
+            self.metrics_thread.join(timeout=1.0)
+            self.metrics_stopped = None
+        if self.metrics is not None:
+            self.metrics.stop(time.perf_counter())
         if self.poll_thread:
             self.poll_thread.join(timeout=1.0)
-        self.json_recorder.save()
+        if self.capture_engine:
+            self.capture_engine.stop()
+            self.drain_thread.join(timeout=1.0)
+            self._drain_ring()
+            if self.ring.overflows:
+                self.tracer.warning(f"{self.ring.overflows} events were dropped because the capture buffer was full")
+        self._flush_simplifiers()
+        self.recorder.save()
+
+        if self.metrics is not None:
+            self.tracer.info(f"[RECORDER] {self.metrics}")
+            self.metrics.export(self._get_metrics_path())
+        self.tracer.flush()
 
     
 
@@ -1,83 +1,474 @@
-from json_classes.json_loader import JsonLoader
+from binary_classes.recording_loader import RecordingLoader, iter_recording
 from input_classes.input_collection import InputCollection
-from input_classes.input import Input
+from input_classes.columnar_input_collection import ColumnarInputCollection
+from input_classes.recording_index import RecordingIndex
+from input_classes.stick_events import has_axis_stick_events, pair_stick_events, iter_paired_stick_events
+from input_classes.read_ahead import ReadAhead
 from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from gamepad.replay_plan import ReplayPlan, iter_steps
+from gamepad.replay_controller import ReplayController
 from gamepad.gamepad_super import GamepadSuper
-from input_classes.input_type import Type
 from configuration_manager.config_manager import ConfigManager
+from timing.wait_strategy import create_wait_strategy
+from timing.replay_telemetry import ReplayTelemetry
+from timing.event_tracer import get_tracer
+import asyncio
+import threading
 import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+async def _finish_step(step: Future):
+    """Waits for a step submitted to the worker thread. Cancelling the task cancels the
+    asyncio wrapper at once but not a step already running, which must fire before the pad
+    is reset, or its presses would stay held"""
+    while not step.done():
+        try:
+            await asyncio.shield(asyncio.wrap_future(step))
+        except asyncio.CancelledError:
+            continue
+        except Exception:
+            return
+
+
+def load_recording(inputs_file: str, config: ConfigManager, sticks: tuple):
+    """Loads the inputs of a recording for a replay, in the collection selected by
+    repetition.columnar. Recordings with one axis channel per stick axis are upgraded to
+    paired stick events
+
+    Args:
+        inputs_file (str): recording to load
+        config (ConfigManager): configuration of the application
+        sticks (tuple): (x axis id, y axis id) of the sticks of the controller scheme
+    """
+    loader = RecordingLoader(inputs_file)
+    loader.load()
+    inputs = loader.getInputs()
+    if has_axis_stick_events(inputs, sticks):
+        count = len(inputs)
+        inputs = pair_stick_events(inputs, sticks)
+        get_tracer(config).info(f"Upgraded {inputs_file} to paired stick events: {count} inputs -> {len(inputs)}")
+
+    if config.get("repetition.columnar", False):
+        return ColumnarInputCollection.from_inputs(inputs)
+    return InputCollection(inputs)
 
-BUTTON_DOWN = 0
-BUTTON_UP = 1
 
 class GamepadRepeater(GamepadSuper):
-    def __init__(self, vg: object, config: ConfigManager):
+    def __init__(self, vg: object, config: ConfigManager, inputs_file: str = None, load: bool = True):
+        """Constructor of the GamepadRepeater class.
+
+        Args:
+            vg (object): vgamepad instance used to create the virtual gamepad.
+            config (ConfigManager): configuration of the application
+            inputs_file (str, optional): recording to replay, the recording of the configured gamepad if None
+            load (bool): load and compile the recording now, False to only create the virtual gamepad.
+                With repetition.streaming the recording is only loaded whole when a replay needs it
+        """
         super().__init__(config)
         self.gamepad = vg.VX360Gamepad()
         #gamepad_name = self.config.get("gamepad.name")
         self.mapper = GamepadToVGamepadMapper(vg, config)
-        
-        inputs_file = f"{self.config.get("paths.recording_folder_location")}/{self.config.get("gamepad.name")}_inputs.json"
+        self.telemetry = None
+        if self.config.get("telemetry.enabled", False):
+            self.telemetry = ReplayTelemetry(self.config.get("telemetry.capacity", 65536))
+        self._resolve_tracer()
+        self.snapshot = self.config.snapshot
+        self.waiter = create_wait_strategy(*self.snapshot.wait_settings, tracer=self.tracer)
+
+        self.inputs = None
+        self.index = None
+        self.plan = None
+        self.plan_settings = None
+        self.recompile_thread = None
+        self.recompiled = None
+        self.loop_drift = array("d")
+        self.step_executor = None
+        self.inputs_file = inputs_file if inputs_file is not None else self._get_recording_path()
+        if load and not self.config.get("repetition.streaming", False):
+            self.load(self.inputs_file)
+
+    def load(self, inputs_file: str):
+        """Loads a recording, indexes it and compiles it into the replay plan"""
+        self.inputs = self.load_inputs(inputs_file)
+        self.index = RecordingIndex(self.inputs, self.config.get("repetition.keyframe_interval", 1.0))
+        self.compile()
+
+    def load_inputs(self, inputs_file: str):
+        """Loads the inputs of a recording, see load_recording()"""
+        return load_recording(inputs_file, self.config, self.scheme.sticks)
+
+    def compile(self) -> ReplayPlan:
+        """Compiles the loaded recording into the replay plan used by replay()"""
+        self.plan_settings = self.config.snapshot.compile_settings
+        self.plan = self.compile_inputs(self.inputs)
+        self.tracer.info(f"Replay plan: {self.plan.event_count} inputs in {len(self.plan)} reports "
+                         f"({self.plan.reports_saved} reports saved by batching)")
+        return self.plan
+
+    def compile_inputs(self, inputs, time_offset: float = 0.0) -> ReplayPlan:
+        """Compiles any inputs into a replay plan for the virtual gamepad of this repeater"""
+        snapshot = self.config.snapshot
+        return ReplayPlan.compile(inputs, self.gamepad, self.mapper, snapshot.batch_window,
+                                  snapshot.interpolation_interval, time_offset)
+
+    def _resolve_tracer(self):
+        """Takes the tracer of the current tracing settings and its emitters"""
+        self.tracer = get_tracer(self.config)
+        self.trace_pressed = self.tracer.emitter("replay.button_pressed")
+        self.trace_released = self.tracer.emitter("replay.button_released")
+        self.trace_step = self.tracer.emitter("replay.step")
+
+    def _refresh_config(self, recompile: bool = True):
+        """Applies a reloaded configuration: the wait strategy is created again when its
+        settings changed, and the loaded recording compiled again when the plan settings changed.
+        The new wait strategy never calibrates here, the config watcher prepares it, so
+        the swap does not delay the next step of a running replay
+
+        Args:
+            recompile (bool): False inside a replay, where only the timing changes are applied
+        """
+        snapshot = self.config.snapshot
+        if snapshot is not self.snapshot:
+            if snapshot.tracing != self.snapshot.tracing:
+                self._resolve_tracer()
+            if snapshot.wait_settings != self.snapshot.wait_settings:
+                self.waiter = create_wait_strategy(*snapshot.wait_settings, calibrate=False, tracer=self.tracer)
+            self.snapshot = snapshot
 
-        loader = JsonLoader(inputs_file)
-        loader.load()
-        self.inputs = InputCollection(loader.getInputs())
+        if recompile and self.plan is not None and snapshot.compile_settings != self.plan_settings:
+            self.compile()
 
-    def _initialize(self):
-        self.iterator = self.inputs.get_iterator()
+    def _swap_recompiled_plan(self):
+        """Applies changed plan settings between two iterations of loop() without holding the
+        next one: the recording is compiled again in a background thread, and the new plan
+        replaces the current one at the first iteration boundary after it is ready"""
+        thread = self.recompile_thread
+        if thread is not None:
+            if thread.is_alive():
+                return
+            self.recompile_thread = None
+            self.plan_settings, self.plan = self.recompiled
+            self.recompiled = None
+            self.tracer.info(f"Replay plan: {self.plan.event_count} inputs in {len(self.plan)} reports "
+                             f"({self.plan.reports_saved} reports saved by batching)")
+
+        if self.config.snapshot.compile_settings != self.plan_settings:
+            self.recompile_thread = threading.Thread(target=self._recompile, daemon=True)
+            self.recompile_thread.start()
+
+    def _recompile(self):
+        settings = self.config.snapshot.compile_settings
+        self.recompiled = (settings, self.compile_inputs(self.inputs))
+
+    def ensure_plan(self):
+        """Loads and compiles the recording if it was not yet"""
+        if self.plan is not None:
+            return
+        if self.inputs is None:
+            self.load(self.inputs_file)
+        else:
+            self.compile()
 
     def replay(self):
-        self._initialize()
-        
-        if not self.iterator:
+        if self.config.get("repetition.streaming", False) and self.plan is None:
+            self.replay_stream()
+            return
+
+        self._refresh_config()
+        self.ensure_plan()
+
+        if not len(self.plan):
+            raise SystemError("No inputs to iterate to")
+
+        self._run_plan(self.plan, time.perf_counter())
+        self._finish_run()
+
+    def replay_stream(self, inputs_file: str = None):
+        """Replays a recording while it is decoded. A read-ahead thread decodes and compiles
+        the steps at most repetition.read_ahead steps ahead of the replay, so the replay starts
+        at once and memory does not grow with the recording length. Interpolation of simplified
+        recordings is not applied, it needs the whole recording
+
+        Args:
+            inputs_file (str, optional): recording to replay, the recording of this repeater if None
+        """
+        self._refresh_config(recompile=False)
+        inputs = iter_paired_stick_events(iter_recording(inputs_file or self.inputs_file), self.scheme.sticks)
+        steps = ReadAhead(iter_steps(inputs, self.gamepad, self.mapper, self.snapshot.batch_window),
+                          self.config.get("repetition.read_ahead", 4096))
+        try:
+            fired_time = self._run_steps(steps, time.perf_counter())
+        finally:
+            steps.close()
+        if fired_time is None:
+            raise SystemError("No inputs to iterate to")
+        self._finish_run()
+
+    async def replay_async(self, controller: ReplayController = None, plan: ReplayPlan = None,
+                           start_time: float = None) -> float:
+        """Replays the recording once without blocking the event loop. Coarse waits sleep
+        on the event loop, the last repetition.async_handoff seconds before every step are
+        waited, and the step fired, in a worker thread with the wait strategy.
+
+        Pausing through the controller shifts the time base by the paused time. Cancelling
+        the task stops the replay, releases every button and centers the sticks once the
+        step the worker thread may be firing is done.
+
+        Args:
+            controller (ReplayController, optional): used to pause and resume the replay
+            plan (ReplayPlan, optional): plan to replay, the plan of the loaded recording if None
+            start_time (float, optional): time.perf_counter() value the deadlines are relative to,
+                before the paused time of the controller is added. Now if None
+
+        Returns:
+            float: time.perf_counter() value at which the last step fired
+        """
+        if plan is None:
+            self.ensure_plan()
+            plan = self.plan
+
+        if not len(plan):
             raise SystemError("No inputs to iterate to")
-        
-        start_time = time.perf_counter()
 
-        while self.iterator.hasNext():
-            input = self.iterator.next()
-            target_time = start_time + input.timestamp
-            
-            time_remaining = target_time - time.perf_counter()
-            time_for_waiting = self.config.get("repetition.busy_waiting_time")
-            if time_remaining > time_for_waiting: # If more that this time remaining (2ms)
-                time.sleep(max(0, time_remaining - time_for_waiting)) # Sleep most of it
+        controller = controller or ReplayController()
+        if self.step_executor is None:
+            self.step_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="replay-step")
+        self._refresh_config(recompile=False)
+        config = self.config
+        handoff = self.snapshot.async_handoff
+        if self.telemetry is not None:
+            self.telemetry.reset()
 
-            while time.perf_counter() < target_time:
-                pass
+        if start_time is None:
+            start_time = time.perf_counter() - controller.paused_time
+        pending = None
+        fired_time = None
+        try:
+            for deadline, calls in zip(plan.deadlines, plan.steps):
+                while True:
+                    if controller.is_paused:
+                        await controller.wait_resumed()
+                    target_time = start_time + controller.paused_time + deadline
+                    time_remaining = target_time - time.perf_counter()
+                    if time_remaining <= handoff:
+                        break
+                    await controller.sleep(time_remaining - handoff)
 
-            self._execute_input(input)
+                if config.snapshot is not self.snapshot:
+                    self._refresh_config(recompile=False)
+                    handoff = self.snapshot.async_handoff
+                pending = self.step_executor.submit(self._fire_step, target_time, deadline, calls)
+                fired_time = await asyncio.wrap_future(pending)
+                pending = None
+        except asyncio.CancelledError:
+            if pending is not None:
+                await _finish_step(pending)
+            self._reset_pad()
+            raise
+        return fired_time
 
+    def _fire_step(self, target_time: float, deadline: float, calls: tuple) -> float:
+        """Waits for a step and fires it, used by replay_async() in a worker thread
 
-    def _execute_input(self, input: Input):
-        if input.type == Type.BUTTON:       
-            self._execute_button(input)
-        elif input.type == Type.AXIS:
-            self._execute_axis(input)
+        Returns:
+            float: time.perf_counter() value at which the step fired
+        """
+        self.waiter.wait_until(target_time)
+        fired_time = time.perf_counter()
+        for action, args in calls:
+            action(*args)
+        self.gamepad.update()
+        if self.telemetry is not None:
+            self.telemetry.record(deadline, fired_time - target_time, time.perf_counter() - fired_time)
+        if self.trace_step is not None:
+            self.trace_step(len(calls), (fired_time - target_time) * 1e6)
+        if self.trace_pressed is not None or self.trace_released is not None:
+            self._trace_buttons(calls)
+        return fired_time
+
+    def _trace_buttons(self, calls: tuple):
+        """Traces the presses and releases of a fired step, after its report was sent"""
+        press = self.gamepad.press_button
+        release = self.gamepad.release_button
+        for action, args in calls:
+            if action == press:
+                if self.trace_pressed is not None:
+                    self.trace_pressed(int(args[0]))
+            elif action == release and self.trace_released is not None:
+                self.trace_released(int(args[0]))
+
+    async def loop_async(self, controller: ReplayController = None, plan: ReplayPlan = None, iterations: int = None):
+        """Replays a plan in a loop without blocking the event loop, on the absolute timeline
+        of loop(): every iteration starts repetition.loop_gap seconds after the planned end of
+        the previous one, shifted by the time spent paused. Every iteration waits and fires
+        like replay_async()
+
+        Args:
+            controller (ReplayController, optional): used to pause and resume the replay
+            plan (ReplayPlan, optional): plan to replay, the plan of the loaded recording if None
+            iterations (int, optional): number of iterations, loops forever if None
+        """
+        if plan is None:
+            self.ensure_plan()
+            plan = self.plan
+        if not len(plan):
+            raise SystemError("No inputs to iterate to")
+
+        controller = controller or ReplayController()
+        self.loop_drift = array("d")
+        iteration_start = time.perf_counter() - controller.paused_time
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            last_fired_time = await self.replay_async(controller, plan, iteration_start)
+            self.loop_drift.append(last_fired_time - (iteration_start + controller.paused_time + plan.duration))
+
+            snapshot = self.snapshot
+            if snapshot.loop_end == "reset":
+                self._reset_pad()
+
+            iteration += 1
+            iteration_start += plan.duration + snapshot.loop_gap
+            if snapshot.loop_report_every and iteration % snapshot.loop_report_every == 0:
+                self.tracer.info(f"[LOOP] {self.get_loop_report()}")
+
+    def loop(self, iterations: int = None):
+        """Replays the recording in a loop. Every iteration is scheduled on one absolute
+        timeline, repetition.loop_gap seconds after the end of the previous one, so the
+        timing errors of an iteration do not add up over the next ones
+
+        Args:
+            iterations (int, optional): number of iterations, loops forever if None
+        """
+        self.ensure_plan()
+
+        if not len(self.plan):
+            raise SystemError("No inputs to iterate to")
+
+        self.loop_drift = array("d")
+        iteration_start = time.perf_counter()
+        iteration = 0
+        try:
+            while iterations is None or iteration < iterations:
+                # A reloaded configuration applies from the next iteration, a new plan once compiled
+                self._refresh_config(recompile=False)
+                self._swap_recompiled_plan()
+                plan = self.plan
+                last_fired_time = self._run_plan(plan, iteration_start)
+                self.loop_drift.append(last_fired_time - (iteration_start + plan.duration))
+
+                snapshot = self.snapshot
+                if snapshot.loop_end == "reset":
+                    self._reset_pad()
+
+                iteration += 1
+                iteration_start += plan.duration + snapshot.loop_gap
+                if snapshot.loop_report_every and iteration % snapshot.loop_report_every == 0:
+                    self.tracer.info(f"[LOOP] {self.get_loop_report()}")
+        finally:
+            if self.recompile_thread is not None:
+                self.recompile_thread.join()
+                self.recompile_thread = None
+                self.plan_settings, self.plan = self.recompiled
+                self.recompiled = None
+            self._reset_pad()
+            self._finish_run()
 
+    def get_loop_report(self) -> str:
+        """Drift of the last step of the last iteration against the absolute timeline"""
+        if not self.loop_drift:
+            return "no iterations"
+        return (f"{len(self.loop_drift)} iterations, drift {self.loop_drift[-1] * 1e6:.0f}us, "
+                f"max drift {max(self.loop_drift) * 1e6:.0f}us")
+
+    def _reset_pad(self):
+        """Releases every button and centers the sticks and triggers"""
+        self.gamepad.reset()
         self.gamepad.update()
 
-    def _execute_button(self, input: Input):
-        if input.value == BUTTON_DOWN:
-            self.gamepad.press_button(self.mapper.map_input(input))
-            print(f"Button {input.id} pressed")
-        elif input.value == BUTTON_UP:
-            self.gamepad.release_button(self.mapper.map_input(input))
-            print(f"Button {input.id} released")
-        
-
-
-    def _execute_axis(self, input: Input):
-        value = self.mapper.map_input(input)
-
-        if self._is_left_stick(input):
-            x, y = value
-            self.gamepad.left_joystick_float(x_value_float=x, y_value_float=y)
-        elif self._is_right_stick(input):
-            x, y = value
-            self.gamepad.right_joystick_float(x_value_float=x,y_value_float=y)
-        elif self._is_left_trigger(input):
-            self.gamepad.left_trigger_float(value)
-        elif self._is_right_trigger(input):
-            self.gamepad.right_trigger_float(value)
+    def replay_segment(self, start: float, end: float = None):
+        """Replays only the [start, end) window of the recording. The virtual pad is put
+        at once in the state the recording has at start, then the window is played
+
+        Args:
+            start (float): timestamp of the recording the replay starts at
+            end (float, optional): timestamp the replay stops at, the end of the recording if None
+        """
+        self.ensure_plan()
+        state, first = self.index.state_at(start)
+        last = self.index.bisect(end) if end is not None else len(self.index)
+        if first >= last and not state.axes and not state.sticks and not state.buttons:
+            raise SystemError("No inputs to iterate to")
+
+        inputs = state.to_inputs(start) + [self.inputs[position] for position in range(first, last)]
+        plan = self.compile_inputs(inputs, time_offset=-start)
+
+        self.gamepad.reset()
+        self._run_plan(plan, time.perf_counter())
+        self._finish_run()
+
+    def _run_plan(self, plan: ReplayPlan, start_time: float) -> float:
+        """Replays a compiled plan
+
+        Returns:
+            float: time.perf_counter() value at which the last step fired
+        """
+        fired_time = self._run_steps(zip(plan.deadlines, plan.steps), start_time)
+        return start_time if fired_time is None else fired_time
+
+    def _run_steps(self, steps, start_time: float) -> float:
+        """Hot loop of the replay: waits for every deadline and calls the resolved actions
+
+        Args:
+            steps: (deadline, calls) steps, from a plan or from iter_steps()
+            start_time (float): time.perf_counter() value the deadlines are relative to
+
+        Returns:
+            float: time.perf_counter() value at which the last step fired, None if there was no step
+        """
+        update = self.gamepad.update
+        wait_until = self.waiter.wait_until
+        perf_counter = time.perf_counter
+        config = self.config
+        snapshot = self.snapshot
+        telemetry = self.telemetry
+        trace_step = self.trace_step
+        trace_buttons = self.trace_pressed is not None or self.trace_released is not None
+        if telemetry is not None:
+            telemetry.reset()
+
+        fired_time = None
+        for deadline, calls in steps:
+            if config.snapshot is not snapshot:
+                self._refresh_config(recompile=False)
+                snapshot = self.snapshot
+                wait_until = self.waiter.wait_until
+                trace_step = self.trace_step
+                trace_buttons = self.trace_pressed is not None or self.trace_released is not None
+
+            target_time = start_time + deadline
+            wait_until(target_time)
+            fired_time = perf_counter()
+
+            for action, args in calls:
+                action(*args)
+            update()
+
+            if telemetry is not None:
+                telemetry.record(deadline, fired_time - target_time, perf_counter() - fired_time)
+            if trace_step is not None:
+                trace_step(len(calls), (fired_time - target_time) * 1e6)
+            if trace_buttons:
+                self._trace_buttons(calls)
+
+        return fired_time
 
+    def _finish_run(self):
+        """Exports the telemetry of the last run to telemetry.trace_file and writes out the
+        traced lines. Called once per replay, after the last iteration of a loop, so no file
+        is written between two iterations"""
+        if self.telemetry is not None and self.snapshot.trace_file:
+            self.telemetry.export(self.snapshot.trace_file)
+        # The lines traced during the replay are written before the caller prints its report
+        self.tracer.flush()
@@ -1,25 +1,39 @@
 from configuration_manager.config_manager import ConfigManager
-import json
+from binary_classes.binary_format import EXTENSION as BINARY_EXTENSION
+from gamepad.controller_scheme import get_scheme
+
+RECORDING_EXTENSIONS = {
+    "json": "json",
+    "jsonl": "jsonl",
+    "binary": BINARY_EXTENSION
+}
+
+
+def get_recording_path(config: ConfigManager) -> str:
+    """Path of the recording of the configured gamepad, the extension depends on recording.format"""
+    folder = config.get("paths.recording_folder_location")
+    name = config.get("gamepad.name")
+    extension = RECORDING_EXTENSIONS[config.get("recording.format", "json")]
+    return f"{folder}/{name}_inputs.{extension}"
+
 
 class GamepadSuper:
     def __init__(self, config: ConfigManager):
-        self.scheme = None
         self.config = config
-        file_path = f"{self.config.get("paths.controller_scheme_folder")}/{self.config.get("gamepad.name")}.json"
-        with open(file_path) as f:
-            self.scheme = json.load(f)
+        self.scheme = get_scheme(config)
+
+    def _get_recording_path(self) -> str:
+        return get_recording_path(self.config)
 
-    
     def _is_left_stick(self, input):
-        
-        return input.id in self.scheme["axis"]["left_stick"].values()
+        return input.id in self.scheme.left_stick
 
     def _is_right_stick(self, input):
-        return input.id in self.scheme["axis"]["right_stick"].values()
+        return input.id in self.scheme.right_stick
 
     def _is_left_trigger(self, input):
-        return input.id == self.scheme["axis"]["triggers"]["left"]
+        return input.id == self.scheme.triggers[0]
 
     def _is_right_trigger(self, input):
-        return input.id == self.scheme["axis"]["triggers"]["right"]
+        return input.id == self.scheme.triggers[1]
     
\ No newline at end of file
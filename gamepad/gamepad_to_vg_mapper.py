@@ -1,22 +1,20 @@
-import json
-import vgamepad as vg
 from input_classes.input import Input
 from input_classes.input_type import Type
 from configuration_manager.config_manager import ConfigManager
+from gamepad.controller_scheme import get_scheme
+
+BUTTON = Type.BUTTON.value
+AXIS = Type.AXIS.value
+STICK = Type.STICK.value
 
 class GamepadToVGamepadMapper:
     def __init__(self, vg, config: ConfigManager):
-        self.scheme = None
         self.config = config
         self.last_left_stick_y = 0
         self.last_left_stick_x = 0
         self.last_right_stick_y = 0
         self.last_right_stick_x = 0
-        self.dead_zone = self.config.get("gamepad.dead_zone")
-        gamepad_scheme = f"{self.config.get("paths.controller_scheme_folder")}/{self.config.get("gamepad.name")}.json"
-
-        with open(gamepad_scheme, "r") as f:
-            self.scheme = json.load(f)
+        self.scheme = get_scheme(config)
 
         self.button_table = None
         self.vg = vg
@@ -24,6 +22,18 @@ class GamepadToVGamepadMapper:
 
 
 
+    @property
+    def dead_zone(self) -> float:
+        """Dead zone of the current config snapshot, so plans compiled after a reload use the new one"""
+        return self.config.snapshot.dead_zone
+
+    def reset(self):
+        """Forgets the last stick positions, used before mapping a recording from its start"""
+        self.last_left_stick_y = 0
+        self.last_left_stick_x = 0
+        self.last_right_stick_y = 0
+        self.last_right_stick_x = 0
+
     def map_input(self, input: Input):
         """It maps the correct input from a gamepad from the pygame library to the
         XINPUT X360 controller from the vgamepad library
@@ -33,42 +43,72 @@ class GamepadToVGamepadMapper:
 
         Returns:
             object, (int, int): A button enum from vgamepad if it is a button, a tuple (x, y)
-            if the input was an axis from a joystick, or just x in the input was a axis from 
-            a trigger
+            if the input was a stick or an axis from a joystick, or just x in the input was a
+            axis from a trigger
         """
         if input.type == Type.BUTTON:
             return self._map_button(input)
+        elif input.type == Type.STICK:
+            return self._map_stick(input)
         elif input.type == Type.AXIS:
             return self._map_axis(input)
+
+    def map_record(self, id: int, type: int, value: float, y_value: float = 0.0):
+        """Same as map_input() for a raw (id, type, value, y value) record, type being the
+        Type value, so recordings can be mapped without creating an Input per event"""
+        if type == BUTTON:
+            return self.button_table[id]
+        elif type == STICK:
+            return self._map_stick_values(id, value, y_value)
+        elif type == AXIS:
+            return self._map_axis_value(id, value)
+
+    def _map_stick(self, input: Input):
+        """Maps both components of a stick at once, y is inverted like in _map_axis"""
+        x, y = input.value
+        return self._map_stick_values(input.id, x, y)
+
+    def _map_stick_values(self, id: int, x: float, y: float):
+        dead_zone = self.dead_zone
+        x = 0 if abs(x) <= dead_zone else x
+        y = 0 if abs(y) <= dead_zone else -y
+
+        if id == self.scheme.left_stick[0]:
+            self.last_left_stick_x, self.last_left_stick_y = x, y
+        elif id == self.scheme.right_stick[0]:
+            self.last_right_stick_x, self.last_right_stick_y = x, y
+        return (x, y)
         
     def _map_axis(self, input: Input):
         if input.type != Type.AXIS:
             raise ValueError("Input must be a AXIS")
+        return self._map_axis_value(input.id, input.value)
+
+    def _map_axis_value(self, id: int, value: float):
+        if id == self.scheme["axis"]["left_stick"]["x"]:
+            value = 0 if abs(value) <= self.dead_zone else value
+            self.last_left_stick_x = value
+            return (value, self.last_left_stick_y)
         
-        if input.id == self.scheme["axis"]["left_stick"]["x"]:
-            input.value = 0 if abs(input.value) <= self.dead_zone else input.value
-            self.last_left_stick_x = input.value
-            return (input.value, self.last_left_stick_y)
-        
-        elif input.id == self.scheme["axis"]["left_stick"]["y"]:
-            input.value = 0 if abs(input.value) <= self.dead_zone else input.value
-            y_value = -input.value
+        elif id == self.scheme["axis"]["left_stick"]["y"]:
+            value = 0 if abs(value) <= self.dead_zone else value
+            y_value = -value
             self.last_left_stick_y = y_value
             return (self.last_left_stick_x, y_value)
         
-        elif input.id == self.scheme["axis"]["right_stick"]["x"]:
-            input.value = 0 if abs(input.value) <= self.dead_zone else input.value
-            self.last_right_stick_x = input.value
-            return (input.value, self.last_right_stick_y)
+        elif id == self.scheme["axis"]["right_stick"]["x"]:
+            value = 0 if abs(value) <= self.dead_zone else value
+            self.last_right_stick_x = value
+            return (value, self.last_right_stick_y)
         
-        elif input.id == self.scheme["axis"]["right_stick"]["y"]:
-            input.value = 0 if abs(input.value) <= self.dead_zone else input.value
-            y_value = -input.value
+        elif id == self.scheme["axis"]["right_stick"]["y"]:
+            value = 0 if abs(value) <= self.dead_zone else value
+            y_value = -value
             self.last_right_stick_y = y_value
             return (self.last_right_stick_x, y_value)
         
-        elif input.id in self.scheme["axis"]["triggers"].values():
-            value = (input.value + 1) / 2   #[-1, 1] -> [0, 1]
+        elif id in self.scheme["axis"]["triggers"].values():
+            value = (value + 1) / 2   #[-1, 1] -> [0, 1]
             return value
         
         
@@ -0,0 +1,111 @@
+import heapq
+import time
+from configuration_manager.config_manager import ConfigManager
+from gamepad.controller_scheme import get_scheme
+from gamepad.gamepad_repeater import load_recording
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from gamepad.replay_plan import ReplayPlan
+from timing.event_tracer import get_tracer
+from timing.replay_telemetry import ReplayTelemetry
+from timing.wait_strategy import create_wait_strategy
+
+
+class MultiPadRepeater:
+    """Replays several recordings at once, each one on its own virtual gamepad.
+
+    The steps of every compiled recording are merged through a single priority queue
+    of deadlines, so one timing thread drives all the pads. Only the virtual gamepad, the
+    mapper and the plan are built per pad, plus its telemetry when it is enabled; the wait
+    strategy belongs to the timing thread and is shared.
+    """
+
+    def __init__(self, vg: object, config: ConfigManager, inputs_files: list[str]):
+        """Constructor of the MultiPadRepeater class.
+
+        Args:
+            vg (object): vgamepad instance used to create the virtual gamepads.
+            config (ConfigManager): configuration of the application
+            inputs_files (list[str]): one recording per virtual gamepad
+        """
+        if not inputs_files:
+            raise ValueError("At least one recording is needed")
+        self.config = config
+        sticks = get_scheme(config).sticks
+        snapshot = config.snapshot
+
+        self.gamepads = []
+        self.plans = []
+        for inputs_file in inputs_files:
+            gamepad = vg.VX360Gamepad()
+            mapper = GamepadToVGamepadMapper(vg, config)
+            inputs = load_recording(inputs_file, config, sticks)
+            self.gamepads.append(gamepad)
+            self.plans.append(ReplayPlan.compile(inputs, gamepad, mapper, snapshot.batch_window,
+                                                 snapshot.interpolation_interval))
+
+        # One telemetry per pad, a late pad is not hidden among the steps of the others
+        self.telemetry = None
+        if self.config.get("telemetry.enabled", False):
+            capacity = self.config.get("telemetry.capacity", 65536)
+            self.telemetry = [ReplayTelemetry(capacity) for _ in self.plans]
+        self.waiter = create_wait_strategy(*snapshot.wait_settings, tracer=get_tracer(config))
+
+    def replay(self):
+        """Replays every recording once, all of them starting at the same time"""
+        plans = self.plans
+        updates = [gamepad.update for gamepad in self.gamepads]
+        records = None
+        if self.telemetry is not None:
+            records = [telemetry.record for telemetry in self.telemetry]
+            for telemetry in self.telemetry:
+                telemetry.reset()
+
+        queue = [(plan.deadlines[0], pad, 0) for pad, plan in enumerate(plans) if len(plan)]
+        if not queue:
+            raise SystemError("No inputs to iterate to")
+        heapq.heapify(queue)
+
+        wait_until = self.waiter.wait_until
+        perf_counter = time.perf_counter
+        start_time = perf_counter()
+
+        while queue:
+            deadline, pad, step = queue[0]
+            target_time = start_time + deadline
+            wait_until(target_time)
+            fired_time = perf_counter()
+
+            plan = plans[pad]
+            for action, args in plan.steps[step]:
+                action(*args)
+            updates[pad]()
+            if records is not None:
+                records[pad](deadline, fired_time - target_time, perf_counter() - fired_time)
+
+            step += 1
+            if step < len(plan):
+                heapq.heapreplace(queue, (plan.deadlines[step], pad, step))
+            else:
+                heapq.heappop(queue)
+
+    def get_worst_pad(self) -> tuple[int, dict]:
+        """Pad whose steps had the highest p99 lateness in the last replay
+
+        Returns:
+            tuple[int, dict]: index of the pad and its lateness percentiles, see ReplayTelemetry.summary
+        """
+        if self.telemetry is None:
+            raise ValueError("Telemetry is not enabled")
+        lateness = [telemetry.summary()["lateness"] for telemetry in self.telemetry]
+        pad = max(range(len(lateness)), key=lambda pad: lateness[pad]["p99"])
+        return pad, lateness[pad]
+
+    def get_report(self) -> str:
+        """Timing summary of the steps of every pad of the last replay, and of the worst pad"""
+        if self.telemetry is None:
+            return f"{len(self.plans)} pads replayed"
+        lines = [f"Pad {pad}: {telemetry}" for pad, telemetry in enumerate(self.telemetry)]
+        pad, lateness = self.get_worst_pad()
+        lines.append(f"Worst pad {pad}: lateness p50 {lateness['p50'] * 1e6:.0f}us "
+                     f"p99 {lateness['p99'] * 1e6:.0f}us max {lateness['max'] * 1e6:.0f}us")
+        return "\n".join(lines)
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+
+class ReplayController:
+    """Pauses and resumes a GamepadRepeater.replay_async() from other tasks.
+    Cancelling the replay task stops it, see GamepadRepeater.replay_async()"""
+
+    def __init__(self):
+        self._paused = asyncio.Event()
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self.paused_at = None
+        self.paused_time = 0.0
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused.is_set()
+
+    def pause(self):
+        if self.is_paused:
+            return
+        self.paused_at = time.perf_counter()
+        self._resumed.clear()
+        self._paused.set()
+
+    def resume(self):
+        if not self.is_paused:
+            return
+        self.paused_time += time.perf_counter() - self.paused_at
+        self.paused_at = None
+        self._paused.clear()
+        self._resumed.set()
+
+    async def wait_resumed(self):
+        await self._resumed.wait()
+
+    async def sleep(self, seconds: float) -> bool:
+        """Sleeps on the event loop, waking up early if the replay is paused
+
+        Returns:
+            bool: True if the sleep was interrupted by a pause
+        """
+        # asyncio.wait_for() swallows a cancellation arriving as the pause wakes it up
+        paused = asyncio.ensure_future(self._paused.wait())
+        try:
+            done, _ = await asyncio.wait((paused,), timeout=seconds)
+        finally:
+            paused.cancel()
+        return bool(done)
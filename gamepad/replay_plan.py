@@ -0,0 +1,147 @@
+from collections.abc import Iterable
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from input_classes.input_type import Type
+from input_classes.input_record import iter_records
+from input_classes.axis_simplifier import interpolate_axes
+
+BUTTON_DOWN = 0
+BUTTON_UP = 1
+BUTTON = Type.BUTTON.value
+AXIS = Type.AXIS.value
+STICK = Type.STICK.value
+
+
+class ReplayPlan:
+    """A recording compiled for a virtual gamepad.
+
+    Every step has a deadline relative to the start of the replay and the list of
+    (action, args) calls to make at that moment, followed by a single gamepad update.
+    Actions are already bound to the gamepad and args are already mapped, so replaying
+    a step does no lookups.
+    """
+
+    def __init__(self):
+        self.deadlines = []
+        self.steps = []
+        self.event_count = 0
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    @property
+    def duration(self) -> float:
+        return self.deadlines[-1] if self.deadlines else 0.0
+
+    @property
+    def reports_saved(self) -> int:
+        """Number of gamepad reports avoided by batching events into the same step"""
+        return self.event_count - len(self.steps)
+
+    @classmethod
+    def compile(cls, inputs: Iterable, gamepad: object, mapper: GamepadToVGamepadMapper,
+                batch_window: float = None, interpolation_interval: float = None,
+                time_offset: float = 0.0) -> "ReplayPlan":
+        """Compiles a recording into a replay plan
+
+        Args:
+            inputs (Iterable): inputs of the recording, in timestamp order
+            gamepad (object): virtual gamepad the actions are bound to
+            mapper (GamepadToVGamepadMapper): mapper used to translate the inputs
+            batch_window (float, optional): events within this many seconds of the first
+            event of a step are applied in the same step, except a button that already
+            changed in the step. None disables batching
+            interpolation_interval (float, optional): for simplified recordings, axis points are
+            interpolated so an axis is updated at least every interpolation_interval seconds
+            while it moves. None disables interpolation
+            time_offset (float): added to every timestamp, to replay a segment from its start
+
+        Returns:
+            ReplayPlan: the compiled plan
+        """
+        if interpolation_interval is not None:
+            inputs = interpolate_axes(inputs, interpolation_interval)
+
+        plan = cls()
+        for deadline, calls in iter_steps(inputs, gamepad, mapper, batch_window, time_offset):
+            plan.deadlines.append(deadline)
+            plan.steps.append(calls)
+            plan.event_count += len(calls)
+        return plan
+
+
+def iter_steps(inputs: Iterable, gamepad: object, mapper: GamepadToVGamepadMapper, batch_window: float = None,
+               time_offset: float = 0.0):
+    """Generates the (deadline, calls) steps of a replay plan one at a time
+
+    Args:
+        inputs (Iterable): inputs of the recording, in timestamp order
+        gamepad (object): virtual gamepad the actions are bound to
+        mapper (GamepadToVGamepadMapper): mapper used to translate the inputs
+        batch_window (float, optional): events within this many seconds of the first
+        event of a step are applied in the same step. None disables batching. A button
+        that already changed in the step starts a new one, so a tap shorter than the
+        window is still sent as a pressed report followed by a released report
+        time_offset (float): added to every timestamp
+    """
+    press_button = gamepad.press_button
+    release_button = gamepad.release_button
+    deadline = None
+    calls = []
+    buttons = set()
+
+    for timestamp, call in iter_calls(inputs, gamepad, mapper, time_offset):
+        action, args = call
+        is_button = action == press_button or action == release_button
+        if calls and (batch_window is None or timestamp - deadline > batch_window
+                      or (is_button and args[0] in buttons)):
+            yield deadline, tuple(calls)
+            calls = []
+            buttons.clear()
+        if not calls:
+            deadline = timestamp
+        if is_button:
+            buttons.add(args[0])
+        calls.append(call)
+
+    if calls:
+        yield deadline, tuple(calls)
+
+
+def iter_calls(inputs: Iterable, gamepad: object, mapper: GamepadToVGamepadMapper, time_offset: float = 0.0):
+    """Resolves every input into a (timestamp + time_offset, (action, args)) call. Inputs are
+    read as raw records, so columnar and binary recordings are compiled without creating an
+    object per event"""
+    axis_actions = _get_axis_actions(gamepad, mapper.scheme)
+    map_record = mapper.map_record
+    mapper.reset()
+
+    for id, type, value, timestamp, y_value in iter_records(inputs):
+        if type == BUTTON:
+            if value == BUTTON_DOWN:
+                action = gamepad.press_button
+            elif value == BUTTON_UP:
+                action = gamepad.release_button
+            else:
+                continue
+            yield timestamp + time_offset, (action, (map_record(id, type, value),))
+
+        elif type == STICK or type == AXIS:
+            action = axis_actions.get(id)
+            if action is None:
+                continue
+            value = map_record(id, type, value, y_value)
+            args = value if isinstance(value, tuple) else (value,)
+            yield timestamp + time_offset, (action, args)
+
+
+def _get_axis_actions(gamepad: object, scheme: dict) -> dict:
+    """Resolves once which gamepad setter every axis id of the scheme goes to"""
+    axis = scheme["axis"]
+    actions = {}
+    for id in axis["left_stick"].values():
+        actions[id] = gamepad.left_joystick_float
+    for id in axis["right_stick"].values():
+        actions[id] = gamepad.right_joystick_float
+    actions[axis["triggers"]["left"]] = gamepad.left_trigger_float
+    actions[axis["triggers"]["right"]] = gamepad.right_trigger_float
+    return actions
@@ -0,0 +1,233 @@
+import argparse
+from collections.abc import Iterable
+from operator import itemgetter
+from input_classes.columnar_input_collection import ColumnarInputCollection
+from input_classes.input import Input
+from input_classes.input_record import STICK, iter_records
+from input_classes.input_type import Type
+
+HOLD_GAP = 0.008
+AXIS = Type.AXIS.value
+
+
+def expand_holds(points: list[tuple[float, float]], hold_gap: float = HOLD_GAP) -> list[tuple[float, float]]:
+    """The recorder only logs an axis when it moves, so a value is held until the next point.
+    This adds the point where the hold ends, one poll before the next point, so the stream
+    can be read as a piecewise-linear curve
+
+    Args:
+        points (list[tuple[float, float]]): (timestamp, value) points of one axis
+        hold_gap (float): poll interval of the recording
+
+    Returns:
+        list[tuple[float, float]]: the points with the end of every hold added
+    """
+    expanded = []
+    for point in points:
+        if expanded:
+            last_time, last_value = expanded[-1]
+            if point[1] != last_value and point[0] - last_time > hold_gap * 1.5:
+                expanded.append((point[0] - hold_gap, last_value))
+        expanded.append(point)
+    return expanded
+
+
+def _coverage_error(start: tuple[float, float], end: tuple[float, float], point: tuple[float, float],
+                max_value_error: float, max_time_error: float) -> float:
+    """Ratio between the distance of a point to the segment start-end and the allowed error,
+    the point is covered by the segment when it is <= 1. The allowed error is max_value_error
+    plus how much the segment moves in max_time_error. Stick points have (x, y) values, and
+    both components must be covered"""
+    if isinstance(point[1], tuple):
+        return max(_coverage_error((start[0], start[1][component]), (end[0], end[1][component]),
+                                   (point[0], point[1][component]), max_value_error, max_time_error)
+                   for component in range(len(point[1])))
+    duration = end[0] - start[0]
+    slope = (end[1] - start[1]) / duration if duration > 0 else 0.0
+    expected = start[1] + slope * (point[0] - start[0])
+    return abs(point[1] - expected) / (max_value_error + abs(slope) * max_time_error)
+
+
+def simplify_points(points: list[tuple[float, float]], max_value_error: float, max_time_error: float) -> list[tuple[float, float]]:
+    """Ramer-Douglas-Peucker simplification of the points of one axis
+
+    Args:
+        points (list[tuple[float, float]]): (timestamp, value) points, in timestamp order
+        max_value_error (float): max distance between a dropped point and the kept curve
+        max_time_error (float): max time shift that a dropped point may have on the kept curve
+
+    Returns:
+        list[tuple[float, float]]: the kept points, the first and last ones are always kept
+    """
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    segments = [(0, len(points) - 1)]
+
+    while segments:
+        first, last = segments.pop()
+        worst_index = None
+        worst_error = 1.0
+        for index in range(first + 1, last):
+            error = _coverage_error(points[first], points[last], points[index], max_value_error, max_time_error)
+            if error > worst_error:
+                worst_index, worst_error = index, error
+
+        if worst_index is not None:
+            keep[worst_index] = True
+            segments.append((first, worst_index))
+            segments.append((worst_index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+class InlineAxisSimplifier:
+    """Simplifies the points of one axis while they are recorded.
+
+    Points are held until the segment from the last kept point can no longer cover them,
+    then the last point that could be covered is kept. Kept points are therefore emitted
+    late, at most max_pending points after they were added.
+    """
+
+    def __init__(self, max_value_error: float, max_time_error: float, hold_gap: float = HOLD_GAP, max_pending: int = 256):
+        self.max_value_error = max_value_error
+        self.max_time_error = max_time_error
+        self.hold_gap = hold_gap
+        self.max_pending = max_pending
+        self.anchor = None
+        self.pending = []
+        self.added = 0
+        self.kept = 0
+
+    def add(self, timestamp: float, value: float) -> list[tuple[float, float]]:
+        """Adds a point
+
+        Returns:
+            list[tuple[float, float]]: the points that are kept because of this one, usually none
+        """
+        self.added += 1
+        last = self.pending[-1] if self.pending else self.anchor
+        kept = []
+        if last is not None and value != last[1] and timestamp - last[0] > self.hold_gap * 1.5:
+            kept += self._add((timestamp - self.hold_gap, last[1]))
+        kept += self._add((timestamp, value))
+        return kept
+
+    def _add(self, point: tuple[float, float]) -> list[tuple[float, float]]:
+        if self.anchor is None:
+            self.anchor = point
+            return self._keep(point)
+
+        if len(self.pending) < self.max_pending and all(
+                _coverage_error(self.anchor, point, pending, self.max_value_error, self.max_time_error) <= 1.0
+                for pending in self.pending):
+            self.pending.append(point)
+            return []
+
+        self.anchor = self.pending[-1]
+        self.pending = [point]
+        return self._keep(self.anchor)
+
+    def _keep(self, point: tuple[float, float]) -> list[tuple[float, float]]:
+        self.kept += 1
+        return [point]
+
+    def flush(self) -> list[tuple[float, float]]:
+        """Keeps the last pending point, called when the recording stops"""
+        if not self.pending:
+            return []
+        self.anchor = self.pending[-1]
+        self.pending = []
+        return self._keep(self.anchor)
+
+
+def simplify_inputs(inputs: Iterable, max_value_error: float, max_time_error: float,
+                    hold_gap: float = HOLD_GAP) -> tuple[list[Input], float]:
+    """Simplifies every axis and stick channel of a recording, buttons are kept as they are
+
+    Args:
+        inputs (Iterable): inputs of the recording
+        max_value_error (float): max distance between a dropped point and the kept curve
+        max_time_error (float): max time shift that a dropped point may have on the kept curve
+        hold_gap (float): poll interval of the recording
+
+    Returns:
+        tuple[list[Input], float]: the simplified inputs in timestamp order, and the
+        reduction ratio (inputs before / inputs after)
+    """
+    others = []
+    channels = {}
+    count = 0
+    for input in inputs:
+        count += 1
+        if input.type == Type.AXIS or input.type == Type.STICK:
+            channels.setdefault((input.type, input.id), []).append((input.timestamp, input.value))
+        else:
+            others.append(Input(input.id, input.type, input.value, input.timestamp))
+
+    simplified = others
+    for (type, id), points in channels.items():
+        for timestamp, value in simplify_points(expand_holds(points, hold_gap), max_value_error, max_time_error):
+            simplified.append(Input(id, type, value, timestamp))
+    simplified.sort(key=lambda input: input.timestamp)
+
+    return simplified, count / len(simplified) if simplified else 1.0
+
+
+def interpolate_axes(inputs: Iterable, interval: float) -> ColumnarInputCollection:
+    """Adds linearly interpolated axis and stick inputs every interval seconds between
+    consecutive points of the same channel, for replaying simplified recordings. The
+    inputs are read as raw records, so no object is created per event
+
+    Args:
+        inputs (Iterable): inputs of a simplified recording
+        interval (float): max seconds between two replayed points of an axis
+
+    Returns:
+        ColumnarInputCollection: the inputs with the interpolated points, in timestamp order
+    """
+    records = []
+    last_points = {}
+    for record in iter_records(inputs):
+        id, type, value, timestamp, y_value = record
+        if type != AXIS and type != STICK:
+            records.append(record)
+            continue
+
+        channel = (type, id)
+        if channel in last_points:
+            last_time, last_value, last_y_value = last_points[channel]
+            steps = int((timestamp - last_time) / interval)
+            if value != last_value or y_value != last_y_value:
+                for step in range(1, steps):
+                    point_time = last_time + step * interval
+                    progress = (point_time - last_time) / (timestamp - last_time)
+                    records.append((id, type, last_value + (value - last_value) * progress, point_time,
+                                    last_y_value + (y_value - last_y_value) * progress))
+        last_points[channel] = (timestamp, value, y_value)
+        records.append(record)
+
+    records.sort(key=itemgetter(3))
+    return ColumnarInputCollection.from_records(records)
+
+
+if __name__ == "__main__":
+    from binary_classes.recording_converter import save_inputs
+    from binary_classes.recording_loader import RecordingLoader
+    from binary_classes.binary_format import EXTENSION
+
+    parser = argparse.ArgumentParser(description="Simplify the axis channels of a recording")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--max-value-error", type=float, default=0.02)
+    parser.add_argument("--max-time-error", type=float, default=0.004)
+    parser.add_argument("--hold-gap", type=float, default=HOLD_GAP, help="poll interval of the recording")
+    args = parser.parse_args()
+
+    loader = RecordingLoader(args.source)
+    loader.load()
+    simplified, ratio = simplify_inputs(loader.getInputs(), args.max_value_error, args.max_time_error, args.hold_gap)
+    save_inputs(simplified, args.destination, "binary" if args.destination.endswith(f".{EXTENSION}") else "json")
+    print(f"{len(simplified)} inputs kept, reduction ratio {ratio:.2f}x")
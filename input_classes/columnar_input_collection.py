@@ -0,0 +1,144 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from itertools import compress
+from input_classes.input import Input
+from input_classes.input_record import to_record
+from input_classes.input_type import Type
+from input_classes.input_view import InputView
+from input_classes.input_iterator import InputIterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ColumnarInputCollection(Iterable):
+    """Input collection stored as parallel typed arrays (id, type, value, timestamp, y value).
+    The y value column holds the second component of stick events and is 0 for the others.
+
+    Single events are accessed through InputView objects. The replay plan compiles from
+    records(), so no object is created per event. time_shift(), time_scale() and
+    filter_channel() build a new collection column by column. They are vectorized with
+    NumPy over the buffers of the arrays when it is installed, and fall back to loops
+    over the arrays otherwise.
+    """
+
+    def __init__(self, ids: array = None, types: array = None, values: array = None, timestamps: array = None,
+                 y_values: array = None):
+        self.ids = ids if ids is not None else array("H")
+        self.types = types if types is not None else array("B")
+        self.values = values if values is not None else array("d")
+        self.timestamps = timestamps if timestamps is not None else array("d")
+        self.y_values = y_values if y_values is not None else array("d", bytes(8 * len(self.ids)))
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> "ColumnarInputCollection":
+        """Builds the collection from raw (id, type, value, timestamp, y value) tuples, type being the Type value"""
+        collection = cls()
+        for id, type, value, timestamp, y_value in records:
+            collection.ids.append(id)
+            collection.types.append(type)
+            collection.values.append(value)
+            collection.timestamps.append(timestamp)
+            collection.y_values.append(y_value)
+        return collection
+
+    @classmethod
+    def from_inputs(cls, inputs: Iterable) -> "ColumnarInputCollection":
+        """Builds the collection from Input objects, or straight from the raw records
+        when the inputs come from a binary recording"""
+        if hasattr(inputs, "iter_records"):
+            return cls.from_records(inputs.iter_records())
+        return cls.from_records(to_record(input) for input in inputs)
+
+    def append(self, input: Input):
+        id, type, value, timestamp, y_value = to_record(input)
+        self.ids.append(id)
+        self.types.append(type)
+        self.values.append(value)
+        self.timestamps.append(timestamp)
+        self.y_values.append(y_value)
+
+    def records(self):
+        """Iterates over the raw (id, type, value, timestamp, y value) tuples, type being the Type value"""
+        return zip(self.ids, self.types, self.values, self.timestamps, self.y_values)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarInputCollection(self.ids[index], self.types[index], self.values[index], self.timestamps[index],
+                                           self.y_values[index])
+        if index < 0:
+            index += len(self.timestamps)
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError("Input index out of range")
+        return InputView(self, index)
+
+    def __iter__(self) -> InputIterator:
+        return InputIterator(self)
+
+    def get_iterator(self) -> InputIterator:
+        return InputIterator(self)
+
+    def time_shift(self, offset: float) -> "ColumnarInputCollection":
+        """Returns a copy of the collection with every timestamp moved by offset seconds"""
+        if np is not None:
+            timestamps = _to_array("d", _to_numpy(self.timestamps) + offset)
+        else:
+            timestamps = array("d", [timestamp + offset for timestamp in self.timestamps])
+        return ColumnarInputCollection(array("H", self.ids), array("B", self.types), array("d", self.values), timestamps,
+                                       array("d", self.y_values))
+
+    def time_scale(self, factor: float) -> "ColumnarInputCollection":
+        """Returns a copy of the collection with every timestamp multiplied by factor,
+        a factor of 0.5 replays twice as fast"""
+        if factor <= 0:
+            raise ValueError("Time scale factor must be positive")
+        if np is not None:
+            timestamps = _to_array("d", _to_numpy(self.timestamps) * factor)
+        else:
+            timestamps = array("d", [timestamp * factor for timestamp in self.timestamps])
+        return ColumnarInputCollection(array("H", self.ids), array("B", self.types), array("d", self.values), timestamps,
+                                       array("d", self.y_values))
+
+    def filter_channel(self, type: Type, ids: Iterable[int] = None) -> "ColumnarInputCollection":
+        """Returns a collection with only the events of a type, and of the given ids if any
+
+        Args:
+            type (Type): type of the events to keep
+            ids (Iterable[int], optional): ids of the events to keep, all of them if None
+        """
+        type_value = type.value
+        ids = None if ids is None else set(ids)
+
+        if np is not None:
+            columns = (self.ids, self.types, self.values, self.timestamps, self.y_values)
+            keep = _to_numpy(self.types) == type_value
+            if ids is not None:
+                keep &= np.isin(_to_numpy(self.ids), list(ids))
+            return ColumnarInputCollection(*(_to_array(column.typecode, _to_numpy(column)[keep]) for column in columns))
+
+        keep = [event_type == type_value and (ids is None or id in ids) for id, event_type in zip(self.ids, self.types)]
+        return ColumnarInputCollection(array("H", compress(self.ids, keep)),
+                                       array("B", compress(self.types, keep)),
+                                       array("d", compress(self.values, keep)),
+                                       array("d", compress(self.timestamps, keep)),
+                                       array("d", compress(self.y_values, keep)))
+
+    def bisect(self, timestamp: float) -> int:
+        """Index of the first event whose timestamp is greater or equal than timestamp"""
+        return bisect_left(self.timestamps, timestamp)
+
+
+def _to_numpy(column: array) -> "np.ndarray":
+    """NumPy view of an array column without copying it, the typecodes of the
+    columns are also NumPy type characters"""
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _to_array(typecode: str, values: "np.ndarray") -> array:
+    return array(typecode, values.tobytes())
@@ -0,0 +1,60 @@
+from array import array
+
+
+class EventRingBuffer:
+    """Preallocated single-producer single-consumer ring buffer of raw
+    (id, type, value, timestamp, y value) events, the y value being the second
+    component of stick events.
+
+    The producer only moves the write counter and the consumer only moves the read
+    counter, so neither side takes a lock. When the buffer is full new events are
+    dropped and counted in overflows.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("Ring buffer capacity must be a power of two")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.ids = array("H", bytes(2 * capacity))
+        self.types = array("B", bytes(capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.y_values = array("d", bytes(8 * capacity))
+        self.written = 0
+        self.read = 0
+        self.overflows = 0
+
+    def __len__(self) -> int:
+        return self.written - self.read
+
+    def push(self, id: int, type: int, value: float, timestamp: float, y_value: float = 0.0) -> bool:
+        """Writes one event, called by the producer only
+
+        Returns:
+            bool: False if the buffer was full and the event was dropped
+        """
+        written = self.written
+        if written - self.read >= self.capacity:
+            self.overflows += 1
+            return False
+
+        index = written & self._mask
+        self.ids[index] = id
+        self.types[index] = type
+        self.values[index] = value
+        self.timestamps[index] = timestamp
+        self.y_values[index] = y_value
+        self.written = written + 1
+        return True
+
+    def drain(self):
+        """Yields every event written so far, called by the consumer only"""
+        read = self.read
+        written = self.written
+        mask = self._mask
+        while read < written:
+            index = read & mask
+            yield self.ids[index], self.types[index], self.values[index], self.timestamps[index], self.y_values[index]
+            read += 1
+            self.read = read
@@ -6,9 +6,10 @@ class Input():
 
         **Args**:
             id (int): ID of the button or axis
-            type (Type): Type of button, either Type.AXIS or Type.BUTTON
+            type (Type): Type of button, either Type.AXIS, Type.BUTTON or Type.STICK
             value (float): the value of the input, 0 or 1 if it is a button, [-1, 1] if it
-            is a axis value
+            is a axis value, and a (x, y) tuple of axis values if it is a stick. The id of a
+            stick is the id of its x axis
             start_time (float): the relative time when this value was set, got from time.perf_counter()
 
         **Args**:
@@ -27,6 +28,8 @@ class Input():
             self.id = json["id"]
             self.type = Type(json["type"])
             self.value = json["value"]
+            if self.type == Type.STICK:
+                self.value = tuple(self.value)
             self.timestamp = json["timestamp"]
 
     def to_dict(self) -> dict:
@@ -0,0 +1,49 @@
+from collections.abc import Callable, Iterable, Iterator
+from operator import itemgetter
+from input_classes.input import Input
+from input_classes.input_type import Type
+
+TYPES = {type.value: type for type in Type}
+STICK = Type.STICK.value
+
+
+def to_record(input) -> tuple:
+    """Raw (id, type, value, timestamp, y value) record of an input, type being the Type value
+    and y value the second component of stick events, 0 for the others"""
+    if input.type == Type.STICK:
+        x, y = input.value
+        return (input.id, STICK, x, input.timestamp, y)
+    return (input.id, input.type.value, input.value, input.timestamp, 0.0)
+
+
+def to_input(id: int, type: int, value: float, timestamp: float, y_value: float = 0.0) -> Input:
+    """Input of a raw record, version 1 binary records have no y value"""
+    if type == STICK:
+        return Input(id, Type.STICK, (value, y_value), timestamp)
+    return Input(id, TYPES[type], value, timestamp)
+
+
+def iter_records(inputs: Iterable) -> Iterator[tuple]:
+    """Raw records of any inputs. A ColumnarInputCollection or a binary recording hands out
+    its records directly, without creating one object per event"""
+    if hasattr(inputs, "records"):
+        return inputs.records()
+    if hasattr(inputs, "iter_records"):
+        return inputs.iter_records()
+    return map(to_record, inputs)
+
+
+def sort_recorded(records: list, timestamp: Callable = itemgetter(3)) -> list:
+    """Sorts the events of a recorder by timestamp before they are saved. Events of different
+    threads, or delayed by the inline simplifier, can be appended out of order. The sort is
+    stable, so events with the same timestamp keep the order they were appended in
+
+    Args:
+        records (list): recorded events, sorted in place
+        timestamp (Callable): key returning the timestamp of an event, that of a raw record by default
+
+    Returns:
+        list: records
+    """
+    records.sort(key=timestamp)
+    return records
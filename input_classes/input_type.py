@@ -2,4 +2,5 @@ from enum import Enum
 
 class Type(Enum):
     BUTTON = 0
-    AXIS = 1
\ No newline at end of file
+    AXIS = 1
+    STICK = 2
\ No newline at end of file
@@ -0,0 +1,43 @@
+from input_classes.input_type import Type
+from input_classes.input_record import TYPES
+
+
+class InputView:
+    """Lightweight read-only view of one event of a ColumnarInputCollection,
+    it exposes the same attributes as Input without copying the event
+    """
+    __slots__ = ("_collection", "_index")
+
+    def __init__(self, collection, index: int):
+        self._collection = collection
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._collection.ids[self._index]
+
+    @property
+    def type(self) -> Type:
+        return TYPES[self._collection.types[self._index]]
+
+    @property
+    def value(self):
+        value = self._collection.values[self._index]
+        type = self._collection.types[self._index]
+        if type == Type.BUTTON.value:
+            return int(value)
+        if type == Type.STICK.value:
+            return (value, self._collection.y_values[self._index])
+        return value
+
+    @property
+    def timestamp(self) -> float:
+        return self._collection.timestamps[self._index]
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'type': self.type.value,
+            'value': self.value,
+            'timestamp': self.timestamp
+        }
@@ -0,0 +1,66 @@
+from input_classes.input import Input
+from input_classes.input_record import to_record
+from input_classes.input_type import Type
+
+DOWN = 0
+UP = 1
+# Recorded value of a trigger at rest, the replay maps [-1, 1] to [0, 1]
+TRIGGER_RELEASED = -1.0
+BUTTON = Type.BUTTON.value
+AXIS = Type.AXIS.value
+STICK = Type.STICK.value
+
+
+class PadState:
+    """Full state of the recorded gamepad at a point of a recording: the last value of
+    every axis, the last (x, y) position of every stick and the buttons that are held"""
+
+    def __init__(self, axes: dict[int, float] = None, buttons: set[int] = None,
+                 sticks: dict[int, tuple[float, float]] = None):
+        self.axes = axes if axes is not None else {}
+        self.buttons = buttons if buttons is not None else set()
+        self.sticks = sticks if sticks is not None else {}
+
+    def copy(self) -> "PadState":
+        return PadState(dict(self.axes), set(self.buttons), dict(self.sticks))
+
+    def apply(self, input):
+        """Updates the state with an input of the recording"""
+        id, type, value, _, y_value = to_record(input)
+        self.apply_record(id, type, value, y_value)
+
+    def apply_record(self, id: int, type: int, value: float, y_value: float = 0.0):
+        """Updates the state with a raw record of the recording, see input_record"""
+        if type == BUTTON:
+            if value == DOWN:
+                self.buttons.add(id)
+            else:
+                self.buttons.discard(id)
+        elif type == AXIS:
+            self.axes[id] = value
+        elif type == STICK:
+            self.sticks[id] = (value, y_value)
+
+    def to_inputs(self, timestamp: float) -> list[Input]:
+        """Inputs that put a centered pad with no buttons held into this state"""
+        inputs = [Input(id, Type.AXIS, value, timestamp) for id, value in sorted(self.axes.items())]
+        inputs += [Input(id, Type.STICK, value, timestamp) for id, value in sorted(self.sticks.items())]
+        inputs += [Input(id, Type.BUTTON, DOWN, timestamp) for id in sorted(self.buttons)]
+        return inputs
+
+    def release_inputs(self, timestamp: float) -> list[Input]:
+        """Inputs that release every held button, so none stays held past a cut"""
+        return [Input(id, Type.BUTTON, UP, timestamp) for id in sorted(self.buttons)]
+
+    def center_inputs(self, timestamp: float, triggers: tuple = ()) -> list[Input]:
+        """Inputs that center every axis and stick written so far, so no analog position
+        leaks past a cut
+
+        Args:
+            timestamp (float): timestamp of the inputs
+            triggers (tuple): ids of the trigger axes, released instead of centered
+        """
+        inputs = [Input(id, Type.AXIS, TRIGGER_RELEASED if id in triggers else 0.0, timestamp)
+                  for id in sorted(self.axes)]
+        inputs += [Input(id, Type.STICK, (0.0, 0.0), timestamp) for id in sorted(self.sticks)]
+        return inputs
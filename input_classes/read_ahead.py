@@ -0,0 +1,79 @@
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+
+BATCH_SIZE = 256
+END = None
+
+
+class ReadAhead(Iterator):
+    """Decodes an input stream in a background thread, keeping at most window inputs
+    ahead of the consumer.
+
+    The producer thread hands the inputs over in batches through a bounded queue, so
+    the consumer can start as soon as the first batch is decoded and memory stays flat
+    whatever the length of the stream. An exception raised by the stream is raised
+    again in the consumer.
+    """
+
+    def __init__(self, inputs: Iterable, window: int = 4096, batch_size: int = BATCH_SIZE):
+        """Constructor of the ReadAhead class.
+
+        Args:
+            inputs (Iterable): stream of inputs, e.g. iter_json_inputs()
+            window (int): max inputs decoded ahead of the consumer
+            batch_size (int): inputs handed over at a time
+        """
+        self.batch_size = min(batch_size, window)
+        self.queue = queue.Queue(maxsize=max(1, window // self.batch_size))
+        self.batch = iter(())
+        self.error = None
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._read, args=(inputs,), daemon=True)
+        self.thread.start()
+
+    def _read(self, inputs: Iterable):
+        batch = []
+        try:
+            for input in inputs:
+                batch.append(input)
+                if len(batch) == self.batch_size:
+                    if not self._put(batch):
+                        return
+                    batch = []
+        except Exception as error:
+            self.error = error
+        # The inputs decoded before an error are still handed over
+        if batch and not self._put(batch):
+            return
+        self._put(END)
+
+    def _put(self, batch) -> bool:
+        """Blocks while the window is full, False once the consumer closed the stream"""
+        while not self.closed.is_set():
+            try:
+                self.queue.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __next__(self):
+        try:
+            return next(self.batch)
+        except StopIteration:
+            pass
+
+        batch = self.queue.get()
+        if batch is END:
+            self.queue.put(END)
+            if self.error is not None:
+                raise self.error
+            raise StopIteration
+        self.batch = iter(batch)
+        return next(self.batch)
+
+    def close(self):
+        """Stops the producer thread, used when the consumer stops before the end of the stream"""
+        self.closed.set()
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,63 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from input_classes.input_record import iter_records
+from input_classes.pad_state import PadState
+
+
+class RecordingIndex:
+    """Index of a recording for seeking: the sorted timestamps of every input, and a
+    keyframe with the full pad state every keyframe_interval seconds.
+
+    The state at any time is the closest previous keyframe plus the few inputs between
+    it and that time, so seeking does not scan the recording from its start. The inputs
+    are read as raw records, so a columnar recording is indexed without creating an
+    object per event.
+    """
+
+    def __init__(self, inputs: Sequence, keyframe_interval: float = 1.0):
+        if keyframe_interval <= 0:
+            raise ValueError("Keyframe interval must be positive")
+        self.inputs = inputs
+        self.keyframe_interval = keyframe_interval
+        self.timestamps = array("d")
+        self.keyframe_times = []
+        self.keyframes = []
+        self._build()
+
+    def _build(self):
+        state = PadState()
+        next_keyframe = 0.0
+        for index, (id, type, value, timestamp, y_value) in enumerate(iter_records(self.inputs)):
+            while timestamp >= next_keyframe:
+                # State before input: everything strictly earlier than next_keyframe
+                self.keyframe_times.append(next_keyframe)
+                self.keyframes.append((index, state.copy()))
+                next_keyframe += self.keyframe_interval
+            self.timestamps.append(timestamp)
+            state.apply_record(id, type, value, y_value)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def bisect(self, timestamp: float) -> int:
+        """Index of the first input whose timestamp is greater or equal than timestamp"""
+        return bisect_left(self.timestamps, timestamp)
+
+    def state_at(self, timestamp: float) -> tuple[PadState, int]:
+        """Pad state right before timestamp
+
+        Returns:
+            tuple[PadState, int]: the state after every input earlier than timestamp,
+            and the index of the first input at or after timestamp
+        """
+        index = self.bisect(timestamp)
+        keyframe = bisect_right(self.keyframe_times, timestamp) - 1
+        if keyframe < 0:
+            return PadState(), index
+
+        keyframe_index, keyframe_state = self.keyframes[keyframe]
+        state = keyframe_state.copy()
+        for id, type, value, _, y_value in iter_records(self.inputs[keyframe_index:index]):
+            state.apply_record(id, type, value, y_value)
+        return state, index
@@ -0,0 +1,70 @@
+from collections.abc import Iterable
+from input_classes.input import Input
+from input_classes.input_type import Type
+
+
+def get_stick_axes(sticks: Iterable[tuple[int, int]]) -> dict[int, tuple[int, int]]:
+    """Maps every stick axis id to (stick id, component), the stick id being the id of
+    its x axis and the component 0 for x and 1 for y
+
+    Args:
+        sticks (Iterable[tuple[int, int]]): (x axis id, y axis id) of every stick
+    """
+    stick_axes = {}
+    for x_id, y_id in sticks:
+        stick_axes[x_id] = (x_id, 0)
+        stick_axes[y_id] = (x_id, 1)
+    return stick_axes
+
+
+def has_axis_stick_events(inputs: Iterable, sticks: Iterable[tuple[int, int]]) -> bool:
+    """True if a recording still stores a stick as two independent axis channels"""
+    stick_axes = get_stick_axes(sticks)
+    if hasattr(inputs, "iter_records"):
+        axis_type = Type.AXIS.value
+        return any(type == axis_type and id in stick_axes for id, type, *_ in inputs.iter_records())
+    return any(input.type == Type.AXIS and input.id in stick_axes for input in inputs)
+
+
+def pair_stick_events(inputs: Iterable, sticks: Iterable[tuple[int, int]]) -> list[Input]:
+    """Upgrades a recording with one axis channel per stick axis to paired stick events.
+
+    The axis events of a stick that share a timestamp were sampled in the same tick and
+    become one stick event. An axis event alone becomes a stick event with the last
+    value of the other axis, so no half-updated position is replayed.
+
+    Args:
+        inputs (Iterable): inputs of the recording, in timestamp order
+        sticks (Iterable[tuple[int, int]]): (x axis id, y axis id) of every stick
+
+    Returns:
+        list[Input]: the inputs with Type.STICK events instead of the stick axis events
+    """
+    return list(iter_paired_stick_events(inputs, sticks))
+
+
+def iter_paired_stick_events(inputs: Iterable, sticks: Iterable[tuple[int, int]]):
+    """Generator version of pair_stick_events, for recordings that are streamed.
+    Inputs that are not stick axis events are passed through as they are"""
+    stick_axes = get_stick_axes(sticks)
+    positions = {stick_id: [0.0, 0.0] for stick_id, _ in stick_axes.values()}
+    pending = []
+    pending_time = None
+
+    for input in inputs:
+        if pending and input.timestamp != pending_time:
+            for stick_id in pending:
+                yield Input(stick_id, Type.STICK, tuple(positions[stick_id]), pending_time)
+            pending = []
+
+        if input.type == Type.AXIS and input.id in stick_axes:
+            stick_id, component = stick_axes[input.id]
+            positions[stick_id][component] = input.value
+            if stick_id not in pending:
+                pending.append(stick_id)
+            pending_time = input.timestamp
+        else:
+            yield input
+
+    for stick_id in pending:
+        yield Input(stick_id, Type.STICK, tuple(positions[stick_id]), pending_time)
@@ -1,6 +1,7 @@
 import json
 from input_classes.input_type import Type
 from input_classes.input import Input
+from json_classes.json_stream_loader import is_json_array, iter_json_inputs
 
 class JsonLoader:
 
@@ -11,6 +12,11 @@ class JsonLoader:
 
 
     def load(self):
+        if not is_json_array(self.filename):
+            # Line-delimited recording, see JsonlRecorder
+            self.inputs = list(iter_json_inputs(self.filename))
+            return
+
         with open(self.filename) as f:
             self.inputs = json.load(f)
 
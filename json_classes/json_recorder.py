@@ -1,6 +1,8 @@
 import json
+from operator import itemgetter
 from input_classes.input_type import Type
 from input_classes.input import Input
+from input_classes.input_record import sort_recorded
 
 class JsonRecorder:
 
@@ -13,5 +15,6 @@ class JsonRecorder:
         self.record.append(input.to_dict())
 
     def save(self):
+        sort_recorded(self.record, itemgetter("timestamp"))
         with open(self.filename, "w") as f:
             json.dump(self.record, f, indent=4)
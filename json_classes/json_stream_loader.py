@@ -0,0 +1,72 @@
+import json
+import re
+from input_classes.input import Input
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"[ \t\r\n]*")
+SEPARATORS = re.compile(r"[ \t\r\n,]*")
+
+
+def iter_json_inputs(filename: str, chunk_size: int = CHUNK_SIZE):
+    """Decodes the inputs of a JSON recording one at a time, reading the file in chunks.
+
+    Both the JSON array written by JsonRecorder and the line-delimited variant written by
+    JsonlRecorder (one input object per line) are accepted. Memory use is bounded by the
+    chunk size, whatever the recording length.
+
+    Args:
+        filename (str): path of the recording
+        chunk_size (int): characters read from the file at a time
+
+    Raises:
+        ValueError: if the file is not a JSON array or line-delimited JSON of inputs
+    """
+    decoder = json.JSONDecoder()
+    with open(filename) as f:
+        buffer = f.read(chunk_size)
+        position = WHITESPACE.match(buffer).end()
+        in_array = buffer[position:position + 1] == "["
+        if in_array:
+            position += 1
+        eof = len(buffer) < chunk_size
+        skip = (SEPARATORS if in_array else WHITESPACE).match
+
+        while True:
+            position = skip(buffer, position).end()
+            if position == len(buffer) and not eof:
+                more = f.read(chunk_size)
+                eof = len(more) < chunk_size
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+            if position == len(buffer):
+                if in_array:
+                    raise ValueError(f"{filename} ends before the end of the JSON array")
+                return
+            if in_array and buffer[position] == "]":
+                return
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"{filename} is not a valid JSON recording")
+                # The object is cut by the end of the chunk, read more and try again
+                more = f.read(chunk_size)
+                eof = len(more) < chunk_size
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+
+            yield Input(value)
+            position = end
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+
+def is_json_array(filename: str) -> bool:
+    """True if the recording is a JSON array, False if it is line-delimited JSON"""
+    with open(filename) as f:
+        start = f.read(CHUNK_SIZE)
+    return start[WHITESPACE.match(start).end():].startswith("[")
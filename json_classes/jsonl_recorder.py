@@ -0,0 +1,24 @@
+import json
+from operator import itemgetter
+from input_classes.input import Input
+from input_classes.input_record import sort_recorded
+
+
+class JsonlRecorder:
+    """Records inputs as line-delimited JSON, one input object per line, same interface
+    as JsonRecorder. The file can be decoded line by line, see iter_json_inputs
+    """
+
+    def __init__(self, filename: str):
+        self.record = []
+        self.filename = filename
+
+    def append(self, input: Input):
+        self.record.append(input.to_dict())
+
+    def save(self):
+        sort_recorded(self.record, itemgetter("timestamp"))
+        with open(self.filename, "w") as f:
+            for input in self.record:
+                f.write(json.dumps(input))
+                f.write("\n")
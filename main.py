@@ -1,9 +1,12 @@
-import pygame as pg
-import vgamepad as vg
-from gamepad.gamepad_reader import *
-from gamepad.gamepad_repeater import *
-from input_classes.input_collection import *
-from json_classes.json_loader import JsonLoader
+import time
+from configuration_manager.config_manager import ConfigManager
+from configuration_manager.config_watcher import ConfigWatcher
+from gamepad.gamepad_super import get_recording_path
+from timing.event_tracer import get_tracer
+from timing.wait_strategy import prepare_wait_strategy
+
+# The backends and the gamepad classes are imported by the mode that needs them: recording
+# never needs vgamepad and replaying never needs pygame, and both are slow to import
 
 #INPUT_FOLDER = "recordings"
 #DUALSENSE_INPUT_RECORD = f"{INPUT_FOLDER}/dualsense_inputs.json"
@@ -11,33 +14,94 @@ from json_classes.json_loader import JsonLoader
 RECORD = 0
 REPEAT = 1
 REPEAT_INDEFINITELY = 2
+RECOVER = 3
+REPEAT_SEGMENT = 4
+REPEAT_MULTI_PAD = 5
+
+def _import_vgamepad():
+    import vgamepad as vg
+    return vg
+
+
+def _report_startup(start_time: float, config: ConfigManager):
+    # The lines traced while loading come before the prompt
+    get_tracer(config).flush()
+    print(f"[STARTUP] ready in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
 
 def main():
-        menu = "What do you want to do?\n0 - Record\n1 - Repeat once your recording\n2 - Repeat Indefinitely you recording\n>>>"
+        menu = "What do you want to do?\n0 - Record\n1 - Repeat once your recording\n2 - Repeat Indefinitely you recording\n3 - Recover an interrupted recording and repeat it once\n4 - Repeat a segment of your recording\n5 - Repeat several recordings, each on its own virtual controller\n>>>"
         option = int(input(menu))
+        start_time = time.perf_counter()
         configuration = ConfigManager()
+        if configuration.get("hot_reload.enabled", False):
+            watcher = ConfigWatcher(configuration, configuration.get("hot_reload.interval", 0.5))
+            watcher.on_change(lambda snapshot: prepare_wait_strategy(snapshot.wait_strategy))
+            watcher.start()
         if option == RECORD:
+            import pygame as pg
+            from gamepad.gamepad_reader import GamepadReader
+
             pg.init()
             reader = GamepadReader(pg, configuration)
+            _report_startup(start_time, configuration)
             try:
                 reader.record()
             except KeyboardInterrupt:
                 reader.stop()
         elif option == REPEAT:
-            repeater = GamepadRepeater(vg, configuration)
+            from gamepad.gamepad_repeater import GamepadRepeater
+
+            repeater = GamepadRepeater(_import_vgamepad(), configuration)
+            _report_startup(start_time, configuration)
             input("ENTER to start")
             repeater.replay()
+            if repeater.telemetry is not None:
+                print(f"[TIMING] {repeater.telemetry}")
 
         elif option == REPEAT_INDEFINITELY:
-            repeater = GamepadRepeater(vg, configuration)
+            from gamepad.gamepad_repeater import GamepadRepeater
+
+            repeater = GamepadRepeater(_import_vgamepad(), configuration)
+            _report_startup(start_time, configuration)
             input("ENTER to start")
 
-            while True:
-                print("[DEBUG] START REPLAY")
-                repeater.replay()
-                print("[DEBUG] END OF REPLAY AND WAITING")
-                time.sleep(5)
-                print("[DEBUG] END OF WAITING")
+            try:
+                repeater.loop()
+            except KeyboardInterrupt:
+                print(f"[LOOP] {repeater.get_loop_report()}")
+
+        elif option == RECOVER:
+            from binary_classes.streaming_recorder import recover_recording
+            from gamepad.gamepad_repeater import GamepadRepeater
+
+            count = recover_recording(get_recording_path(configuration))
+            print(f"Recovered {count} inputs")
+            repeater = GamepadRepeater(_import_vgamepad(), configuration)
+            _report_startup(start_time, configuration)
+            input("ENTER to start")
+            repeater.replay()
+
+        elif option == REPEAT_SEGMENT:
+            from gamepad.gamepad_repeater import GamepadRepeater
+
+            repeater = GamepadRepeater(_import_vgamepad(), configuration)
+            _report_startup(start_time, configuration)
+            start = float(input("Start of the segment (seconds): "))
+            end = input("End of the segment (seconds, empty for the end of the recording): ")
+            input("ENTER to start")
+            repeater.replay_segment(start, float(end) if end else None)
+
+        elif option == REPEAT_MULTI_PAD:
+            from gamepad.multi_pad_repeater import MultiPadRepeater
+
+            inputs_files = input("Recordings to repeat, separated by commas: ").split(",")
+            start_time = time.perf_counter()
+            repeater = MultiPadRepeater(_import_vgamepad(), configuration, [inputs_file.strip() for inputs_file in inputs_files])
+            _report_startup(start_time, configuration)
+            input("ENTER to start")
+            repeater.replay()
+            print(repeater.get_report())
 
         else:
             raise ValueError("Not a valid option.")
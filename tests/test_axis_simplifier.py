@@ -0,0 +1,92 @@
+import math
+import pytest
+from binary_classes.binary_recorder import BinaryRecorder
+from binary_classes.recording_loader import RecordingLoader
+from input_classes.axis_simplifier import InlineAxisSimplifier, expand_holds, simplify_inputs, simplify_points
+from input_classes.input import Input
+from input_classes.input_type import Type
+from json_classes.json_recorder import JsonRecorder
+from json_classes.jsonl_recorder import JsonlRecorder
+
+MAX_VALUE_ERROR = 0.02
+MAX_TIME_ERROR = 0.004
+TICK = 0.008
+
+
+def axis_points() -> list[tuple[float, float]]:
+    """An axis moving along a sine for 2s, then held, then moved again. The recorder only
+    logs the axis when it changes, so the hold has no points"""
+    points = [(index * TICK, math.sin(index * TICK * 3)) for index in range(250)]
+    points += [(3.0 + index * TICK, 0.5 * index / 50) for index in range(51)]
+    return points
+
+
+def value_on(kept: list[tuple[float, float]], timestamp: float) -> tuple[float, float]:
+    """(value, slope) of the piecewise-linear curve of the kept points at timestamp"""
+    for (start_time, start_value), (end_time, end_value) in zip(kept, kept[1:]):
+        if start_time <= timestamp <= end_time:
+            slope = (end_value - start_value) / (end_time - start_time) if end_time > start_time else 0.0
+            return start_value + slope * (timestamp - start_time), slope
+    raise AssertionError(f"{timestamp} is outside of the kept curve")
+
+
+def assert_within_bound(points: list[tuple[float, float]], kept: list[tuple[float, float]]):
+    for timestamp, value in expand_holds(points, TICK):
+        expected, slope = value_on(kept, timestamp)
+        assert abs(value - expected) <= MAX_VALUE_ERROR + abs(slope) * MAX_TIME_ERROR + 1e-12
+
+
+def test_simplified_points_stay_within_the_error_bound():
+    points = axis_points()
+    kept = simplify_points(expand_holds(points, TICK), MAX_VALUE_ERROR, MAX_TIME_ERROR)
+    assert kept[0] == points[0] and kept[-1] == points[-1]
+    assert len(kept) < len(points) / 4
+    assert_within_bound(points, kept)
+
+
+def test_the_hold_keeps_its_value_until_the_next_move():
+    points = [(0.0, 0.0), (0.008, 0.5), (1.0, 0.6)]
+    kept = simplify_points(expand_holds(points, TICK), MAX_VALUE_ERROR, MAX_TIME_ERROR)
+    assert value_on(kept, 0.5)[0] == pytest.approx(0.5)
+
+
+def test_inline_simplifier_stays_within_the_error_bound():
+    simplifier = InlineAxisSimplifier(MAX_VALUE_ERROR, MAX_TIME_ERROR, TICK)
+    kept = []
+    for timestamp, value in axis_points():
+        kept += simplifier.add(timestamp, value)
+    kept += simplifier.flush()
+
+    assert simplifier.added == len(axis_points())
+    assert simplifier.kept == len(kept)
+    assert kept == sorted(kept)
+    assert_within_bound(axis_points(), kept)
+
+
+def test_simplify_inputs_keeps_the_buttons_and_both_stick_components():
+    inputs = [Input(0, Type.BUTTON, 0, 0.5)]
+    inputs += [Input(0, Type.STICK, (index / 100, -index / 100), index * TICK) for index in range(100)]
+    simplified, ratio = simplify_inputs(inputs, MAX_VALUE_ERROR, MAX_TIME_ERROR)
+
+    assert [input.value for input in simplified if input.type == Type.BUTTON] == [0]
+    sticks = [input for input in simplified if input.type == Type.STICK]
+    # A straight line only needs its two ends
+    assert [input.value for input in sticks] == [(0.0, 0.0), (0.99, -0.99)]
+    assert ratio == pytest.approx(101 / 3)
+    assert [input.timestamp for input in simplified] == sorted(input.timestamp for input in simplified)
+
+
+@pytest.mark.parametrize("recorder_class, extension", [(JsonRecorder, "json"), (JsonlRecorder, "jsonl"),
+                                                        (BinaryRecorder, "gmr")])
+def test_recorders_save_the_inputs_in_timestamp_order(tmp_path, recorder_class, extension):
+    filename = str(tmp_path / f"recording.{extension}")
+    recorder = recorder_class(filename)
+    # An axis point kept late by the inline simplifier, then two buttons at the same time
+    for input in (Input(1, Type.BUTTON, 0, 2.0), Input(0, Type.AXIS, 0.5, 1.0), Input(2, Type.BUTTON, 0, 2.0),
+                  Input(3, Type.BUTTON, 0, 2.0)):
+        recorder.append(input)
+    recorder.save()
+
+    loader = RecordingLoader(filename)
+    loader.load()
+    assert [(input.id, input.timestamp) for input in loader.getInputs()] == [(0, 1.0), (1, 2.0), (2, 2.0), (3, 2.0)]
@@ -0,0 +1,90 @@
+import pytest
+from binary_classes.binary_format import HEADER, MAGIC, RECORD, RECORD_V1, VERSION, is_binary_recording
+from binary_classes.binary_loader import BinaryLoader
+from binary_classes.recording_converter import convert, save_inputs
+from binary_classes.recording_loader import RecordingLoader
+from input_classes.input import Input
+from input_classes.input_record import to_record
+from input_classes.input_type import Type
+
+INPUTS = [
+    Input(3, Type.BUTTON, 0, 0.0),
+    Input(4, Type.AXIS, -0.25, 0.008),
+    Input(0, Type.STICK, (0.5, -0.75), 0.016),
+    Input(3, Type.BUTTON, 1, 0.5),
+]
+
+
+def write_v1(filename: str, records: list[tuple], count: int = None):
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 1, RECORD_V1.size, len(records) if count is None else count))
+        for record in records:
+            f.write(RECORD_V1.pack(*record))
+
+
+def test_version_2_round_trip(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    save_inputs(INPUTS, filename, "binary")
+
+    with open(filename, "rb") as f:
+        assert HEADER.unpack(f.read(HEADER.size)) == (MAGIC, VERSION, RECORD.size, len(INPUTS))
+    assert is_binary_recording(filename)
+
+    with BinaryLoader(filename) as loader:
+        inputs = loader.getInputs()
+        assert len(inputs) == len(INPUTS)
+        assert [to_record(input) for input in inputs] == [to_record(input) for input in INPUTS]
+        assert list(inputs.iter_records()) == [to_record(input) for input in INPUTS]
+        assert inputs[2].value == (0.5, -0.75)
+        assert inputs[-1].type == Type.BUTTON
+        with pytest.raises(IndexError):
+            inputs[len(INPUTS)]
+    assert loader.getInputs() is None
+
+
+def test_version_1_recordings_still_load(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    write_v1(filename, [(3, Type.BUTTON.value, 0, 0.0), (4, Type.AXIS.value, -0.25, 0.008)])
+
+    with BinaryLoader(filename) as loader:
+        inputs = loader.getInputs()
+        assert list(inputs.iter_records()) == [(3, Type.BUTTON.value, 0.0, 0.0, 0.0), (4, Type.AXIS.value, -0.25, 0.008, 0.0)]
+        assert (inputs[1].id, inputs[1].type, inputs[1].value) == (4, Type.AXIS, -0.25)
+
+
+def test_open_recording_uses_every_complete_record(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    write_v1(filename, [(3, Type.BUTTON.value, 0, 0.0), (3, Type.BUTTON.value, 1, 0.1)], count=0)
+    with open(filename, "ab") as f:
+        f.write(b"\x00" * (RECORD_V1.size - 1))
+
+    with BinaryLoader(filename) as loader:
+        assert len(loader.getInputs()) == 2
+
+
+def test_unsupported_files_are_rejected(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 99, RECORD.size, 0))
+    with pytest.raises(ValueError):
+        BinaryLoader(filename).load()
+
+    with open(filename, "wb") as f:
+        f.write(b"GMR")
+    with pytest.raises(ValueError):
+        BinaryLoader(filename).load()
+
+
+def test_json_and_binary_conversions_keep_every_input(tmp_path):
+    source = str(tmp_path / "recording.json")
+    binary = str(tmp_path / "recording.gmr")
+    back = str(tmp_path / "back.json")
+    save_inputs(INPUTS, source, "json")
+    convert(source, binary)
+    convert(binary, back)
+
+    for filename in (binary, back):
+        loader = RecordingLoader(filename)
+        loader.load()
+        assert [to_record(input) for input in loader.getInputs()] == [to_record(input) for input in INPUTS]
+    assert is_binary_recording(binary) and not is_binary_recording(back)
@@ -0,0 +1,51 @@
+import threading
+import time
+import pytest
+from benchmarks.fake_backends import FakePygame
+from gamepad.capture_engine import CaptureEngine
+from input_classes.event_ring_buffer import EventRingBuffer
+from input_classes.input_type import Type
+
+
+def test_ring_buffer_drops_and_counts_events_when_full():
+    ring = EventRingBuffer(capacity=4)
+    assert all(ring.push(index, Type.AXIS.value, index / 10, index * 0.001) for index in range(4))
+    assert not ring.push(9, Type.AXIS.value, 0.9, 0.009)
+    assert (len(ring), ring.overflows) == (4, 1)
+
+    assert [event[0] for event in ring.drain()] == [0, 1, 2, 3]
+    assert len(ring) == 0
+    # The slots are reused once drained
+    assert ring.push(5, Type.STICK.value, 0.5, 0.005, -0.5)
+    assert list(ring.drain()) == [(5, Type.STICK.value, 0.5, 0.005, -0.5)]
+    assert list(ring.drain()) == []
+
+
+def test_capacity_must_be_a_power_of_two():
+    with pytest.raises(ValueError):
+        EventRingBuffer(capacity=100)
+
+
+def test_engine_timestamps_buttons_and_sticks_with_their_tick():
+    pygame = FakePygame(button_rate=400.0, num_axes=6, num_buttons=4)
+    joystick = pygame.joystick.Joystick(0)
+    ring = EventRingBuffer(1024)
+    engine = CaptureEngine(pygame, joystick, ring, rate=500, dead_zone=0.0, sticks=((0, 1), (2, 3)))
+
+    thread = threading.Thread(target=engine.run, args=(time.perf_counter(),))
+    thread.start()
+    time.sleep(0.1)
+    engine.stop()
+    thread.join()
+
+    events = list(ring.drain())
+    assert engine.ticks > 10
+    assert ring.overflows == 0
+    timestamps = [event[3] for event in events]
+    assert timestamps == sorted(timestamps)
+
+    types = {event[1] for event in events}
+    assert types == {Type.BUTTON.value, Type.AXIS.value, Type.STICK.value}
+    # Stick axes are only written as pairs, the triggers as axes
+    assert {event[0] for event in events if event[1] == Type.STICK.value} == {0, 2}
+    assert {event[0] for event in events if event[1] == Type.AXIS.value} == {4, 5}
@@ -0,0 +1,78 @@
+import pytest
+from input_classes import columnar_input_collection
+from input_classes.columnar_input_collection import ColumnarInputCollection
+from input_classes.input import Input
+from input_classes.input_record import to_record
+from input_classes.input_type import Type
+from input_classes.recording_index import RecordingIndex
+
+INPUTS = [
+    Input(0, Type.BUTTON, 0, 0.5),
+    Input(0, Type.STICK, (0.25, -0.5), 1.0),
+    Input(4, Type.AXIS, 0.75, 1.5),
+    Input(2, Type.STICK, (1.0, 0.5), 2.0),
+    Input(0, Type.BUTTON, 1, 2.5),
+]
+
+
+@pytest.fixture(params=["numpy", "loops"])
+def collection(request, monkeypatch) -> ColumnarInputCollection:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar_input_collection, "np", None)
+    return ColumnarInputCollection.from_inputs(INPUTS)
+
+
+def records(collection: ColumnarInputCollection) -> list[tuple]:
+    return list(collection.records())
+
+
+def test_round_trip_through_the_views():
+    collection = ColumnarInputCollection.from_inputs(INPUTS)
+    assert [to_record(view) for view in collection] == [to_record(input) for input in INPUTS]
+    assert collection[1].value == (0.25, -0.5)
+    assert collection[-1].type == Type.BUTTON
+
+
+def test_time_shift(collection):
+    shifted = collection.time_shift(1.5)
+    assert list(shifted.timestamps) == [2.0, 2.5, 3.0, 3.5, 4.0]
+    assert [record[:3] + record[4:] for record in records(shifted)] == \
+           [record[:3] + record[4:] for record in records(collection)]
+    # The source collection is left as it was
+    assert collection.timestamps[0] == 0.5
+
+
+def test_time_scale(collection):
+    assert list(collection.time_scale(0.5).timestamps) == [0.25, 0.5, 0.75, 1.0, 1.25]
+    with pytest.raises(ValueError):
+        collection.time_scale(0)
+
+
+def test_filter_channel(collection):
+    sticks = collection.filter_channel(Type.STICK)
+    assert records(sticks) == [(0, 2, 0.25, 1.0, -0.5), (2, 2, 1.0, 2.0, 0.5)]
+    assert records(collection.filter_channel(Type.STICK, [2])) == [(2, 2, 1.0, 2.0, 0.5)]
+    assert [record[0] for record in records(collection.filter_channel(Type.BUTTON))] == [0, 0]
+    assert len(collection.filter_channel(Type.AXIS, [])) == 0
+
+
+def test_operations_on_an_empty_collection(collection):
+    empty = collection.filter_channel(Type.AXIS, [99])
+    assert len(empty.time_shift(1.0)) == 0
+    assert len(empty.time_scale(2.0)) == 0
+
+
+def test_recording_index_reads_the_records_of_a_columnar_recording():
+    collection = ColumnarInputCollection.from_inputs(INPUTS)
+    index = RecordingIndex(collection, keyframe_interval=1.0)
+    expected = RecordingIndex(INPUTS, keyframe_interval=1.0)
+
+    assert list(index.timestamps) == list(expected.timestamps)
+    for timestamp in (0.0, 0.75, 1.25, 2.25, 3.0):
+        state, first = index.state_at(timestamp)
+        expected_state, expected_first = expected.state_at(timestamp)
+        assert first == expected_first
+        assert (state.buttons, state.axes, state.sticks) == \
+               (expected_state.buttons, expected_state.axes, expected_state.sticks)
@@ -0,0 +1,98 @@
+import json
+import os
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from configuration_manager.config_snapshot import ConfigSnapshot
+from configuration_manager.config_watcher import ConfigWatcher
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.input import Input
+from input_classes.input_type import Type
+from timing.wait_strategy import BusyWaitStrategy, HybridWaitStrategy
+
+INPUTS = [Input(0, Type.BUTTON, 0, 0.0), Input(0, Type.AXIS, 0.5, 0.005), Input(0, Type.BUTTON, 1, 0.01)]
+
+
+def edit_config(config, changes: dict):
+    """Rewrites the config file with {"section.key": value} changes and moves its mtime forward"""
+    data = json.loads(json.dumps(config.config))
+    for key_path, value in changes.items():
+        section, key = key_path.split(".")
+        data[section][key] = value
+    with open(config.config_path, "w") as f:
+        json.dump(data, f)
+    stat = os.stat(config.config_path)
+    os.utime(config.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def create_repeater(tmp_path) -> GamepadRepeater:
+    config = create_config(str(tmp_path), {"recording.format": "binary", "repetition.wait_strategy": "busy"})
+    save_inputs(INPUTS, f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    return GamepadRepeater(FakeVGamepad, config)
+
+
+def test_snapshot_is_immutable_and_fills_the_defaults():
+    snapshot = ConfigSnapshot.from_dict({"repetition": {"batching": False, "batch_window": 0.004}})
+    assert snapshot.dead_zone == 0.06
+    assert snapshot.batch_window is None
+    with pytest.raises(AttributeError):
+        snapshot.dead_zone = 0.2
+    assert snapshot._replace(dead_zone=0.2).dead_zone == 0.2
+    assert snapshot.dead_zone == 0.06
+
+
+def test_watcher_swaps_in_a_new_snapshot_when_the_file_changes(tmp_path):
+    config = create_config(str(tmp_path))
+    watcher = ConfigWatcher(config)
+    snapshots = []
+    watcher.on_change(snapshots.append)
+    old = config.snapshot
+    assert not watcher.check()
+
+    edit_config(config, {"gamepad.dead_zone": 0.2})
+    assert watcher.check()
+    assert snapshots == [config.snapshot]
+    assert (config.snapshot.version, config.snapshot.dead_zone) == (old.version + 1, 0.2)
+    assert old.dead_zone == 0.06
+
+    # A half written file keeps the current configuration
+    with open(config.config_path, "w") as f:
+        f.write("{\"gamepad\": ")
+    os.utime(config.config_path, ns=(0, os.stat(config.config_path).st_mtime_ns + 10 ** 9))
+    assert not watcher.check()
+    assert config.snapshot is snapshots[0]
+
+
+def test_replay_applies_the_timing_settings_without_recompiling(tmp_path):
+    repeater = create_repeater(tmp_path)
+    plan = repeater.plan
+    assert isinstance(repeater.waiter, BusyWaitStrategy)
+
+    edit_config(repeater.config, {"repetition.wait_strategy": "hybrid", "gamepad.dead_zone": 0.6})
+    repeater.config.reload()
+    repeater._refresh_config(recompile=False)
+    assert isinstance(repeater.waiter, HybridWaitStrategy)
+    assert repeater.snapshot is repeater.config.snapshot
+    assert repeater.plan is plan
+
+    repeater._refresh_config()
+    assert repeater.plan is not plan
+    assert repeater.plan_settings == repeater.config.snapshot.compile_settings
+
+
+def test_loop_swaps_in_the_plan_compiled_in_the_background(tmp_path):
+    repeater = create_repeater(tmp_path)
+    plan = repeater.plan
+
+    edit_config(repeater.config, {"repetition.batch_window": 0.02})
+    repeater.config.reload()
+    repeater._swap_recompiled_plan()
+    # The current plan keeps playing while the new one compiles
+    assert repeater.plan is plan
+    repeater.recompile_thread.join()
+
+    repeater._swap_recompiled_plan()
+    assert repeater.plan is not plan
+    assert repeater.plan_settings == repeater.config.snapshot.compile_settings
+    assert len(repeater.plan) < len(plan)
+    assert repeater.recompile_thread is None
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from benchmarks.bench_startup import bench_imports
+from benchmarks.fake_backends import REPOSITORY_ROOT, FakeVGamepad, create_config
+from gamepad.controller_scheme import ControllerScheme, get_scheme, load_scheme
+from gamepad.gamepad_repeater import GamepadRepeater
+
+with open(os.path.join(REPOSITORY_ROOT, "controller_schemes", "dualsense.json")) as f:
+    DUALSENSE = json.load(f)
+
+
+def write_scheme(path, data: dict) -> str:
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def test_scheme_is_parsed_once_until_the_file_changes(tmp_path):
+    path = write_scheme(tmp_path / "pad.json", DUALSENSE)
+    scheme = load_scheme(path)
+    assert load_scheme(path) is scheme
+    assert scheme.sticks == ((0, 1), (2, 3))
+    assert scheme.triggers == (4, 5)
+
+    swapped = json.loads(json.dumps(DUALSENSE))
+    swapped["axis"]["triggers"] = {"left": 5, "right": 4}
+    write_scheme(path, swapped)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    reloaded = load_scheme(path)
+    assert reloaded is not scheme
+    assert reloaded.triggers == (5, 4)
+
+
+def test_repeater_and_mapper_share_the_configured_scheme(tmp_path):
+    config = create_config(str(tmp_path))
+    repeater = GamepadRepeater(FakeVGamepad, config, load=False)
+    assert repeater.scheme is repeater.mapper.scheme is get_scheme(config)
+
+
+def test_scheme_is_read_only():
+    scheme = ControllerScheme(DUALSENSE)
+    assert scheme["axis"]["left_stick"]["x"] == 0
+    assert set(scheme) == {"axis", "button"}
+    with pytest.raises(TypeError):
+        scheme["button"]["bottom_action"] = 3
+    with pytest.raises(TypeError):
+        scheme["axis"]["triggers"]["left"] = 0
+
+
+@pytest.mark.parametrize("edit, message", [
+    (lambda data: data.pop("button"), "missing \"button\" section"),
+    (lambda data: data["axis"].pop("triggers"), "missing axis group \"triggers\""),
+    (lambda data: data["axis"]["left_stick"].pop("y"), "missing axis.left_stick.y"),
+    (lambda data: data["button"].update(dpad_up="11"), "button.dpad_up must be an integer id"),
+    (lambda data: data["button"].update(start_menu=True), "button.start_menu must be an integer id")
+])
+def test_invalid_schemes_are_rejected(edit, message):
+    data = json.loads(json.dumps(DUALSENSE))
+    edit(data)
+    with pytest.raises(ValueError, match=message):
+        ControllerScheme(data, "pad.json")
+
+
+def test_main_imports_no_backend():
+    assert bench_imports()["backends_loaded_by_main"] == []
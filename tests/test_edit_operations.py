@@ -0,0 +1,91 @@
+from editing.edit_operations import concat, splice, trim
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, TRIGGER_RELEASED, UP, PadState
+
+STICK = 0
+AXIS = 1
+TRIGGER = 4
+RIGHT_TRIGGER = 5
+
+
+def state_at(inputs: list[Input], timestamp: float) -> PadState:
+    """State of the pad after every input at or before timestamp"""
+    state = PadState()
+    for input in inputs:
+        if input.timestamp <= timestamp:
+            state.apply(input)
+    return state
+
+
+def host() -> list[Input]:
+    """Holds a button, a stick, an axis and a trigger from 1s"""
+    return [
+        Input(0, Type.BUTTON, DOWN, 1.0),
+        Input(STICK, Type.STICK, (0.5, -0.5), 1.0),
+        Input(AXIS, Type.AXIS, 0.7, 1.0),
+        Input(TRIGGER, Type.AXIS, 0.9, 1.0),
+        Input(STICK, Type.STICK, (0.6, -0.6), 3.0),
+        Input(0, Type.BUTTON, UP, 4.0),
+    ]
+
+
+def assert_neutral(state: PadState):
+    assert not state.buttons
+    assert all(value == (0.0, 0.0) for value in state.sticks.values())
+    assert all(value == (TRIGGER_RELEASED if id in (TRIGGER, RIGHT_TRIGGER) else 0.0) for id, value in state.axes.items())
+
+
+def test_center_inputs_releases_triggers_and_centers_the_rest():
+    state = state_at(host(), 1.0)
+    centered = PadState()
+    for input in state.center_inputs(2.0, (TRIGGER,)):
+        assert input.timestamp == 2.0
+        centered.apply(input)
+    assert centered.sticks == {STICK: (0.0, 0.0)}
+    assert centered.axes == {AXIS: 0.0, TRIGGER: TRIGGER_RELEASED}
+
+
+def test_trim_starts_from_the_state_and_ends_neutral():
+    inputs = list(trim(host(), 2.0, 3.5))
+    start = state_at(inputs, 0.0)
+    assert start.buttons == {0}
+    assert start.sticks == {STICK: (0.5, -0.5)}
+    assert start.axes == {AXIS: 0.7, TRIGGER: 0.9}
+
+    assert state_at(inputs, 1.0).sticks == {STICK: (0.6, -0.6)}
+    end = state_at(inputs, 1.5)
+    assert_neutral(end)
+    assert set(end.sticks) == {STICK} and set(end.axes) == {AXIS, TRIGGER}
+
+
+def test_splice_neutralizes_both_cuts_and_restores_the_host():
+    inserted = [Input(RIGHT_TRIGGER, Type.AXIS, 0.4, 0.1), Input(1, Type.BUTTON, DOWN, 0.5)]
+    inputs = list(splice(host(), inserted, at=2.0, gap=0.25))
+
+    # The inserted recording starts from a neutral pad
+    cut = state_at(inputs, 2.0)
+    assert_neutral(cut)
+    assert set(cut.sticks) == {STICK} and set(cut.axes) == {AXIS, TRIGGER}
+
+    # Its own channels are neutral again before the host resumes
+    before_resume = state_at(inputs, 2.5)
+    assert 1 not in before_resume.buttons
+    assert before_resume.axes[RIGHT_TRIGGER] == TRIGGER_RELEASED
+
+    resumed = state_at(inputs, 2.75)
+    assert resumed.buttons == {0}
+    assert resumed.sticks == {STICK: (0.5, -0.5)}
+    assert resumed.axes[AXIS] == 0.7 and resumed.axes[TRIGGER] == 0.9
+    assert state_at(inputs, 3.75).sticks == {STICK: (0.6, -0.6)}
+
+
+def test_concat_does_not_leak_the_analog_state_of_the_previous_recording():
+    second = [Input(1, Type.BUTTON, DOWN, 0.0), Input(1, Type.BUTTON, UP, 1.0)]
+    inputs = list(concat([host(), second], gap=1.0))
+
+    # The first recording ends at 4s, the second starts at 5s with the pad neutral
+    start = state_at(inputs, 4.0)
+    assert_neutral(start)
+    assert set(start.sticks) == {STICK} and set(start.axes) == {AXIS, TRIGGER}
+    assert state_at(inputs, 5.0).buttons == {1}
@@ -0,0 +1,34 @@
+import time
+from benchmarks.bench_replay import bench_replay
+from benchmarks.fake_backends import JOYAXISMOTION, JOYBUTTONDOWN, JOYBUTTONUP, FakePygame, generate_inputs
+from input_classes.input_type import Type
+
+
+def test_generated_recording_is_shaped_like_the_recorder_output():
+    inputs = list(generate_inputs(100, tick=0.008, num_axes=6, button_every=4))
+    assert len(inputs) == 100
+    assert [input.timestamp for input in inputs] == sorted(input.timestamp for input in inputs)
+    buttons = [input for input in inputs if input.type == Type.BUTTON]
+    assert [input.value for input in buttons[:4]] == [0, 1, 0, 1]
+    assert {input.id for input in inputs if input.type == Type.AXIS} == set(range(6))
+
+
+def test_fake_pygame_presses_and_releases_the_buttons_in_turn():
+    pygame = FakePygame(button_rate=1000.0, num_axes=2)
+    pygame.init()
+    time.sleep(0.01)
+    events = pygame.event.get()
+
+    buttons = [event for event in events if event.type != JOYAXISMOTION]
+    assert len(buttons) >= 4
+    assert [event.type for event in buttons[:2]] == [JOYBUTTONDOWN, JOYBUTTONUP]
+    assert buttons[0].button == buttons[1].button
+    assert [event.axis for event in events if event.type == JOYAXISMOTION] == [0, 1]
+    assert pygame.joystick.Joystick(0).get_numaxes() == 2
+
+
+def test_replay_benchmark_runs_headless():
+    result = bench_replay("busy", count=50)
+    assert result["events"] == 50
+    assert result["reports"] > 0
+    assert result["lateness"]["max"] >= result["lateness"]["p50"]
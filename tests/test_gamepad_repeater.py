@@ -0,0 +1,72 @@
+import json
+import threading
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.input import Input
+from input_classes.input_type import Type
+
+INPUTS = [Input(0, Type.BUTTON, 0, 0.0), Input(0, Type.AXIS, 0.5, 0.005), Input(0, Type.BUTTON, 1, 0.01)]
+
+
+def create_repeater(tmp_path, overrides: dict = None, inputs: list[Input] = INPUTS) -> GamepadRepeater:
+    settings = {"recording.format": "binary", "repetition.wait_strategy": "busy"}
+    settings.update(overrides or {})
+    config = create_config(str(tmp_path), settings)
+    save_inputs(inputs, f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    return GamepadRepeater(FakeVGamepad, config)
+
+
+def test_loop_exports_the_trace_and_flushes_once(tmp_path, monkeypatch):
+    trace_file = str(tmp_path / "trace.json")
+    repeater = create_repeater(tmp_path, {"telemetry.enabled": True, "telemetry.trace_file": trace_file,
+                                          "repetition.loop_gap": 0.0})
+    exports = []
+    flushes = []
+    export = repeater.telemetry.export
+    monkeypatch.setattr(repeater.telemetry, "export", lambda filename: exports.append(filename) or export(filename))
+    # The consumer thread of the tracer also flushes on its own, only the replay thread is counted
+    monkeypatch.setattr(repeater.tracer, "flush", lambda: flushes.append(threading.current_thread()))
+
+    repeater.loop(iterations=5)
+
+    assert exports == [trace_file]
+    assert flushes.count(threading.current_thread()) == 1
+    with open(trace_file) as f:
+        assert json.load(f)["summary"]["steps"] == len(repeater.plan)
+
+
+def test_replay_exports_the_trace(tmp_path):
+    trace_file = str(tmp_path / "trace.csv")
+    repeater = create_repeater(tmp_path, {"telemetry.enabled": True, "telemetry.trace_file": trace_file})
+    repeater.replay()
+    with open(trace_file) as f:
+        assert len(f.readlines()) == 1 + len(repeater.plan)
+
+
+def press_times(repeater: GamepadRepeater) -> list[float]:
+    return [time for time, method, _ in repeater.gamepad.calls if method == "press_button"]
+
+
+def test_loop_schedules_every_iteration_on_one_timeline(tmp_path):
+    repeater = create_repeater(tmp_path, {"repetition.loop_gap": 0.02, "repetition.loop_end": "reset"})
+    repeater.loop(iterations=4)
+
+    presses = press_times(repeater)
+    period = repeater.plan.duration + 0.02
+    assert len(presses) == 4
+    # The lateness of an iteration does not carry over to the next ones, measured from the
+    # earliest press as the first one may be late itself
+    offsets = [press - iteration * period for iteration, press in enumerate(presses)]
+    assert max(offsets) - min(offsets) < 0.02
+
+    assert len(repeater.loop_drift) == 4
+    assert repeater.get_loop_report().startswith("4 iterations, drift")
+    # One reset per iteration, one when the loop ends
+    assert sum(1 for _, method, _ in repeater.gamepad.calls if method == "reset") == 5
+
+
+def test_loop_end_carry_keeps_the_pad_state(tmp_path):
+    repeater = create_repeater(tmp_path, {"repetition.loop_gap": 0.0, "repetition.loop_end": "carry"})
+    repeater.loop(iterations=2)
+    assert sum(1 for _, method, _ in repeater.gamepad.calls if method == "reset") == 1
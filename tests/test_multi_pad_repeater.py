@@ -0,0 +1,53 @@
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad.multi_pad_repeater import MultiPadRepeater
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, UP
+
+
+def create_repeater(tmp_path, recordings: list[list[Input]], telemetry: bool = True) -> MultiPadRepeater:
+    config = create_config(str(tmp_path), {"telemetry.enabled": telemetry})
+    inputs_files = []
+    for pad, inputs in enumerate(recordings):
+        inputs_file = f"{tmp_path}/pad_{pad}.gmr"
+        save_inputs(inputs, inputs_file, "binary")
+        inputs_files.append(inputs_file)
+    return MultiPadRepeater(FakeVGamepad, config, inputs_files)
+
+
+def test_steps_of_every_pad_fire_in_deadline_order(tmp_path):
+    buttons = [Input(0, Type.BUTTON, DOWN if index % 2 == 0 else UP, index * 0.01) for index in range(3)]
+    axes = [Input(0, Type.AXIS, 0.5 * index, 0.005 + index * 0.01) for index in range(2)]
+    repeater = create_repeater(tmp_path, [buttons, axes])
+    repeater.replay()
+
+    updates = sorted((time, pad) for pad, gamepad in enumerate(repeater.gamepads)
+                     for time, method, _ in gamepad.calls if method == "update")
+    assert [pad for _, pad in updates] == [0, 1, 0, 1, 0]
+
+    first, second = (gamepad.calls for gamepad in repeater.gamepads)
+    assert [method for _, method, _ in first if method != "update"] == ["press_button", "release_button", "press_button"]
+    assert [method for _, method, _ in second if method != "update"] == ["left_joystick_float"] * 2
+
+
+def test_report_gives_every_pad_and_the_worst_one(tmp_path):
+    recordings = [[Input(0, Type.AXIS, 0.5, index * 0.002) for index in range(count)] for count in (3, 5)]
+    repeater = create_repeater(tmp_path, recordings)
+    repeater.replay()
+
+    assert [telemetry.count for telemetry in repeater.telemetry] == [3, 5]
+    pad, lateness = repeater.get_worst_pad()
+    assert lateness == repeater.telemetry[pad].summary()["lateness"]
+    assert lateness["p99"] == max(telemetry.summary()["lateness"]["p99"] for telemetry in repeater.telemetry)
+
+    lines = repeater.get_report().splitlines()
+    assert lines[0].startswith("Pad 0: 3 steps")
+    assert lines[1].startswith("Pad 1: 5 steps")
+    assert lines[2].startswith(f"Worst pad {pad}: lateness")
+
+
+def test_report_without_telemetry(tmp_path):
+    repeater = create_repeater(tmp_path, [[Input(0, Type.AXIS, 0.5, 0.0)]] * 2, telemetry=False)
+    repeater.replay()
+    assert repeater.get_report() == "2 pads replayed"
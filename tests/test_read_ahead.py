@@ -0,0 +1,90 @@
+import time
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config, generate_inputs
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.read_ahead import ReadAhead
+from json_classes.json_stream_loader import is_json_array, iter_json_inputs
+
+
+def as_tuples(inputs) -> list[tuple]:
+    return [(input.id, input.type, input.value, input.timestamp) for input in inputs]
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl"])
+def test_json_recordings_are_decoded_across_chunks(tmp_path, format):
+    inputs = list(generate_inputs(200, tick=0.004, num_axes=6))
+    path = str(tmp_path / f"recording.{format}")
+    save_inputs(inputs, path, format)
+
+    assert is_json_array(path) == (format == "json")
+    # Chunks smaller than one input object
+    assert as_tuples(iter_json_inputs(path, chunk_size=7)) == as_tuples(inputs)
+    assert as_tuples(iter_json_inputs(path)) == as_tuples(inputs)
+
+
+def test_a_truncated_json_array_is_rejected(tmp_path):
+    path = str(tmp_path / "recording.json")
+    save_inputs(generate_inputs(10), path)
+    with open(path) as f:
+        content = f.read()
+    with open(path, "w") as f:
+        f.write(content[:len(content) // 2])
+
+    with pytest.raises(ValueError):
+        list(iter_json_inputs(path, chunk_size=16))
+
+
+def test_read_ahead_keeps_a_bounded_window():
+    produced = []
+
+    def stream():
+        for index in range(1000):
+            produced.append(index)
+            yield index
+
+    read_ahead = ReadAhead(stream(), window=8, batch_size=4)
+    time.sleep(0.05)
+    # Two queued batches, and the batch waiting for room
+    assert len(produced) == 12
+    assert next(read_ahead) == 0
+    assert list(read_ahead) == list(range(1, 1000))
+    read_ahead.close()
+
+
+def test_read_ahead_raises_the_stream_errors_in_the_consumer():
+    def stream():
+        yield from range(3)
+        raise ValueError("corrupt recording")
+
+    read_ahead = ReadAhead(stream(), window=8, batch_size=2)
+    assert [next(read_ahead) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError, match="corrupt recording"):
+        next(read_ahead)
+
+
+def test_close_stops_the_producer_of_an_endless_stream():
+    def stream():
+        while True:
+            yield 0
+
+    read_ahead = ReadAhead(stream(), window=8, batch_size=4)
+    next(read_ahead)
+    read_ahead.close()
+    assert not read_ahead.thread.is_alive()
+
+
+@pytest.mark.parametrize("format", ["json", "binary"])
+def test_streamed_replay_sends_the_calls_of_a_loaded_replay(tmp_path, format):
+    extension = "gmr" if format == "binary" else "json"
+    config = create_config(str(tmp_path), {"recording.format": format, "repetition.wait_strategy": "busy",
+                                           "repetition.read_ahead": 64})
+    save_inputs(generate_inputs(300, tick=0.0005, num_axes=6), f"{tmp_path}/dualsense_inputs.{extension}", format)
+
+    loaded = GamepadRepeater(FakeVGamepad, config)
+    loaded.replay()
+    streamed = GamepadRepeater(FakeVGamepad, config, load=False)
+    streamed.replay_stream()
+
+    calls = [(method, args) for _, method, args in streamed.gamepad.calls]
+    assert calls == [(method, args) for _, method, args in loaded.gamepad.calls]
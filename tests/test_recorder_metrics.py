@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import time
+import pytest
+from benchmarks.fake_backends import FakePygame, create_config
+from gamepad.gamepad_reader import GamepadReader
+from timing.recorder_metrics import RecorderMetrics
+
+
+def test_ticks_count_overruns_missed_ticks_and_jitter():
+    metrics = RecorderMetrics(0.01, bin_width=0.001, bins=5)
+    metrics.start(0.0)
+    metrics.tick(0.0, 0.001)
+    metrics.tick(0.0102, 0.012)
+    # Two ticks were missed before this one
+    metrics.tick(0.0402, 0.001)
+    metrics.stop(0.05)
+
+    summary = metrics.summary()
+    assert (summary["ticks"], summary["overruns"], summary["missed_ticks"]) == (3, 1, 2)
+    assert summary["poll_rate"] == pytest.approx(60.0)
+    assert summary["jitter"]["max"] == pytest.approx(0.02)
+    assert summary["jitter"]["mean"] == pytest.approx(0.0101)
+    # 0.2 ms lands in the first bin, 20 ms in the last one, which counts everything later
+    assert metrics.histogram() == [1, 0, 0, 0, 1]
+    assert summary["jitter"]["p99"] == pytest.approx(0.005)
+
+
+def test_drain_latencies_keep_the_most_recent_ones():
+    metrics = RecorderMetrics(0.001, capacity=4)
+    metrics.start(0.0)
+    for latency in (0.9, 0.8, 0.001, 0.002, 0.003, 0.004):
+        metrics.drained(latency)
+        metrics.add_events()
+    metrics.stop(2.0)
+
+    latency = metrics.summary()["drain_latency"]
+    assert (latency["events"], latency["p50"], latency["max"]) == (6, 0.002, 0.004)
+    assert metrics.summary()["events_per_second"] == 3.0
+    with pytest.raises(ValueError):
+        RecorderMetrics(0.001, capacity=0)
+
+
+def test_report_covers_the_window_since_the_previous_one():
+    metrics = RecorderMetrics(0.01)
+    metrics.start(0.0)
+    for tick in range(100):
+        metrics.tick(tick * 0.01, 0.0)
+    metrics.add_events(50)
+    assert metrics.report(1.0).startswith("poll rate 100Hz of 100Hz, 50 events/s, 0 overruns, 0 missed ticks")
+
+    metrics.tick(1.5, 0.02)
+    assert metrics.report(2.0).startswith("poll rate 1Hz of 100Hz, 0 events/s, 1 overruns, 50 missed ticks")
+
+
+def test_upper_bound_latencies_are_labeled(tmp_path):
+    metrics = RecorderMetrics(0.008, latency_bound=True)
+    metrics.start(0.0)
+    metrics.drained(0.004)
+    metrics.stop(1.0)
+    assert "drain latency bound p50 4000us" in str(metrics)
+
+    path = str(tmp_path / "recording.metrics.json")
+    metrics.export(path)
+    with open(path) as f:
+        exported = json.load(f)
+    assert exported["summary"]["drain_latency"]["upper_bound"]
+    assert len(exported["jitter_histogram"]["counts"]) == 50
+
+
+@pytest.mark.parametrize("single_loop", [False, True])
+def test_recording_writes_the_summary_next_to_it(tmp_path, single_loop):
+    config = create_config(str(tmp_path), {"recording.format": "binary", "recording.metrics_interval": 0,
+                                           "capture.single_loop": single_loop, "capture.rate": 500})
+    reader = GamepadReader(FakePygame(button_rate=200.0), config)
+    thread = threading.Thread(target=reader.record, daemon=True)
+    thread.start()
+    time.sleep(0.2)
+    reader.stop()
+    thread.join()
+
+    path = reader._get_metrics_path()
+    assert os.path.dirname(path) == str(tmp_path)
+    with open(path) as f:
+        summary = json.load(f)["summary"]
+    assert summary["ticks"] > 5
+    assert summary["events"] > 0
+    # Only the single loop knows when a button event happened
+    assert summary["drain_latency"]["upper_bound"] is not single_loop
+    assert summary["drain_latency"]["events"] > 0
@@ -0,0 +1,74 @@
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, UP, PadState
+from input_classes.recording_index import RecordingIndex
+
+A = FakeVGamepad.XUSB_BUTTON.XUSB_GAMEPAD_A
+
+
+def recording() -> list[Input]:
+    """5s of a moving axis and stick, with button 0 pressed from 1.2s to 3.7s"""
+    inputs = []
+    for tick in range(50):
+        timestamp = tick * 0.1
+        inputs.append(Input(4, Type.AXIS, tick / 50, timestamp))
+        inputs.append(Input(0, Type.STICK, (tick / 100, -tick / 100), timestamp))
+        if tick == 12:
+            inputs.append(Input(0, Type.BUTTON, DOWN, timestamp))
+        if tick == 37:
+            inputs.append(Input(0, Type.BUTTON, UP, timestamp))
+    return inputs
+
+
+def scanned_state(inputs: list[Input], timestamp: float) -> PadState:
+    state = PadState()
+    for input in inputs:
+        if input.timestamp < timestamp:
+            state.apply(input)
+    return state
+
+
+@pytest.mark.parametrize("timestamp", [0.0, 0.05, 1.0, 1.2, 1.25, 2.999, 3.7, 3.75, 4.9, 10.0])
+def test_state_at_matches_a_scan_from_the_start(timestamp):
+    inputs = recording()
+    index = RecordingIndex(inputs, keyframe_interval=1.0)
+    state, first = index.state_at(timestamp)
+    expected = scanned_state(inputs, timestamp)
+
+    assert (state.axes, state.sticks, state.buttons) == (expected.axes, expected.sticks, expected.buttons)
+    assert first == sum(1 for input in inputs if input.timestamp < timestamp)
+
+
+def test_keyframes_are_copies():
+    index = RecordingIndex(recording(), keyframe_interval=1.0)
+    assert index.keyframe_times == [0.0, 1.0, 2.0, 3.0, 4.0]
+    state, _ = index.state_at(2.5)
+    state.buttons.clear()
+    assert index.state_at(2.5)[0].buttons == {0}
+    with pytest.raises(ValueError):
+        RecordingIndex([], keyframe_interval=0)
+
+
+def test_segment_replay_starts_from_the_state_and_only_plays_the_window(tmp_path):
+    config = create_config(str(tmp_path), {"recording.format": "binary", "repetition.wait_strategy": "busy",
+                                           "repetition.batch_window": 0.001})
+    save_inputs(recording(), f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    repeater = GamepadRepeater(FakeVGamepad, config)
+
+    repeater.replay_segment(2.0, 2.2)
+
+    calls = [(method, args) for _, method, args in repeater.gamepad.calls]
+    assert calls[0] == ("reset", ())
+    updates = [index for index, (method, _) in enumerate(calls) if method == "update"]
+    # The state at 2.0s, then the ticks at 2.0s and 2.1s
+    first_report = calls[1:updates[0]]
+    assert ("press_button", (A,)) in first_report
+    assert ("left_trigger_float", pytest.approx((0.5 + 19 / 100,))) in first_report
+    assert len(updates) == 2
+    assert not any(method == "release_button" for method, _ in calls)
+    trigger_values = [args[0] for method, args in calls if method == "left_trigger_float"]
+    assert trigger_values[-1] == pytest.approx(0.5 + 21 / 100)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+from gamepad.replay_controller import ReplayController
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, UP
+
+# Button 0 held for 0.1s, then button 1 pressed
+INPUTS = [Input(0, Type.BUTTON, DOWN, 0.0), Input(0, Type.BUTTON, UP, 0.1), Input(1, Type.BUTTON, DOWN, 0.2)]
+
+
+def create_repeater(tmp_path) -> GamepadRepeater:
+    config = create_config(str(tmp_path), {"recording.format": "binary", "repetition.wait_strategy": "hybrid"})
+    save_inputs(INPUTS, f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    return GamepadRepeater(FakeVGamepad, config)
+
+
+def calls_of(repeater: GamepadRepeater, *methods: str) -> list[tuple]:
+    return [(time, method) for time, method, _ in repeater.gamepad.calls if method in methods]
+
+
+def test_pause_shifts_the_remaining_steps(tmp_path):
+    repeater = create_repeater(tmp_path)
+    controller = ReplayController()
+    start_time = time.perf_counter()
+
+    async def run():
+        replay = asyncio.create_task(repeater.replay_async(controller, start_time=start_time))
+        await asyncio.sleep(0.03)
+        controller.pause()
+        controller.pause()
+        await asyncio.sleep(0.1)
+        controller.resume()
+        return await replay
+
+    last_fired = asyncio.run(run())
+
+    (pressed, _), (released, _), (second, _) = calls_of(repeater, "press_button", "release_button")
+    paused_time = controller.paused_time
+    assert 0.1 <= paused_time < 0.15
+    # The steps after the pause are shifted by the paused time, and never fire early
+    assert 0.0 <= pressed - start_time < 0.03
+    assert 0.0 <= released - (start_time + 0.1 + paused_time) < 0.03
+    assert 0.0 <= second - (start_time + 0.2 + paused_time) < 0.03
+    # Taken right before the calls of the last step
+    assert second - 0.001 < last_fired <= second
+
+
+def test_cancel_stops_the_replay_and_resets_the_pad(tmp_path):
+    repeater = create_repeater(tmp_path)
+
+    async def run():
+        replay = asyncio.create_task(repeater.replay_async())
+        await asyncio.sleep(0.05)
+        replay.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await replay
+
+    asyncio.run(run())
+
+    methods = [method for _, method in calls_of(repeater, "press_button", "release_button", "reset", "update")]
+    # The press was sent, then the pad was reset instead of playing the rest
+    assert methods == ["press_button", "update", "reset", "update"]
+
+
+def test_cancel_right_after_a_pause_stops_the_replay(tmp_path):
+    repeater = create_repeater(tmp_path)
+    controller = ReplayController()
+
+    async def run():
+        replay = asyncio.create_task(repeater.replay_async(controller))
+        await asyncio.sleep(0.03)
+        # The pause wakes up the sleep of the replay, which is cancelled before it runs
+        controller.pause()
+        replay.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(replay, timeout=1.0)
+
+    asyncio.run(run())
+    assert calls_of(repeater, "reset")
+
+
+def test_controller_counts_the_paused_time_once():
+    async def run():
+        controller = ReplayController()
+        controller.resume()
+        assert controller.paused_time == 0.0
+        controller.pause()
+        assert controller.is_paused
+        assert await controller.sleep(1.0)
+        controller.resume()
+        assert not controller.is_paused
+        assert not await controller.sleep(0.01)
+        return controller
+
+    assert asyncio.run(run()).paused_time < 0.01
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from daemon.recording_cache import RecordingCache, estimate_plan_size
+from daemon.replay_daemon import ReplayDaemon
+from gamepad.replay_plan import ReplayPlan
+from input_classes.input import Input
+from input_classes.input_type import Type
+
+
+def plan_of(steps: int) -> ReplayPlan:
+    plan = ReplayPlan()
+    plan.deadlines = [0.0] * steps
+    plan.steps = [()] * steps
+    plan.event_count = steps
+    return plan
+
+
+def write_recordings(folder, names: list[str]) -> list[str]:
+    paths = []
+    for name in names:
+        path = os.path.join(folder, name)
+        with open(path, "w") as f:
+            f.write(name)
+        paths.append(path)
+    return paths
+
+
+def test_cache_hits_and_recompiles_an_edited_recording(tmp_path):
+    compiled = []
+    cache = RecordingCache(10 ** 6, lambda path: compiled.append(path) or plan_of(1))
+    path, = write_recordings(tmp_path, ["a.json"])
+
+    plan, cached = cache.get(path)
+    assert not cached
+    assert cache.get(path) == (plan, True)
+
+    with open(path, "w") as f:
+        f.write("edited recording")
+    assert cache.get(path)[1] is False
+    status = cache.status()
+    assert (status["hits"], status["misses"], status["recordings"]) == (1, 2, [path])
+    assert status["bytes"] == estimate_plan_size(plan)
+
+
+def test_cache_evicts_the_least_recently_used_plans(tmp_path):
+    size = estimate_plan_size(plan_of(10))
+    cache = RecordingCache(2 * size, lambda path: plan_of(10))
+    a, b, c = write_recordings(tmp_path, ["a.json", "b.json", "c.json"])
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)
+    cache.get(c)
+    assert cache.status()["recordings"] == [a, c]
+    assert cache.size == 2 * size
+
+    # The newest plan is kept even when it alone is over the limit
+    cache.max_bytes = 1
+    cache.get(b)
+    assert cache.status()["recordings"] == [b]
+
+
+def test_daemon_commands(tmp_path):
+    config = create_config(str(tmp_path))
+    path = str(tmp_path / "recording.gmr")
+    save_inputs([Input(0, Type.BUTTON, 0, 0.0), Input(0, Type.BUTTON, 1, 10.0)], path, "binary")
+    daemon = ReplayDaemon(FakeVGamepad, config, socket_path=str(tmp_path / "daemon.sock"))
+
+    async def run():
+        first = await daemon.handle({"command": "play", "path": path})
+        second = await daemon.handle({"command": "play", "path": path})
+        # Let the replay press the button
+        await asyncio.sleep(0.05)
+        await daemon.handle({"command": "pause"})
+        status = await daemon.handle({"command": "status"})
+        stopped = await daemon.handle({"command": "stop"})
+        idle = await daemon.handle({"command": "status"})
+        with pytest.raises(ValueError):
+            await daemon.handle({"command": "rewind"})
+        return first, second, status, stopped, idle
+
+    first, second, status, stopped, idle = asyncio.run(run())
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert status["playing"] == path and status["paused"]
+    assert stopped == {"ok": True, "stopped": True}
+    assert idle["playing"] is None
+    # Stopping the replay released the button before its recorded release
+    methods = [method for _, method, _ in daemon.repeater.gamepad.calls]
+    assert methods == ["press_button", "update", "reset", "update"]
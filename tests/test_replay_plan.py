@@ -0,0 +1,119 @@
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.binary_loader import BinaryLoader
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from gamepad.replay_plan import ReplayPlan
+from input_classes.columnar_input_collection import ColumnarInputCollection
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, UP
+
+A = FakeVGamepad.XUSB_BUTTON.XUSB_GAMEPAD_A
+
+
+def compile_plan(tmp_path, inputs: list[Input], batch_window: float = 0.001) -> tuple[ReplayPlan, object]:
+    config = create_config(str(tmp_path))
+    gamepad = FakeVGamepad.VX360Gamepad()
+    mapper = GamepadToVGamepadMapper(FakeVGamepad, config)
+    return ReplayPlan.compile(inputs, gamepad, mapper, batch_window), gamepad
+
+
+def step_names(plan: ReplayPlan) -> list[list[str]]:
+    return [[action.__name__ for action, _ in step] for step in plan.steps]
+
+
+def test_axis_events_of_the_same_tick_share_a_step(tmp_path):
+    inputs = [Input(axis_id, Type.AXIS, 0.5, 0.008 + axis_id * 0.0001) for axis_id in range(4)]
+    inputs.append(Input(0, Type.AXIS, 0.1, 0.016))
+    plan, _ = compile_plan(tmp_path, inputs)
+
+    assert plan.deadlines == [0.008, 0.016]
+    assert step_names(plan) == [["left_joystick_float"] * 2 + ["right_joystick_float"] * 2, ["left_joystick_float"]]
+    assert plan.event_count == 5
+    assert plan.reports_saved == 3
+
+
+def test_no_batch_window_makes_a_step_per_event(tmp_path):
+    inputs = [Input(0, Type.AXIS, 0.5, 0.0), Input(1, Type.AXIS, 0.5, 0.0)]
+    plan, _ = compile_plan(tmp_path, inputs, batch_window=None)
+    assert len(plan) == 2
+    assert plan.reports_saved == 0
+
+
+def test_a_button_that_changes_twice_closes_the_step(tmp_path):
+    inputs = [
+        Input(0, Type.BUTTON, DOWN, 1.0),
+        Input(0, Type.AXIS, 0.5, 1.0),
+        Input(0, Type.BUTTON, UP, 1.0005),
+        # Release and press again at the same timestamp, as the capture engine or concat produce them
+        Input(0, Type.BUTTON, DOWN, 1.0005),
+    ]
+    plan, _ = compile_plan(tmp_path, inputs)
+
+    assert plan.deadlines == [1.0, 1.0005, 1.0005]
+    assert step_names(plan) == [["press_button", "left_joystick_float"], ["release_button"], ["press_button"]]
+    assert all(args == (A,) for step in plan.steps for action, args in step if action.__name__ != "left_joystick_float")
+
+
+def test_a_tap_shorter_than_the_window_reaches_the_pad_pressed_then_released(tmp_path):
+    config = create_config(str(tmp_path), {"repetition.batch_window": 0.01, "recording.format": "binary"})
+    save_inputs([Input(0, Type.BUTTON, DOWN, 0.0), Input(0, Type.BUTTON, UP, 0.0005)],
+                f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    repeater = GamepadRepeater(FakeVGamepad, config)
+    repeater.replay()
+
+    calls = [(method, args) for _, method, args in repeater.gamepad.calls if method != "reset"]
+    assert calls == [("press_button", (A,)), ("update", ()), ("release_button", (A,)), ("update", ())]
+
+
+def describe(plan: ReplayPlan) -> list:
+    """Deadlines, method names and arguments of a plan, comparable between two pads"""
+    return [(deadline, [(action.__name__, args) for action, args in step])
+            for deadline, step in zip(plan.deadlines, plan.steps)]
+
+
+def test_every_source_compiles_to_the_same_plan(tmp_path):
+    inputs = [
+        Input(0, Type.BUTTON, DOWN, 0.0),
+        Input(0, Type.STICK, (0.5, 0.5), 0.008),
+        Input(4, Type.AXIS, 0.0, 0.008),
+        Input(0, Type.BUTTON, UP, 0.5),
+    ]
+    filename = f"{tmp_path}/recording.gmr"
+    save_inputs(inputs, filename, "binary")
+    expected, _ = compile_plan(tmp_path, inputs)
+
+    columnar, _ = compile_plan(tmp_path, ColumnarInputCollection.from_inputs(inputs))
+    with BinaryLoader(filename) as loader:
+        mapped, _ = compile_plan(tmp_path, loader.getInputs())
+    assert describe(columnar) == describe(mapped) == describe(expected)
+
+    # Mapped values: the y axis of the stick is inverted and the trigger moved from [-1, 1] to [0, 1]
+    assert describe(expected) == [
+        (0.0, [("press_button", (A,))]),
+        (0.008, [("left_joystick_float", (0.5, -0.5)), ("left_trigger_float", (0.5,))]),
+        (0.5, [("release_button", (A,))]),
+    ]
+
+
+def test_compiled_steps_are_bound_to_the_pad(tmp_path):
+    plan, gamepad = compile_plan(tmp_path, [Input(0, Type.BUTTON, DOWN, 0.0)])
+    for action, args in plan.steps[0]:
+        action(*args)
+    assert [(method, args) for _, method, args in gamepad.calls] == [("press_button", (A,))]
+
+
+def test_unknown_button_values_and_unmapped_axes_are_skipped(tmp_path):
+    inputs = [Input(0, Type.BUTTON, 7, 0.0), Input(99, Type.AXIS, 0.5, 0.1), Input(0, Type.BUTTON, DOWN, 0.2)]
+    plan, _ = compile_plan(tmp_path, inputs)
+    assert step_names(plan) == [["press_button"]]
+    assert plan.duration == 0.2
+
+
+def test_time_offset_moves_every_deadline(tmp_path):
+    config = create_config(str(tmp_path))
+    mapper = GamepadToVGamepadMapper(FakeVGamepad, config)
+    plan = ReplayPlan.compile([Input(0, Type.BUTTON, DOWN, 2.0), Input(0, Type.BUTTON, UP, 2.5)],
+                              FakeVGamepad.VX360Gamepad(), mapper, time_offset=-2.0)
+    assert plan.deadlines == [0.0, 0.5]
@@ -0,0 +1,45 @@
+import csv
+import json
+import pytest
+from timing.replay_telemetry import ReplayTelemetry
+
+
+def test_ring_buffer_keeps_the_newest_samples():
+    telemetry = ReplayTelemetry(capacity=3)
+    for step in range(5):
+        telemetry.record(step * 0.1, step * 0.001, 0.0001)
+
+    assert telemetry.count == 5
+    assert [deadline for deadline, _, _ in telemetry.samples()] == pytest.approx([0.2, 0.3, 0.4])
+    summary = telemetry.summary()
+    assert (summary["steps"], summary["retained"]) == (5, 3)
+    assert summary["lateness"]["max"] == pytest.approx(0.004)
+
+    telemetry.reset()
+    assert telemetry.samples() == []
+    with pytest.raises(ValueError):
+        ReplayTelemetry(capacity=0)
+
+
+def test_histogram_clamps_early_and_late_samples():
+    telemetry = ReplayTelemetry()
+    for lateness in (-0.001, 0.00005, 0.00015, 1.0):
+        telemetry.record(0.0, lateness, 0.0)
+    assert telemetry.histogram(bin_width=0.0001, bins=3) == [2, 1, 1]
+
+
+def test_exports(tmp_path):
+    telemetry = ReplayTelemetry()
+    telemetry.record(0.5, 0.0002, 0.00001)
+
+    telemetry.export(str(tmp_path / "trace.csv"))
+    with open(tmp_path / "trace.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["deadline", "lateness", "call_time"]
+    assert [float(value) for value in rows[1]] == [0.5, 0.0002, 0.00001]
+
+    telemetry.export(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        trace = json.load(f)
+    assert trace["summary"]["steps"] == 1
+    assert trace["samples"] == [{"deadline": 0.5, "lateness": 0.0002, "call_time": 0.00001}]
@@ -0,0 +1,92 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from analysis.pad_events import PadEvents, get_button_names
+from analysis.replay_verifier import compare_events, verify_replay
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad import replay_plan
+from gamepad.gamepad_repeater import GamepadRepeater
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.pad_state import DOWN, UP
+
+A = int(FakeVGamepad.XUSB_BUTTON.XUSB_GAMEPAD_A)
+B = int(FakeVGamepad.XUSB_BUTTON.XUSB_GAMEPAD_B)
+
+# A tap of 0.5ms, shorter than the batch window, then a stick move
+TAP = [Input(0, Type.BUTTON, DOWN, 0.0), Input(0, Type.BUTTON, UP, 0.0005), Input(0, Type.AXIS, 0.5, 0.02)]
+
+
+def create_repeater(tmp_path, inputs: list[Input]) -> GamepadRepeater:
+    config = create_config(str(tmp_path), {"repetition.batch_window": 0.01, "recording.format": "binary"})
+    save_inputs(inputs, f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    return GamepadRepeater(FakeVGamepad, config)
+
+
+def test_from_calls_only_reports_the_buttons_an_update_changed():
+    calls = [
+        (1.0, "press_button", (A,)),
+        (1.0, "release_button", (A,)),
+        (1.0, "press_button", (B,)),
+        (1.1, "update", ()),
+        (1.2, "press_button", (B,)),
+        (1.3, "update", ()),
+        (1.4, "reset", ()),
+        (1.5, "update", ()),
+    ]
+    events = PadEvents.from_calls(calls)
+    assert events.button_times.tolist() == [1.1, 1.5]
+    assert events.button_bits.tolist() == [B, B]
+    assert events.button_pressed.tolist() == [True, False]
+
+
+def test_from_calls_keeps_the_last_analog_value_of_an_update():
+    calls = [(1.0, "left_trigger_float", (0.2,)), (1.0, "left_trigger_float", (0.7,)), (1.1, "update", ())]
+    times, values = PadEvents.from_calls(calls).axes[4]
+    assert times.tolist() == [1.1]
+    assert values.tolist() == [0.7]
+
+
+def test_a_replayed_tap_passes(tmp_path):
+    report = verify_replay(create_repeater(tmp_path, TAP))
+    assert report.passed, str(report)
+
+
+def test_a_tap_swallowed_by_the_batching_is_missing(tmp_path, monkeypatch):
+    def iter_steps_in_one_window(inputs, gamepad, mapper, batch_window=None, time_offset=0.0):
+        """Batching that only looks at the window, as before buttons closed their step"""
+        deadline, calls = None, []
+        for timestamp, call in replay_plan.iter_calls(inputs, gamepad, mapper, time_offset):
+            if calls and timestamp - deadline > batch_window:
+                yield deadline, tuple(calls)
+                calls = []
+            if not calls:
+                deadline = timestamp
+            calls.append(call)
+        if calls:
+            yield deadline, tuple(calls)
+
+    repeater = create_repeater(tmp_path, TAP)
+    monkeypatch.setattr(replay_plan, "iter_steps", iter_steps_in_one_window)
+    report = verify_replay(repeater)
+
+    assert not report.passed
+    assert [(mismatch.button, mismatch.pressed) for mismatch in report.missing] == [("a", True), ("a", False)]
+    assert not report.extra
+
+
+def test_compare_events_finds_the_edges_of_a_late_and_a_missing_press():
+    names = get_button_names(FakeVGamepad)
+    expected = PadEvents.from_calls([(0.0, "press_button", (A,)), (0.0, "update", ()),
+                                     (1.0, "release_button", (A,)), (1.0, "update", ()),
+                                     (2.0, "press_button", (B,)), (2.0, "update", ())])
+    actual = PadEvents.from_calls([(10.0, "press_button", (A,)), (10.0, "update", ()),
+                                   (11.002, "release_button", (A,)), (11.002, "update", ())])
+    report = compare_events(expected, actual, names, sample_rate=1000.0, tolerance=0.01)
+
+    assert report.offset == pytest.approx(0.001)
+    assert len(report.lags) == 2
+    assert [(mismatch.button, mismatch.time, mismatch.pressed) for mismatch in report.missing] == [("b", 2.0, True)]
+    assert not report.extra
@@ -0,0 +1,68 @@
+import pytest
+from benchmarks.fake_backends import FakeVGamepad, create_config
+from binary_classes.recording_converter import save_inputs
+from gamepad.gamepad_repeater import GamepadRepeater, load_recording
+from gamepad.gamepad_to_vg_mapper import GamepadToVGamepadMapper
+from input_classes.input import Input
+from input_classes.input_type import Type
+from input_classes.stick_events import get_stick_axes, has_axis_stick_events, pair_stick_events
+
+STICKS = ((0, 1), (2, 3))
+
+# A per-axis recording: a diagonal of the left stick in one tick, then its y axis alone
+AXIS_RECORDING = [
+    Input(0, Type.AXIS, 0.5, 0.0), Input(1, Type.AXIS, -0.5, 0.0), Input(4, Type.AXIS, 0.2, 0.0),
+    Input(0, Type.BUTTON, 0, 0.004),
+    Input(1, Type.AXIS, 0.7, 0.008), Input(3, Type.AXIS, 0.3, 0.008)
+]
+
+
+def test_stick_axes_map_to_the_stick_and_component():
+    assert get_stick_axes(STICKS) == {0: (0, 0), 1: (0, 1), 2: (2, 0), 3: (2, 1)}
+
+
+def test_axis_events_of_a_tick_become_one_stick_event():
+    paired = pair_stick_events(AXIS_RECORDING, STICKS)
+    assert [(input.id, input.type, input.value, input.timestamp) for input in paired] == [
+        (4, Type.AXIS, 0.2, 0.0),
+        (0, Type.STICK, (0.5, -0.5), 0.0),
+        (0, Type.BUTTON, 0, 0.004),
+        # The other component keeps its last value, the other stick starts centered
+        (0, Type.STICK, (0.5, 0.7), 0.008),
+        (2, Type.STICK, (0.0, 0.3), 0.008)
+    ]
+    assert has_axis_stick_events(AXIS_RECORDING, STICKS)
+    assert not has_axis_stick_events(paired, STICKS)
+
+
+def test_per_axis_recordings_are_upgraded_on_load(tmp_path):
+    config = create_config(str(tmp_path))
+    path = str(tmp_path / "old.json")
+    save_inputs(AXIS_RECORDING, path)
+
+    inputs = list(load_recording(path, config, STICKS))
+    assert len(inputs) == 5
+    assert [input.type for input in inputs].count(Type.STICK) == 3
+    assert not has_axis_stick_events(inputs, STICKS)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_replay_sends_one_joystick_update_per_stick_event(tmp_path, columnar):
+    config = create_config(str(tmp_path), {"recording.format": "binary", "repetition.wait_strategy": "busy",
+                                           "repetition.columnar": columnar})
+    save_inputs(AXIS_RECORDING, f"{tmp_path}/dualsense_inputs.gmr", "binary")
+    repeater = GamepadRepeater(FakeVGamepad, config)
+    repeater.replay()
+
+    joysticks = [(method, args) for _, method, args in repeater.gamepad.calls if "joystick" in method]
+    # y is inverted, no half-updated (0.5, 0) position is sent
+    assert joysticks == [("left_joystick_float", (0.5, 0.5)), ("left_joystick_float", (0.5, -0.7)),
+                         ("right_joystick_float", (0.0, -0.3))]
+
+
+def test_mapper_applies_the_dead_zone_to_both_components(tmp_path):
+    mapper = GamepadToVGamepadMapper(FakeVGamepad, create_config(str(tmp_path)))
+    assert mapper.map_input(Input(0, Type.STICK, (0.05, 0.5), 0.0)) == (0, -0.5)
+    assert mapper.map_record(2, Type.STICK.value, 0.3, -0.01) == (0.3, 0)
+    assert (mapper.last_left_stick_x, mapper.last_left_stick_y) == (0, -0.5)
+    assert (mapper.last_right_stick_x, mapper.last_right_stick_y) == (0.3, 0)
@@ -0,0 +1,85 @@
+import shutil
+import time
+from binary_classes.binary_format import HEADER
+from binary_classes.binary_loader import BinaryLoader
+from binary_classes.binary_recorder import BinaryRecorder
+from binary_classes.streaming_recorder import StreamingRecorder, recover_recording
+from input_classes.input import Input
+from input_classes.input_record import to_record
+from input_classes.input_type import Type
+
+# Queued by two capture threads: the button of the first one arrives after the axis points
+# of the second one
+ARRIVALS = [
+    Input(0, Type.AXIS, 0.1, 0.008),
+    Input(0, Type.AXIS, 0.2, 0.016),
+    Input(3, Type.BUTTON, 0, 0.010),
+    Input(1, Type.STICK, (0.5, -0.5), 0.016),
+    Input(3, Type.BUTTON, 1, 0.024),
+]
+SORTED = sorted(ARRIVALS, key=lambda input: input.timestamp)
+
+
+def read_records(filename: str) -> tuple[int, list[tuple]]:
+    """Record count of the header and records of a binary recording"""
+    with open(filename, "rb") as f:
+        count = HEADER.unpack(f.read(HEADER.size))[3]
+    with BinaryLoader(filename) as loader:
+        return count, list(loader.getInputs().iter_records())
+
+
+def wait_for_writer(recorder: StreamingRecorder, count: int):
+    deadline = time.perf_counter() + 5.0
+    while recorder.count < count and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    # Let the writer thread reach its next flush
+    time.sleep(recorder.fsync_interval * 3)
+
+
+def test_save_sorts_the_events_and_writes_the_count(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    recorder = StreamingRecorder(filename, chunk_size=2)
+    for input in ARRIVALS:
+        recorder.append(input)
+    recorder.save()
+
+    assert not recorder.in_order
+    assert read_records(filename) == (len(ARRIVALS), [to_record(input) for input in SORTED])
+
+
+def test_same_file_as_the_binary_recorder(tmp_path):
+    streamed = str(tmp_path / "streamed.gmr")
+    recorded = str(tmp_path / "recorded.gmr")
+    streaming_recorder = StreamingRecorder(streamed)
+    binary_recorder = BinaryRecorder(recorded)
+    for input in ARRIVALS:
+        streaming_recorder.append(input)
+        binary_recorder.append(input)
+    streaming_recorder.save()
+    binary_recorder.save()
+
+    with open(streamed, "rb") as streamed_file, open(recorded, "rb") as recorded_file:
+        assert streamed_file.read() == recorded_file.read()
+
+
+def test_an_interrupted_recording_is_recovered(tmp_path):
+    filename = str(tmp_path / "recording.gmr")
+    crashed = str(tmp_path / "crashed.gmr")
+    recorder = StreamingRecorder(filename, fsync_interval=0.01)
+    try:
+        for input in ARRIVALS:
+            recorder.append(input)
+        wait_for_writer(recorder, len(ARRIVALS))
+        shutil.copyfile(filename, crashed)
+    finally:
+        recorder.save()
+
+    # The process died while a record was being written
+    with open(crashed, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    # Until it is recovered, the complete records are read in arrival order
+    assert read_records(crashed) == (0, [to_record(input) for input in ARRIVALS])
+
+    assert recover_recording(crashed) == len(ARRIVALS)
+    assert read_records(crashed) == (len(ARRIVALS), [to_record(input) for input in SORTED])
@@ -0,0 +1,42 @@
+import time
+import pytest
+from timing.wait_strategy import (BusyWaitStrategy, HybridWaitStrategy, LowCpuWaitStrategy, WaitStrategy,
+                                  create_wait_strategy)
+
+
+@pytest.mark.parametrize("name", ["busy", "hybrid", "low_cpu"])
+def test_never_returns_before_the_deadline(name):
+    strategy = create_wait_strategy(name)
+    for delay in (0.0, 0.0005, 0.003):
+        deadline = time.perf_counter() + delay
+        strategy.wait_until(deadline)
+        assert time.perf_counter() >= deadline
+
+
+def test_created_strategies():
+    assert isinstance(create_wait_strategy("busy", 0.001), BusyWaitStrategy)
+    assert isinstance(create_wait_strategy("hybrid"), HybridWaitStrategy)
+    expected = LowCpuWaitStrategy if LowCpuWaitStrategy.is_available() else HybridWaitStrategy
+    assert isinstance(create_wait_strategy("low_cpu"), expected)
+    with pytest.raises(ValueError):
+        create_wait_strategy("sleep")
+    with pytest.raises(TypeError):
+        WaitStrategy()
+
+
+def test_hybrid_margin_stays_within_its_bounds(monkeypatch):
+    monkeypatch.setattr(HybridWaitStrategy, "host_margin", None)
+    strategy = HybridWaitStrategy(min_margin=0.0002, max_margin=0.003, calibrate=False)
+    assert strategy.margin == 0.003
+
+    margin = strategy.calibrate(samples=5)
+    assert 0.0002 <= margin <= 0.003
+    # Strategies created afterwards start from the calibration of the host
+    assert HybridWaitStrategy.host_margin == margin
+    assert HybridWaitStrategy(min_margin=0.0002, max_margin=0.003).margin == margin
+
+    strategy._adapt(1.0)
+    assert strategy.margin == 0.003
+    for _ in range(1000):
+        strategy._adapt(0.0)
+    assert strategy.margin == pytest.approx(0.0002)
@@ -0,0 +1,240 @@
+import atexit
+import itertools
+import sys
+import threading
+import time
+from array import array
+from enum import IntEnum
+from functools import partial
+
+
+class TraceLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+
+# Events the hot loops can trace: name -> (level, format). A record only holds an integer
+# id and a float value, the format turns them into the line written by the consumer
+EVENTS = {
+    "message": (TraceLevel.INFO, "{message}"),
+    "replay.button_pressed": (TraceLevel.INFO, "Button {id} pressed"),
+    "replay.button_released": (TraceLevel.INFO, "Button {id} released"),
+    "replay.step": (TraceLevel.DEBUG, "Step of {id} calls fired {value:.0f}us late"),
+    "recorder.button_down": (TraceLevel.DEBUG, "Button {id} down at {value:.6f}s"),
+    "recorder.button_up": (TraceLevel.DEBUG, "Button {id} up at {value:.6f}s"),
+    "recorder.overrun": (TraceLevel.WARNING, "Poll tick took {value:.2f} ms, longer than the poll interval"),
+}
+CODES = {name: code for code, name in enumerate(EVENTS)}
+NAMES = list(EVENTS)
+MESSAGE = CODES["message"]
+
+_tracers = {}
+_tracers_lock = threading.Lock()
+
+
+def get_tracer(config) -> "EventTracer":
+    """Tracer of the tracing section of a configuration (a ConfigManager).
+
+    Configurations with the same tracing settings share one tracer. A reloaded configuration
+    with other settings gets a new tracer, the recorder and the repeaters ask for it again
+    when their snapshot changes. Every tracer is closed when the process exits, along with
+    the tracing.output file it writes to.
+    """
+    settings = config.snapshot.tracing
+    with _tracers_lock:
+        tracer = _tracers.get(settings)
+        if tracer is None:
+            enabled, level, sample_every, capacity, flush_interval, output = settings
+            tracer = EventTracer(level=TraceLevel[level.upper()], capacity=capacity, sample_every=sample_every,
+                                 output=open(output, "a") if output and enabled else None,
+                                 flush_interval=flush_interval, enabled=enabled, owns_output=bool(output))
+            _tracers[settings] = tracer
+        return tracer
+
+
+@atexit.register
+def close_tracers():
+    """Writes the last records of every tracer and closes their files"""
+    with _tracers_lock:
+        tracers = list(_tracers.values())
+        _tracers.clear()
+    for tracer in tracers:
+        tracer.close()
+
+
+class EventTracer:
+    """Structured trace of the recorder and the repeater.
+
+    Tracing an event writes a fixed-size record (time, event code, integer id, float value)
+    into preallocated ring buffers; a background thread formats the records and writes
+    them in batches, so the timed loops never wait on the terminal or on a pipe.
+
+    Hot loops get one emitter per event with emitter(), which is None when the event is
+    below the level or the tracer is disabled, and guard the call with "is not None": a
+    disabled event costs one comparison. Debug events are sampled, one of every
+    sample_every is kept. log() traces a preformatted message, for the code outside the
+    loops.
+
+    Several threads can trace at once: every record takes a slot from a shared counter and
+    publishes its sequence number once written. When the writers lap the consumer the oldest
+    records are overwritten, and counted in dropped.
+    """
+
+    def __init__(self, level: TraceLevel = TraceLevel.INFO, capacity: int = 8192, sample_every: int = 1,
+                 output=None, flush_interval: float = 0.05, enabled: bool = True, owns_output: bool = False):
+        """Constructor of the EventTracer class.
+
+        Args:
+            level (TraceLevel): events below this level are not traced
+            capacity (int): records kept until the consumer writes them, a power of two
+            sample_every (int): one of every sample_every debug events of each kind is traced
+            output (optional): text file the lines are written to, stdout if None
+            flush_interval (float): seconds between two batches of the consumer thread
+            enabled (bool): False traces nothing and starts no thread
+            owns_output (bool): close the output with the tracer, for a file opened for it
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("Trace capacity must be a power of two")
+        if sample_every < 1:
+            raise ValueError("Trace sampling must keep at least one of every sample_every events")
+        self.level = TraceLevel(level)
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.output = output
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.owns_output = owns_output
+        self._mask = capacity - 1
+
+        self.times = array("d", bytes(8 * capacity))
+        self.codes = array("H", bytes(2 * capacity))
+        self.ids = array("q", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.sequences = array("q", [-1]) * capacity
+        self.messages = [None] * capacity
+        self._counter = itertools.count()
+        self.read = 0
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.start_time = time.perf_counter()
+
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self.thread = None
+        if enabled:
+            self.thread = threading.Thread(target=self._consume, daemon=True)
+            self.thread.start()
+
+    def is_enabled(self, level: TraceLevel) -> bool:
+        return self.enabled and level >= self.level
+
+    def emitter(self, name: str):
+        """Function tracing one kind of event, called with an integer id and a float value
+
+        Returns:
+            The emitter, None if the event would not be traced
+        """
+        level, _ = EVENTS[name]
+        if not self.is_enabled(level):
+            return None
+        emit = partial(self._write, CODES[name])
+        if level > TraceLevel.DEBUG or self.sample_every == 1:
+            return emit
+
+        counter = itertools.count()
+        sample_every = self.sample_every
+
+        def sampled(id: int = 0, value: float = 0.0):
+            if not next(counter) % sample_every:
+                emit(id, value)
+        return sampled
+
+    def _write(self, code: int, id: int = 0, value: float = 0.0, message: str = None):
+        sequence = next(self._counter)
+        index = sequence & self._mask
+        self.sequences[index] = -1
+        self.times[index] = time.perf_counter()
+        self.codes[index] = code
+        self.ids[index] = id
+        self.values[index] = value
+        if message is not None:
+            self.messages[index] = message
+        self.sequences[index] = sequence
+
+    def log(self, level: TraceLevel, message: str):
+        """Traces a preformatted message, for the code outside the timed loops"""
+        if self.enabled and level >= self.level:
+            self._write(MESSAGE, level, 0.0, message)
+
+    def info(self, message: str):
+        self.log(TraceLevel.INFO, message)
+
+    def warning(self, message: str):
+        self.log(TraceLevel.WARNING, message)
+
+    def _consume(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def _collect(self) -> list[str]:
+        """Formats the records published since the previous call, stops at the first slot
+        whose writer has not finished"""
+        lines = []
+        read = self.read
+        while True:
+            index = read & self._mask
+            sequence = self.sequences[index]
+            if sequence > read:
+                # Lapped by the writers, the record was overwritten
+                self.dropped += 1
+                read += 1
+                continue
+            if sequence != read:
+                break
+            timestamp, code, id, value = self.times[index], self.codes[index], self.ids[index], self.values[index]
+            message = self.messages[index] if code == MESSAGE else None
+            if self.sequences[index] != read:
+                continue
+            lines.append(self._format(timestamp, code, id, value, message))
+            read += 1
+        if self.dropped > self.reported_dropped:
+            lines.append(f"{time.perf_counter() - self.start_time:.6f} WARNING "
+                         f"{self.dropped - self.reported_dropped} trace events dropped, the trace buffer was full")
+            self.reported_dropped = self.dropped
+        self.read = read
+        return lines
+
+    def _format(self, timestamp: float, code: int, id: int, value: float, message: str) -> str:
+        if code == MESSAGE:
+            level = TraceLevel(id)
+        else:
+            level, format = EVENTS[NAMES[code]]
+            message = format.format(id=id, value=value)
+        return f"{timestamp - self.start_time:.6f} {level.name} {message}"
+
+    def flush(self):
+        """Writes every record published so far"""
+        if not self.enabled:
+            return
+        with self._flush_lock:
+            lines = self._collect()
+            if not lines:
+                return
+            output = self.output if self.output is not None else sys.stdout
+            output.write("\n".join(lines) + "\n")
+            output.flush()
+
+    def close(self):
+        """Stops the consumer thread after a last flush. The output is only closed when
+        the tracer owns it"""
+        if self.thread is not None:
+            self._closed.set()
+            self.thread.join(timeout=1.0)
+            self.thread = None
+            self.flush()
+            self.enabled = False
+        if self.owns_output and self.output is not None:
+            self.output.close()
+            self.output = None
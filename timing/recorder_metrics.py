@@ -0,0 +1,167 @@
+import json
+import time
+from array import array
+
+
+class RecorderMetrics:
+    """Health of a recording: achieved poll rate, tick jitter, overrun and missed ticks,
+    how long button events waited before they were drained, and events per second.
+
+    The poll loop calls tick() once per tick and the loops that drain events call
+    drained(). Jitter goes into a fixed histogram and drain latencies into a preallocated
+    ring buffer, so measuring does not allocate inside the capture loops. report() gives
+    the figures since its previous call, for the periodic display.
+    """
+
+    def __init__(self, interval: float, capacity: int = 65536, bin_width: float = 0.0001, bins: int = 50,
+                 latency_bound: bool = False):
+        """Constructor of the RecorderMetrics class.
+
+        Args:
+            interval (float): nominal seconds between two ticks of the poll loop
+            capacity (int): drain latencies kept, older ones are overwritten
+            bin_width (float): width of every jitter histogram bin in seconds
+            bins (int): number of jitter bins, the last one also counts everything later than it
+            latency_bound (bool): True when the drain loop cannot know when an event happened
+                and records the upper bound of its latency instead
+        """
+        if capacity <= 0:
+            raise ValueError("Metrics capacity must be positive")
+        self.interval = interval
+        self.latency_bound = latency_bound
+        self.capacity = capacity
+        self.bin_width = bin_width
+        self.jitter_counts = array("L", bytes(array("L").itemsize * bins))
+        self.latencies = array("d", bytes(8 * capacity))
+
+        self.start_time = None
+        self.end_time = None
+        self.last_tick = None
+        self.ticks = 0
+        self.overruns = 0
+        self.missed_ticks = 0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+        self.drained_count = 0
+        self.events = 0
+        self.window = None
+
+    def start(self, now: float):
+        """Starts measuring, now being the time.perf_counter() value the recording started at"""
+        self.start_time = now
+        self.window = (now, 0, 0, 0, 0)
+
+    def stop(self, now: float):
+        self.end_time = now
+
+    def tick(self, tick_start: float, work_time: float):
+        """Records one tick of the poll loop
+
+        Args:
+            tick_start (float): time.perf_counter() value at the start of the tick
+            work_time (float): seconds spent reading the pad in the tick, an overrun if longer than the interval
+        """
+        if work_time > self.interval:
+            self.overruns += 1
+        if self.last_tick is not None:
+            jitter = abs(tick_start - self.last_tick - self.interval)
+            self.jitter_counts[min(len(self.jitter_counts) - 1, int(jitter / self.bin_width))] += 1
+            self.total_jitter += jitter
+            if jitter > self.max_jitter:
+                self.max_jitter = jitter
+            # A late tick stands for the ticks that should have happened in between
+            missed = int((tick_start - self.last_tick) / self.interval + 0.5) - 1
+            if missed > 0:
+                self.missed_ticks += missed
+        self.last_tick = tick_start
+        self.ticks += 1
+
+    def drained(self, latency: float):
+        """Records a button event drained latency seconds after it happened, or at most
+        latency seconds with latency_bound"""
+        self.latencies[self.drained_count % self.capacity] = latency
+        self.drained_count += 1
+
+    def add_events(self, count: int = 1):
+        """Counts events handed to the recorder"""
+        self.events += count
+
+    def _elapsed(self) -> float:
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        return max(end - self.start_time, 1e-9) if self.start_time is not None else 0.0
+
+    def histogram(self) -> list[int]:
+        """Count of ticks per jitter bin of bin_width seconds, jitter being the distance of a
+        tick to the nominal interval after the previous one"""
+        return list(self.jitter_counts)
+
+    def summary(self) -> dict:
+        elapsed = self._elapsed()
+        retained = min(self.drained_count, self.capacity)
+        latencies = sorted(self.latencies[:retained])
+        jitters = self.ticks - 1 if self.ticks else 0
+        return {
+            "duration": elapsed,
+            "ticks": self.ticks,
+            "target_rate": 1 / self.interval,
+            "poll_rate": self.ticks / elapsed if elapsed else 0.0,
+            "overruns": self.overruns,
+            "missed_ticks": self.missed_ticks,
+            "jitter": {
+                "mean": self.total_jitter / jitters if jitters else 0.0,
+                "p99": self._jitter_percentile(0.99),
+                "max": self.max_jitter
+            },
+            "drain_latency": {
+                "upper_bound": self.latency_bound,
+                "events": self.drained_count,
+                "p50": latencies[int((retained - 1) * 0.50)] if retained else 0.0,
+                "p99": latencies[int((retained - 1) * 0.99)] if retained else 0.0,
+                "max": latencies[-1] if retained else 0.0
+            },
+            "events": self.events,
+            "events_per_second": self.events / elapsed if elapsed else 0.0
+        }
+
+    def _jitter_percentile(self, fraction: float) -> float:
+        """Upper edge of the histogram bin the percentile falls in"""
+        total = sum(self.jitter_counts)
+        if not total:
+            return 0.0
+        seen = 0
+        for index, count in enumerate(self.jitter_counts):
+            seen += count
+            if seen >= fraction * total:
+                return (index + 1) * self.bin_width
+        return len(self.jitter_counts) * self.bin_width
+
+    def report(self, now: float = None) -> str:
+        """One line with the poll rate, events per second, overruns and missed ticks since
+        the previous report, for the display during the recording"""
+        now = now if now is not None else time.perf_counter()
+        last_time, last_ticks, last_events, last_overruns, last_missed = self.window
+        elapsed = max(now - last_time, 1e-9)
+        self.window = (now, self.ticks, self.events, self.overruns, self.missed_ticks)
+        return (f"poll rate {(self.ticks - last_ticks) / elapsed:.0f}Hz of {1 / self.interval:.0f}Hz, "
+                f"{(self.events - last_events) / elapsed:.0f} events/s, "
+                f"{self.overruns - last_overruns} overruns, {self.missed_ticks - last_missed} missed ticks, "
+                f"jitter max {self.max_jitter * 1000:.2f} ms")
+
+    def export(self, filename: str):
+        """Writes the summary and the jitter histogram to a JSON file"""
+        with open(filename, "w") as f:
+            json.dump({
+                "summary": self.summary(),
+                "jitter_histogram": {"bin_width": self.bin_width, "counts": self.histogram()}
+            }, f, indent=4)
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        jitter = summary["jitter"]
+        latency = summary["drain_latency"]
+        latency_name = "drain latency bound" if self.latency_bound else "drain latency"
+        return (f"{summary['ticks']} ticks at {summary['poll_rate']:.0f}Hz of {summary['target_rate']:.0f}Hz, "
+                f"{summary['overruns']} overruns, {summary['missed_ticks']} missed ticks, "
+                f"jitter p99 {jitter['p99'] * 1e6:.0f}us max {jitter['max'] * 1e6:.0f}us, "
+                f"{latency_name} p50 {latency['p50'] * 1e6:.0f}us p99 {latency['p99'] * 1e6:.0f}us, "
+                f"{summary['events_per_second']:.0f} events/s")
@@ -0,0 +1,113 @@
+import csv
+import json
+from array import array
+
+
+class ReplayTelemetry:
+    """Timing telemetry of one replay.
+
+    For every step it keeps the deadline, how late the step fired and the time spent in
+    the gamepad calls. Samples are written in preallocated ring buffers, so recording
+    them does not allocate inside the replay loop; once the buffers are full the oldest
+    samples are overwritten.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity <= 0:
+            raise ValueError("Telemetry capacity must be positive")
+        self.capacity = capacity
+        self.deadlines = array("d", bytes(8 * capacity))
+        self.lateness = array("d", bytes(8 * capacity))
+        self.call_times = array("d", bytes(8 * capacity))
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+    def record(self, deadline: float, lateness: float, call_time: float):
+        """Records one step
+
+        Args:
+            deadline (float): deadline of the step, relative to the start of the replay
+            lateness (float): seconds between the deadline and the moment the step fired
+            call_time (float): seconds spent inside the gamepad calls of the step
+        """
+        index = self.count % self.capacity
+        self.deadlines[index] = deadline
+        self.lateness[index] = lateness
+        self.call_times[index] = call_time
+        self.count += 1
+
+    def samples(self) -> list[tuple[float, float, float]]:
+        """Retained (deadline, lateness, call_time) samples, oldest first"""
+        retained = min(self.count, self.capacity)
+        start = self.count - retained
+        return [(self.deadlines[i % self.capacity], self.lateness[i % self.capacity], self.call_times[i % self.capacity])
+                for i in range(start, self.count)]
+
+    def summary(self) -> dict:
+        """p50/p99/max of the lateness and of the gamepad call time of the retained samples"""
+        samples = self.samples()
+        lateness = sorted(sample[1] for sample in samples)
+        call_times = sorted(sample[2] for sample in samples)
+        return {
+            "steps": self.count,
+            "retained": len(samples),
+            "lateness": _percentiles(lateness),
+            "call_time": _percentiles(call_times)
+        }
+
+    def histogram(self, bin_width: float = 0.0001, bins: int = 50) -> list[int]:
+        """Histogram of the lateness of the retained samples
+
+        Args:
+            bin_width (float): width of every bin in seconds
+            bins (int): number of bins, the last one also counts everything later than it
+
+        Returns:
+            list[int]: count of samples per bin, early samples go to the first bin
+        """
+        counts = [0] * bins
+        for _, lateness, _ in self.samples():
+            counts[min(bins - 1, max(0, int(lateness / bin_width)))] += 1
+        return counts
+
+    def export(self, filename: str):
+        """Writes the trace to a .csv file, or to a JSON file for any other extension"""
+        if filename.endswith(".csv"):
+            self.export_csv(filename)
+        else:
+            self.export_json(filename)
+
+    def export_json(self, filename: str):
+        with open(filename, "w") as f:
+            json.dump({
+                "summary": self.summary(),
+                "histogram": self.histogram(),
+                "samples": [{"deadline": deadline, "lateness": lateness, "call_time": call_time}
+                            for deadline, lateness, call_time in self.samples()]
+            }, f, indent=4)
+
+    def export_csv(self, filename: str):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["deadline", "lateness", "call_time"])
+            writer.writerows(self.samples())
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        lateness = summary["lateness"]
+        call_time = summary["call_time"]
+        return (f"{summary['steps']} steps, lateness p50 {lateness['p50'] * 1e6:.0f}us "
+                f"p99 {lateness['p99'] * 1e6:.0f}us max {lateness['max'] * 1e6:.0f}us, "
+                f"gamepad calls p50 {call_time['p50'] * 1e6:.0f}us max {call_time['max'] * 1e6:.0f}us")
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "p50": values[int((len(values) - 1) * 0.50)],
+        "p99": values[int((len(values) - 1) * 0.99)],
+        "max": values[-1]
+    }
@@ -0,0 +1,210 @@
+import ctypes
+import ctypes.util
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+PR_SET_TIMERSLACK = 29
+EINTR = 4
+
+_libc = None
+
+
+def _get_libc() -> ctypes.CDLL:
+    """libc with clock_nanosleep, looked up once: find_library runs ldconfig"""
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.clock_nanosleep.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(_Timespec), ctypes.c_void_p]
+        _libc = libc
+    return _libc
+
+
+class WaitStrategy(ABC):
+    """Waits until an absolute time.perf_counter() deadline"""
+
+    @abstractmethod
+    def wait_until(self, deadline: float):
+        pass
+
+
+class BusyWaitStrategy(WaitStrategy):
+    """Sleeps until busy_waiting_time before the deadline and spins the rest,
+    this is the original replay behaviour"""
+
+    def __init__(self, busy_waiting_time: float):
+        self.busy_waiting_time = busy_waiting_time
+
+    def wait_until(self, deadline: float):
+        time_remaining = deadline - time.perf_counter()
+        if time_remaining > self.busy_waiting_time:
+            time.sleep(time_remaining - self.busy_waiting_time)
+
+        while time.perf_counter() < deadline:
+            pass
+
+
+class HybridWaitStrategy(WaitStrategy):
+    """Sleeps and only spins for a margin that covers the real sleep overshoot of the host.
+
+    The margin is measured at startup and then adapted after every sleep: it grows at once
+    when a sleep overshoots it and slowly shrinks back towards the observed overshoot.
+    The calibrated margin is kept for the process, so the strategies created again on a
+    configuration reload start from it without measuring again.
+    """
+
+    host_margin = None
+
+    def __init__(self, min_margin: float = 0.0001, max_margin: float = 0.005,
+                 calibration_samples: int = 50, decay: float = 0.02, calibrate: bool = True):
+        """Constructor of the HybridWaitStrategy class.
+
+        Args:
+            min_margin (float): smallest spin margin
+            max_margin (float): largest spin margin, the margin before any calibration
+            calibration_samples (int): sleeps measured by the calibration
+            decay (float): fraction of the gap to the observed overshoot the margin shrinks by after a sleep
+            calibrate (bool): measure the host now when it was not yet, False starts from
+                max_margin and only adapts, which does not block the caller
+        """
+        self.min_margin = min_margin
+        self.max_margin = max_margin
+        self.decay = decay
+        self.margin = max_margin
+        if HybridWaitStrategy.host_margin is not None:
+            self.margin = self._clamp(HybridWaitStrategy.host_margin)
+        elif calibrate:
+            self.calibrate(calibration_samples)
+
+    def calibrate(self, samples: int = 50, sleep_time: float = 0.001) -> float:
+        """Measures the sleep overshoot of the host and sets the spin margin from it
+
+        Args:
+            samples (int): number of sleeps to measure
+            sleep_time (float): duration of every measured sleep
+
+        Returns:
+            float: the calibrated margin
+        """
+        overshoots = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            time.sleep(sleep_time)
+            overshoots.append(time.perf_counter() - start - sleep_time)
+
+        overshoots.sort()
+        percentile_99 = overshoots[min(len(overshoots) - 1, int(len(overshoots) * 0.99))]
+        self.margin = self._clamp(percentile_99 * 1.25)
+        HybridWaitStrategy.host_margin = self.margin
+        return self.margin
+
+    def wait_until(self, deadline: float):
+        perf_counter = time.perf_counter
+        time_remaining = deadline - perf_counter()
+
+        if time_remaining > self.margin:
+            requested = time_remaining - self.margin
+            start = perf_counter()
+            time.sleep(requested)
+            self._adapt(perf_counter() - start - requested)
+
+        while perf_counter() < deadline:
+            pass
+
+    def _adapt(self, overshoot: float):
+        if overshoot * 1.25 > self.margin:
+            self.margin = self._clamp(overshoot * 1.25)
+        else:
+            self.margin = self._clamp(self.margin - (self.margin - overshoot * 1.25) * self.decay)
+
+    def _clamp(self, margin: float) -> float:
+        return min(self.max_margin, max(self.min_margin, margin))
+
+
+class LowCpuWaitStrategy(WaitStrategy):
+    """Linux only: sleeps until the absolute deadline with clock_nanosleep(CLOCK_MONOTONIC,
+    TIMER_ABSTIME), which is the clock behind time.perf_counter(), and does not spin at all.
+    The timer slack is lowered to 1ns so the kernel wakes the thread up on time. The slack
+    is a per-thread setting, so it is set by every thread the first time it waits, which
+    covers the worker threads of the asyncio replay and of the daemon."""
+
+    def __init__(self, spin_margin: float = 0.0):
+        if not self.is_available():
+            raise OSError("clock_nanosleep on CLOCK_MONOTONIC is not available on this platform")
+
+        self.spin_margin = spin_margin
+        self.libc = _get_libc()
+        self._local = threading.local()
+
+    @staticmethod
+    def is_available() -> bool:
+        return sys.platform.startswith("linux") and "CLOCK_MONOTONIC" in time.get_clock_info("perf_counter").implementation
+
+    def _get_timespec(self) -> "_Timespec":
+        """Timespec of the calling thread, the first call of a thread lowers its timer slack"""
+        local = self._local
+        timespec = getattr(local, "timespec", None)
+        if timespec is None:
+            self.libc.prctl(PR_SET_TIMERSLACK, ctypes.c_ulong(1), 0, 0, 0)
+            timespec = local.timespec = _Timespec()
+        return timespec
+
+    def wait_until(self, deadline: float):
+        wake_up = deadline - self.spin_margin
+        if wake_up > time.perf_counter():
+            timespec = self._get_timespec()
+            timespec.tv_sec = int(wake_up)
+            timespec.tv_nsec = int((wake_up - timespec.tv_sec) * 1e9)
+            while self.libc.clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(timespec), None) == EINTR:
+                pass
+
+        while time.perf_counter() < deadline:
+            pass
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+def create_wait_strategy(name: str, busy_waiting_time: float = 0.002, calibrate: bool = True,
+                         tracer=None) -> WaitStrategy:
+    """Creates the wait strategy configured in repetition.wait_strategy
+
+    Args:
+        name (str): "busy", "hybrid" or "low_cpu"
+        busy_waiting_time (float): spin time of the "busy" strategy
+        calibrate (bool): False never measures the host in the calling thread, for the
+            strategies created during a replay, see HybridWaitStrategy
+        tracer (EventTracer, optional): where the fallback of "low_cpu" is reported
+
+    Returns:
+        WaitStrategy: the wait strategy, "low_cpu" falls back to "hybrid" when not available
+    """
+    if name == "busy":
+        return BusyWaitStrategy(busy_waiting_time)
+    if name == "low_cpu":
+        if LowCpuWaitStrategy.is_available():
+            return LowCpuWaitStrategy()
+        if tracer is not None:
+            tracer.warning("low_cpu wait strategy is only available on Linux, using hybrid instead")
+        return HybridWaitStrategy(calibrate=calibrate)
+    if name == "hybrid":
+        return HybridWaitStrategy(calibrate=calibrate)
+    raise ValueError(f"Unknown wait strategy {name}")
+
+
+def prepare_wait_strategy(name: str):
+    """Does the slow part of creating a wait strategy ahead of time, so a replay that
+    picks up a reloaded configuration creates it at once. Called by the config watcher
+    thread after every reload
+
+    Args:
+        name (str): "busy", "hybrid" or "low_cpu"
+    """
+    if name == "low_cpu" and LowCpuWaitStrategy.is_available():
+        _get_libc()
+    elif name in ("hybrid", "low_cpu") and HybridWaitStrategy.host_margin is None:
+        HybridWaitStrategy(calibrate=False).calibrate()